@@ -11,6 +11,10 @@ install_requires = [
     'pytz',
 ]
 
+async_require = [
+    'aiohttp>=3.0.0',
+]
+
 docs_require = [
     'sphinx>=1.4.0',
 ]
@@ -41,6 +45,7 @@ setup(
     install_requires=install_requires,
     tests_require=tests_require,
     extras_require={
+        'async': async_require,
         'docs': docs_require,
         'test': tests_require,
     },
@@ -0,0 +1,2 @@
+from zeep.asyncio.client import AsyncClient  # noqa
+from zeep.asyncio.transport import AsyncTransport  # noqa
@@ -0,0 +1,148 @@
+from zeep import plugins
+from zeep.asyncio.transport import AsyncTransport
+from zeep.client import Client, OperationProxy, ServiceProxy
+from zeep.wsdl.soap import PreparedOperation, SoapBinding
+from zeep.wsdl.utils import uses_post_xml
+
+
+class AsyncOperationProxy(OperationProxy):
+
+    async def __call__(self, *args, **kwargs):
+        binding = self._proxy._binding
+        if not isinstance(binding, SoapBinding):
+            raise NotImplementedError(
+                "The AsyncClient only supports SOAP bindings")
+
+        client = self._proxy._client
+        options = self._proxy._binding_options
+        timer = plugins.create_timer(client)
+        operation, envelope, headers = binding._create(
+            client, self._op_name, args, kwargs, options, timer)
+        if uses_post_xml(client.transport):
+            response = await client.transport.post_xml(
+                options['address'], envelope, headers)
+        else:
+            message, headers = binding._serialize(
+                client, operation, envelope, headers, timer=timer)
+            response = await client.transport.post(
+                options['address'], message, headers)
+        timer.mark('http')
+        return binding.process_reply(client, operation, response, timer)
+
+
+class AsyncPreparedOperation(PreparedOperation):
+
+    async def __call__(self, *args, **kwargs):
+        client = self.client
+        timer = plugins.create_timer(client)
+
+        # The envelope needs to be available as tree to sign it or to pass it
+        # to the egress hooks of the plugins or to post_xml() of the transport
+        post_xml = uses_post_xml(client.transport)
+        if client.wsse or plugins.uses_egress(client) or post_xml:
+            if self.soapheaders:
+                kwargs['_soapheaders'] = self.soapheaders
+            operation, envelope, headers = self.binding._create(
+                client, self.operation.name, args, kwargs, self.options,
+                timer)
+            if post_xml:
+                response = await client.transport.post_xml(
+                    self.options['address'], envelope, headers)
+                timer.mark('http')
+                return self.binding.process_reply(
+                    client, self.operation, response, timer)
+
+            message, headers = self.binding._serialize(
+                client, operation, envelope, headers, timer=timer)
+        else:
+            message = self.create(*args, **kwargs)
+            timer.mark('serialization')
+            message, headers = plugins.apply_egress_raw(
+                client, message, dict(self.headers), self.operation)
+            timer.mark('plugins')
+
+        response = await client.transport.post(
+            self.options['address'], message, headers)
+        timer.mark('http')
+        return self.binding.process_reply(
+            client, self.operation, response, timer)
+
+
+class AsyncServiceProxy(ServiceProxy):
+    _operation_proxy_class = AsyncOperationProxy
+
+    def stream(self, operation, *args, **kwargs):
+        raise NotImplementedError(
+            "Streaming responses is not supported by the AsyncClient")
+
+    def map(self, operation, kwargs_list, concurrency=4, ordered=True):
+        raise NotImplementedError(
+            "map() is not supported by the AsyncClient, call the operations " +
+            "concurrently via asyncio.gather() instead")
+
+    def prepare(self, operation, _soapheaders=None):
+        binding = self._binding
+        if not isinstance(binding, SoapBinding):
+            raise NotImplementedError(
+                "The AsyncClient only supports SOAP bindings")
+
+        operation_obj = binding.get(operation)
+        if not operation_obj:
+            raise ValueError("Operation %r not found" % operation)
+        return AsyncPreparedOperation(
+            self._client, binding, self._binding_options, operation_obj,
+            _soapheaders)
+
+
+class AsyncClient(Client):
+    """Client which calls the operations via an AsyncTransport.
+
+    The operations return a coroutine, for example::
+
+        client = await AsyncClient.create('http://example.com/service.wsdl')
+        result = await client.service.Method(param='value')
+
+    """
+    _service_proxy_class = AsyncServiceProxy
+
+    def __init__(self, wsdl, wsse=None, transport=None,
+                 service_name=None, port_name=None, snapshot_store=None,
+                 lazy=False, schema_registry=None, plugins=None):
+        transport = transport or AsyncTransport()
+        if not isinstance(transport, AsyncTransport):
+            raise TypeError("The AsyncClient requires an AsyncTransport")
+
+        super(AsyncClient, self).__init__(
+            wsdl, wsse=wsse, transport=transport, service_name=service_name,
+            port_name=port_name, snapshot_store=snapshot_store, lazy=lazy,
+            schema_registry=schema_registry, plugins=plugins)
+
+    @classmethod
+    async def create(cls, wsdl, wsse=None, transport=None, service_name=None,
+                     port_name=None, snapshot_store=None, lazy=False,
+                     schema_registry=None, plugins=None):
+        """Create a new client, the wsdl and the imported documents are
+        fetched concurrently without blocking the event loop.
+
+        """
+        transport = transport or AsyncTransport()
+        fetched = []
+        if isinstance(wsdl, str):
+            if snapshot_store:
+                # The imported documents are only required without snapshot
+                await transport.load_async(wsdl)
+                fetched.append(wsdl)
+            else:
+                fetched = await transport.load_document(wsdl)
+
+        try:
+            return cls(
+                wsdl, wsse=wsse, transport=transport,
+                service_name=service_name, port_name=port_name,
+                snapshot_store=snapshot_store, lazy=lazy,
+                schema_registry=schema_registry, plugins=plugins)
+        finally:
+            transport.discard(fetched)
+
+    async def close(self):
+        await self.transport.close()
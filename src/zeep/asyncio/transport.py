@@ -0,0 +1,194 @@
+import asyncio
+
+import aiohttp
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from six.moves.urllib.parse import urlparse
+from zeep.cache import get_conditional_headers, get_validators
+from zeep.parser import (
+    collect_import_locations, parse_imports, parse_xml, remote_locations)
+from zeep.transports import Transport
+from zeep.utils import NotSet
+
+
+class AsyncTransport(Transport):
+    """Transport which posts the SOAP messages via aiohttp.
+
+    The `post()` and `post_xml()` methods are coroutines. The wsdl documents
+    are still loaded via requests by `load()`, use `load_document()` to fetch
+    the wsdl and all imported documents concurrently beforehand.
+
+    :param concurrency: The maximum number of documents which are fetched
+                        concurrently by `load_document()`.
+    :param session: An optional aiohttp.ClientSession, otherwise one is
+                    created on first use. Call `close()` to close it.
+
+    """
+
+    def __init__(self, cache=NotSet, timeout=300, verify=True, http_auth=None,
+                 concurrency=10, session=None, catalog=None,
+                 serialization=None, compression=None, compression_level=6,
+                 compression_min_size=1024, payload_logger=None):
+        super(AsyncTransport, self).__init__(
+            cache=cache, timeout=timeout, verify=verify, http_auth=http_auth,
+            catalog=catalog, serialization=serialization,
+            compression=compression, compression_level=compression_level,
+            compression_min_size=compression_min_size,
+            payload_logger=payload_logger)
+        self.concurrency = concurrency
+        self._async_session = session
+        self._close_session = session is None
+
+        # Documents fetched via load_async() when there is no cache available
+        self._prefetched = {}
+
+    @property
+    def async_session(self):
+        if self._async_session is None:
+            auth = None
+            if isinstance(self.http_auth, tuple):
+                auth = aiohttp.BasicAuth(*self.http_auth)
+            self._async_session = aiohttp.ClientSession(
+                auth=auth,
+                connector=aiohttp.TCPConnector(ssl=None if self.verify else False),
+                headers={'User-Agent': self.session.headers['User-Agent']},
+                timeout=aiohttp.ClientTimeout(total=self.timeout))
+        return self._async_session
+
+    async def close(self):
+        """Close the aiohttp session (when it was created by the transport)"""
+        if self._async_session is not None and self._close_session:
+            await self._async_session.close()
+            self._async_session = None
+
+    def load(self, url):
+        content = self._prefetched.pop(url, None)
+        if content is not None:
+            return content
+        return super(AsyncTransport, self).load(url)
+
+    def discard(self, urls):
+        """Drop the documents fetched via `load_async()` for the given urls
+        which are not loaded (yet) via `load()`.
+
+        """
+        for url in urls:
+            self._prefetched.pop(url, None)
+
+    async def load_async(self, url):
+        if not url:
+            raise ValueError("No url given to load")
+
+        if urlparse(url).scheme not in ('http', 'https'):
+            return self.load(url)
+
+        if self.catalog is not None:
+            content = self.catalog.load(url)
+            if content is not None:
+                return content
+
+        if self.cache is not None:
+            response = self.cache.get(url)
+            if response:
+                return bytes(response)
+
+        stale = None
+        get_stale = getattr(self.cache, 'get_stale', None)
+        if get_stale is not None:
+            stale = get_stale(url)
+
+        headers = get_conditional_headers(stale[1]) if stale else None
+        async with self.async_session.get(url, headers=headers) as response:
+            if stale and response.status == 304:
+                self.logger.debug("Document %s is not modified", url)
+                validators = dict(stale[1])
+                validators.update(get_validators(response.headers))
+                self.cache.touch(url, validators)
+                return stale[0]
+
+            response.raise_for_status()
+            content = await response.read()
+
+        if self.cache is not None:
+            self._add_to_cache(url, content, response.headers)
+        else:
+            # Keep the content until it is loaded via load()
+            self._prefetched[url] = content
+        return content
+
+    async def load_document(self, location):
+        """Fetch the wsdl document and all the documents it imports (directly
+        or indirectly).
+
+        The documents of each level are fetched concurrently and are available
+        for the parsing of the wsdl afterwards. Returns the fetched urls, pass
+        them to `discard()` when the wsdl is parsed.
+
+        """
+        content = await self.load_async(location)
+        node = parse_xml(content, self, location)
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+        seen = set()
+        fetched = [location]
+        documents = [(node, location)]
+        while documents:
+            locations = collect_import_locations(documents, seen)
+            remote = remote_locations(locations)
+            results = await asyncio.gather(*[
+                self._prefetch_url_async(url, semaphore) for url in remote
+            ])
+            contents = {
+                url: content for url, content in zip(remote, results)
+                if content is not None
+            }
+            fetched.extend(contents)
+            documents = parse_imports(locations, contents, self)
+        return fetched
+
+    async def _prefetch_url_async(self, url, semaphore):
+        async with semaphore:
+            try:
+                return await self.load_async(url)
+            except (IOError, aiohttp.ClientError, asyncio.TimeoutError):
+                self.logger.debug("Prefetching %s failed", url)
+
+    async def post(self, address, message, headers):
+        message = self.payload_logger.log_request(
+            address, message, encoding=self.serialization.encoding)
+        if self.compression:
+            message, headers = self.compress(message, headers)
+
+        async with self.async_session.post(
+            address, data=message, headers=headers
+        ) as response:
+            content = await response.read()
+            result = self.new_response(response, content)
+
+        self.payload_logger.log_response(address, result)
+        return result
+
+    async def post_xml(self, address, envelope, headers):
+        message = self.serialization.serialize(envelope)
+        return await self.post(address, message, headers)
+
+    async def get(self, address, params, headers):
+        async with self.async_session.get(
+            address, params=params, headers=headers
+        ) as response:
+            content = await response.read()
+            return self.new_response(response, content)
+
+    def new_response(self, response, content):
+        """Convert the aiohttp response to a requests.Response object, which
+        is what the bindings expect.
+
+        """
+        new = requests.Response()
+        new._content = content
+        new.status_code = response.status
+        new.headers = CaseInsensitiveDict(response.headers)
+        new.encoding = response.charset
+        new.url = str(response.url)
+        return new
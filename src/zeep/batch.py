@@ -0,0 +1,214 @@
+"""Call an operation many times concurrently.
+
+The envelopes are created up front in the calling thread, the http requests
+(and the parsing of the responses) are handled by a pool of threads which
+share the connection pool of the `requests.Session` of the transport. The
+connection pool is enlarged when it is smaller than the number of threads.
+
+"""
+import logging
+import time
+from collections import namedtuple
+from multiprocessing.pool import ThreadPool
+
+from requests.adapters import HTTPAdapter
+
+from six.moves.urllib.parse import urlparse
+from zeep import plugins
+from zeep.wsdl.soap import SoapBinding
+
+logger = logging.getLogger(__name__)
+
+BatchResult = namedtuple('BatchResult', ['index', 'value', 'error', 'elapsed'])
+
+
+class Batch(object):
+    """Iterable which calls the operation once for every dict of kwargs and
+    yields a `BatchResult` per call.
+
+    Exceptions raised by a call don't stop the batch, they are available as
+    the `error` attribute of the result (`value` is None then). The results
+    are yielded in the order of the kwargs when `ordered` is True, otherwise
+    in the order in which the calls complete.
+
+    """
+
+    def __init__(self, service_proxy, operation, kwargs_list, concurrency=4,
+                 ordered=True):
+        if concurrency < 1:
+            raise ValueError("The concurrency should be at least 1")
+
+        self._proxy = service_proxy
+        self._operation = operation
+        self._concurrency = concurrency
+        self._ordered = ordered
+        self._consumed = False
+        self.stats = BatchStats(concurrency)
+
+        # Create all envelopes before the first request is sent
+        start = time.time()
+        self._requests = [
+            self._create(index, kwargs)
+            for index, kwargs in enumerate(kwargs_list)
+        ]
+        self.stats.serialize_time = time.time() - start
+
+    def __len__(self):
+        return len(self._requests)
+
+    def __iter__(self):
+        if self._consumed:
+            raise RuntimeError("The batch is already executed")
+        self._consumed = True
+
+        num_workers = max(1, min(self._concurrency, len(self._requests)))
+        logger.debug(
+            "Sending %d requests with %d workers",
+            len(self._requests), num_workers)
+
+        ensure_pool_size(
+            self._proxy._client.transport,
+            self._proxy._binding_options.get('address'), num_workers)
+
+        pool = ThreadPool(num_workers)
+        try:
+            func = pool.imap if self._ordered else pool.imap_unordered
+            self.stats.start()
+            for result in func(self._call, self._requests):
+                self.stats.add(result)
+                yield result
+        finally:
+            self.stats.finish()
+            pool.terminate()
+            pool.join()
+
+    def _create(self, index, kwargs):
+        binding = self._proxy._binding
+        client = self._proxy._client
+        if not isinstance(binding, SoapBinding):
+            return index, None, kwargs
+
+        timer = plugins.create_timer(client)
+        try:
+            created = binding._create(
+                client, self._operation, (), kwargs,
+                self._proxy._binding_options, timer)
+        except Exception as exc:  # noqa
+            return index, exc, None
+        return index, created + (timer,), None
+
+    def _call(self, request):
+        index, created, kwargs = request
+        if isinstance(created, Exception):
+            return BatchResult(index, None, created, 0.0)
+
+        binding = self._proxy._binding
+        client = self._proxy._client
+        options = self._proxy._binding_options
+
+        start = time.time()
+        try:
+            if created is None:
+                value = binding.send(
+                    client, options, self._operation, (), kwargs)
+            else:
+                operation, envelope, headers, timer = created
+                timer.restart()
+                response = binding._post(
+                    client, options, operation, envelope, headers,
+                    timer=timer)
+                value = binding.process_reply(
+                    client, operation, response, timer)
+        except Exception as exc:  # noqa
+            return BatchResult(index, None, exc, time.time() - start)
+        return BatchResult(index, value, None, time.time() - start)
+
+
+def ensure_pool_size(transport, address, size):
+    """Make sure the connection pool of the session of the transport keeps
+    at least `size` connections to the address.
+
+    The default `HTTPAdapter` keeps 10 connections per host, the connections
+    of the other threads would be closed after every request. A larger
+    adapter is mounted for the host of the address then, which is kept for
+    later calls. Custom adapters are left alone.
+
+    """
+    session = getattr(transport, 'session', None)
+    if session is None or not address:
+        return
+
+    # The adapters are ordered by the length of their prefix, see
+    # requests.Session.get_adapter()
+    for prefix, adapter in session.adapters.items():
+        if address.lower().startswith(prefix.lower()):
+            break
+    else:
+        return
+
+    if type(adapter) is not HTTPAdapter:
+        return
+    if adapter._pool_maxsize >= size:
+        return
+
+    parts = urlparse(address)
+    host_prefix = '%s://%s' % (parts.scheme, parts.netloc)
+    logger.debug(
+        "Mounting an adapter with %d connections for %s", size, host_prefix)
+    session.mount(host_prefix, HTTPAdapter(
+        pool_connections=adapter._pool_connections,
+        pool_maxsize=max(size, adapter._pool_maxsize),
+        max_retries=adapter.max_retries,
+        pool_block=adapter._pool_block))
+
+
+class BatchStats(object):
+    """Timing statistics of a batch, the times are in seconds."""
+
+    def __init__(self, concurrency):
+        self.concurrency = concurrency
+        self.count = 0
+        self.errors = 0
+        self.serialize_time = 0.0
+        self.total_time = 0.0
+        self.min_time = None
+        self.max_time = None
+        self._sum_time = 0.0
+        self._start = None
+
+    def start(self):
+        self._start = time.time()
+
+    def finish(self):
+        if self._start is not None:
+            self.total_time = time.time() - self._start
+
+    def add(self, result):
+        self.count += 1
+        if result.error is not None:
+            self.errors += 1
+        self._sum_time += result.elapsed
+        if self.min_time is None or result.elapsed < self.min_time:
+            self.min_time = result.elapsed
+        if self.max_time is None or result.elapsed > self.max_time:
+            self.max_time = result.elapsed
+
+    @property
+    def mean_time(self):
+        """The mean duration of a single call"""
+        if not self.count:
+            return None
+        return self._sum_time / self.count
+
+    @property
+    def throughput(self):
+        """The number of calls per second"""
+        if not self.total_time:
+            return None
+        return self.count / self.total_time
+
+    def __repr__(self):
+        return (
+            '<BatchStats(count=%d, errors=%d, concurrency=%d, '
+            'total_time=%.3f)>' % (
+                self.count, self.errors, self.concurrency, self.total_time))
@@ -1,57 +1,250 @@
-import base64
 import datetime
 import errno
 import logging
 import os
 import sqlite3
 import threading
+from collections import OrderedDict
 from contextlib import contextmanager
 
 import appdirs
 import pytz
-import six
 
 logger = logging.getLogger(__name__)
 
 
 class Base(object):
+    """Base class of the caches.
 
-    def add(self, url, content):
+    Besides the content the caches store the validators of the response (a
+    dict with the `etag`, `last_modified` and `max_age` of the document) when
+    these are passed to `add()`. Expired documents with validators are kept
+    so that the transport can revalidate them via a conditional request, see
+    `get_stale()` and `touch()`.
+
+    When `max_stale` is set the transport serves documents which are expired
+    for at most `max_stale` seconds (via `get(url, stale=True)`) while it
+    refreshes them in the background.
+
+    """
+    max_stale = None
+
+    def add(self, url, content, validators=None):
         raise NotImplemented()
 
     def get(self, url):
         raise NotImplemented()
 
+    def get_stale(self, url):
+        """Return a tuple with the content and validators of the document,
+        also when it is expired. Returns None when there is no document with
+        validators in the cache.
+
+        """
+        return None
+
+    def touch(self, url, validators=None):
+        """Mark the (revalidated) document as fresh again"""
+
 
 class InMemoryCache(Base):
-    """Simple in-memory caching using dict lookup with support for timeouts"""
-    _cache = {}  # global cache, thread-safe by default
+    """In-memory caching with support for timeouts and LRU eviction.
+
+    The cache is bounded by the total size of the cached contents in bytes
+    (`maxsize`) and optionally by the number of entries (`maxentries`). The
+    least recently used entries are evicted first. Expired entries are removed
+    as soon as they are noticed (after `max_stale` seconds when given).
+
+    Every instance has its own storage, pass `shared=True` to use a global
+    storage which is shared with all other shared instances.
 
-    def __init__(self, timeout=3600):
+    """
+    _shared_storage = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, timeout=3600, maxsize=50 * 1024 * 1024,
+                 maxentries=None, shared=False, max_stale=None):
         self._timeout = timeout
+        self._maxsize = maxsize
+        self._maxentries = maxentries
+        self.max_stale = max_stale
+
+        if shared:
+            with self._shared_lock:
+                if InMemoryCache._shared_storage is None:
+                    InMemoryCache._shared_storage = _MemoryStorage()
+            self._storage = InMemoryCache._shared_storage
+        else:
+            self._storage = _MemoryStorage()
 
-    def add(self, url, content):
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+        self.evictions = 0
+
+    def add(self, url, content, validators=None):
         logger.debug("Caching contents of %s", url)
-        self._cache[url] = (datetime.datetime.utcnow(), content)
+        storage = self._storage
+        expires = _get_expires(self._timeout, validators)
+
+        with storage.lock:
+            storage.remove(url)
+            if self._maxsize is not None and len(content) > self._maxsize:
+                logger.debug("Not caching %s, content is too large", url)
+                return
+
+            storage.insert(url, expires, content, validators)
+            self._purge_expired()
+            while storage.entries and (
+                (self._maxsize is not None and
+                 storage.size > self._maxsize) or
+                (self._maxentries is not None and
+                 len(storage.entries) > self._maxentries)
+            ):
+                oldest = next(iter(storage.entries))
+                logger.debug("Evicting %s from the cache", oldest)
+                storage.remove(oldest)
+                self.evictions += 1
+
+    def get(self, url, stale=False):
+        storage = self._storage
+        with storage.lock:
+            self._purge_expired()
+            entry = storage.entries.pop(url, None)
+            if entry is not None:
+                # Mark the entry as most recently used
+                storage.entries[url] = entry
+
+                # Expired entries with validators are kept for get_stale()
+                expires, content, validators = entry
+                now = datetime.datetime.utcnow()
+                if expires is None or expires >= now:
+                    logger.debug("Cache HIT for %s", url)
+                    self.hits += 1
+                    return content
+
+                if stale and self.max_stale is not None and (
+                    expires + datetime.timedelta(seconds=self.max_stale) >= now
+                ):
+                    logger.debug("Cache HIT for %s (stale)", url)
+                    self.stale_hits += 1
+                    return content
+
+            # The first lookup already counted the miss
+            if stale:
+                return None
+            self.misses += 1
 
-    def get(self, url):
-        try:
-            created, content = self._cache[url]
-        except KeyError:
-            pass
-        else:
-            if not _is_expired(created, self._timeout):
-                logger.debug("Cache HIT for %s", url)
-                return content
         logger.debug("Cache MISS for %s", url)
         return None
 
+    def get_stale(self, url):
+        with self._storage.lock:
+            entry = self._storage.entries.get(url)
+        if entry is not None and entry[2]:
+            return entry[1], entry[2]
+
+    def touch(self, url, validators=None):
+        storage = self._storage
+        with storage.lock:
+            entry = storage.entries.pop(url, None)
+            if entry is None:
+                return
+            validators = validators or entry[2]
+            expires = _get_expires(self._timeout, validators)
+            storage.entries[url] = (expires, entry[1], validators)
+            if not validators:
+                storage.update_next_expiry(expires)
+
+    def clear(self):
+        """Remove all entries from the cache"""
+        with self._storage.lock:
+            self._storage.entries.clear()
+            self._storage.size = 0
+            self._storage.next_expiry = None
+
+    def __len__(self):
+        return len(self._storage.entries)
+
+    @property
+    def size(self):
+        """Return the total size in bytes of the cached contents"""
+        return self._storage.size
+
+    def _purge_expired(self):
+        """Remove all expired entries. This only scans the entries when at
+        least one of them is expired.
+
+        """
+        storage = self._storage
+        now = datetime.datetime.utcnow()
+        if storage.next_expiry is None or storage.next_expiry >= now:
+            return
+
+        max_stale = datetime.timedelta(seconds=self.max_stale or 0)
+        expired = [
+            url for url, (expires, content, validators)
+            in storage.entries.items()
+            if expires is not None and expires + max_stale < now and
+            not validators
+        ]
+        for url in expired:
+            logger.debug("Removing expired %s from the cache", url)
+            storage.remove(url)
+            self.evictions += 1
+
+        storage.next_expiry = None
+        for expires, content, validators in storage.entries.values():
+            if expires is not None and not validators:
+                storage.update_next_expiry(expires + max_stale)
+
+
+class _MemoryStorage(object):
+    """The entries of an InMemoryCache, ordered from least to most recently
+    used.
+
+    """
+
+    def __init__(self):
+        self.entries = OrderedDict()
+        self.lock = threading.RLock()
+        self.size = 0
+        self.next_expiry = None
+
+    def insert(self, url, expires, content, validators=None):
+        self.entries[url] = (expires, content, validators)
+        self.size += len(content)
+        if not validators:
+            self.update_next_expiry(expires)
+
+    def remove(self, url):
+        try:
+            expires, content, validators = self.entries.pop(url)
+        except KeyError:
+            return
+        self.size -= len(content)
+
+    def update_next_expiry(self, expires):
+        if expires is not None and (
+            self.next_expiry is None or expires < self.next_expiry
+        ):
+            self.next_expiry = expires
+
 
 class SqliteCache(Base):
-    """Cache contents via an sqlite database on the filesystem"""
-    _version = '1'
+    """Cache contents via an sqlite database on the filesystem.
+
+    Every thread uses its own (persistent) connection to the database. The
+    database uses the WAL journal mode so that readers don't block each other
+    or the writer.
 
-    def __init__(self, path=None, timeout=3600):
+    The contents are stored in the `request_v3` table. Older versions of
+    zeep store (base64 encoded) contents in the `request` table of the same
+    default database, the versions don't read each other's rows.
+
+    """
+
+    def __init__(self, path=None, timeout=3600, max_stale=None):
 
         # No way we can support this when we want to achieve thread safety
         if path == ':memory:':
@@ -59,70 +252,160 @@ class SqliteCache(Base):
                 "The SqliteCache doesn't support :memory: since it is not " +
                 "thread-safe. Please use zeep.cache.InMemoryCache()")
 
-        self._lock = threading.RLock()
+        self._local = threading.local()
         self._timeout = timeout
+        self.max_stale = max_stale
         self._db_path = path if path else _get_default_cache_path()
 
         # Initialize db
         with self.db_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                """
-                    CREATE TABLE IF NOT EXISTS request
-                    (created timestamp, url text, content text)
-                """)
-            conn.commit()
+            self._create_table(conn)
 
     @contextmanager
     def db_connection(self):
-        with self._lock:
+        # Connections can't be shared with a forked child process
+        pid = os.getpid()
+        if getattr(self._local, 'pid', None) != pid:
             connection = sqlite3.connect(
                 self._db_path, detect_types=sqlite3.PARSE_DECLTYPES)
-            yield connection
-            connection.close()
+            connection.execute('PRAGMA journal_mode=WAL')
+            self._local.connection = connection
+            self._local.pid = pid
+        yield self._local.connection
+
+    def _create_table(self, conn):
+        conn.execute(
+            """
+                CREATE TABLE IF NOT EXISTS request_v3
+                (url text PRIMARY KEY, created timestamp, content blob,
+                 etag text, last_modified text, max_age integer)
+            """)
+        conn.commit()
 
-    def add(self, url, content):
+    def add(self, url, content, validators=None):
         logger.debug("Caching contents of %s", url)
-        data = self._encode_data(content)
+        validators = validators or {}
 
         with self.db_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("DELETE FROM request WHERE url = ?", (url,))
-            cursor.execute(
-                "INSERT INTO request (created, url, content) VALUES (?, ?, ?)",
-                (datetime.datetime.utcnow(), url, data))
+            conn.execute(
+                """
+                    INSERT OR REPLACE INTO request_v3
+                    (url, created, content, etag, last_modified, max_age)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (url, datetime.datetime.utcnow(), sqlite3.Binary(content),
+                 validators.get('etag'), validators.get('last_modified'),
+                 validators.get('max_age')))
             conn.commit()
 
-    def get(self, url):
+    def get(self, url, stale=False):
         with self.db_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                "SELECT created, content FROM request WHERE url=?", (url, ))
-            rows = cursor.fetchall()
-
-        if rows:
-            created, data = rows[0]
-            if not _is_expired(created, self._timeout):
+            cursor = conn.execute(
+                """
+                    SELECT created, content, max_age FROM request_v3
+                    WHERE url = ?
+                """, (url, ))
+            row = cursor.fetchone()
+
+        if row:
+            created, data, max_age = row
+            timeout = max_age if max_age is not None else self._timeout
+            if not _is_expired(created, timeout):
                 logger.debug("Cache HIT for %s", url)
-                return self._decode_data(data)
+                return bytes(data)
+
+            if stale and self.max_stale is not None and (
+                not _is_expired(created, timeout + self.max_stale)
+            ):
+                logger.debug("Cache HIT for %s (stale)", url)
+                return bytes(data)
         logger.debug("Cache MISS for %s", url)
 
-    def _encode_data(self, data):
-        data = base64.b64encode(data)
-        if six.PY2:
-            return buffer(self._version_string + data)
-        return self._version_string + data
+    def get_stale(self, url):
+        with self.db_connection() as conn:
+            cursor = conn.execute(
+                """
+                    SELECT content, etag, last_modified, max_age FROM request_v3
+                    WHERE url = ? AND (
+                        etag IS NOT NULL OR last_modified IS NOT NULL)
+                """, (url, ))
+            row = cursor.fetchone()
 
-    def _decode_data(self, data):
-        if six.PY2:
-            data = str(data)
-        if data.startswith(self._version_string):
-            return base64.b64decode(data[len(self._version_string):])
+        if row:
+            data, etag, last_modified, max_age = row
+            validators = {
+                'etag': etag,
+                'last_modified': last_modified,
+                'max_age': max_age,
+            }
+            return bytes(data), validators
 
-    @property
-    def _version_string(self):
-        prefix = u'$ZEEP:%s$' % self._version
-        return bytes(prefix.encode('ascii'))
+    def touch(self, url, validators=None):
+        logger.debug("Refreshing cached contents of %s", url)
+        with self.db_connection() as conn:
+            if validators:
+                conn.execute(
+                    """
+                        UPDATE request_v3
+                        SET created = ?, etag = ?, last_modified = ?,
+                            max_age = ?
+                        WHERE url = ?
+                    """,
+                    (datetime.datetime.utcnow(), validators.get('etag'),
+                     validators.get('last_modified'),
+                     validators.get('max_age'), url))
+            else:
+                conn.execute(
+                    "UPDATE request_v3 SET created = ? WHERE url = ?",
+                    (datetime.datetime.utcnow(), url))
+            conn.commit()
+
+
+def get_validators(headers):
+    """Return the cache validators (etag, last_modified and max_age) of the
+    http response headers as dict, the values which are not available are
+    left out.
+
+    """
+    validators = {}
+    if headers.get('ETag'):
+        validators['etag'] = headers['ETag']
+    if headers.get('Last-Modified'):
+        validators['last_modified'] = headers['Last-Modified']
+
+    for directive in headers.get('Cache-Control', '').split(','):
+        name, _, value = directive.strip().partition('=')
+        if name.lower() == 'max-age':
+            try:
+                validators['max_age'] = int(value.strip('"'))
+            except ValueError:
+                pass
+    return validators
+
+
+def get_conditional_headers(validators):
+    """Return the http headers to revalidate a document with the given
+    validators.
+
+    """
+    headers = {}
+    if validators.get('etag'):
+        headers['If-None-Match'] = validators['etag']
+    if validators.get('last_modified'):
+        headers['If-Modified-Since'] = validators['last_modified']
+    return headers
+
+
+def _get_expires(timeout, validators=None):
+    """Return the expiry datetime, the max_age of the validators takes
+    precedence over the timeout.
+
+    """
+    if validators and validators.get('max_age') is not None:
+        timeout = validators['max_age']
+    if timeout is None:
+        return None
+    return datetime.datetime.utcnow() + datetime.timedelta(seconds=timeout)
 
 
 def _is_expired(value, timeout):
@@ -0,0 +1,171 @@
+import logging
+import mmap
+import os
+import threading
+import zipfile
+from contextlib import closing
+
+from lxml import etree
+
+logger = logging.getLogger(__name__)
+
+
+class Catalog(object):
+    """Mapping of (remote) locations to local files, consulted by the
+    transport before a document is fetched.
+
+    Both exact locations and location prefixes can be mapped. A prefix is
+    mapped to a local directory or to a zip archive, the remainder of the
+    location is then used as path within the directory / archive::
+
+        catalog = Catalog()
+        catalog.add_prefix(
+            'http://schemas.example.com/', '/opt/app/schemas/')
+        catalog.add_prefix(
+            'http://docs.oasis-open.org/', '/opt/app/oasis-schemas.zip')
+        transport = Transport(catalog=catalog)
+
+    The longest matching prefix is used. Locations for which no local file
+    exists are loaded by the transport as usual. Locations which point
+    outside of the directory / archive (via '..') are never loaded from it.
+
+    :param entries: Optional dict with prefix -> directory/zip archive entries
+
+    """
+
+    def __init__(self, entries=None):
+        self._uris = {}
+        self._prefixes = []
+        self._archives = {}
+        self._lock = threading.Lock()
+
+        for prefix, target in (entries or {}).items():
+            self.add_prefix(prefix, target)
+
+    def add(self, location, path):
+        """Map the location to the local file at path"""
+        self._uris[location] = path
+
+    def add_prefix(self, prefix, target):
+        """Map all locations starting with prefix to the directory or zip
+        archive target.
+
+        """
+        is_archive = os.path.isfile(target) and zipfile.is_zipfile(target)
+        self._prefixes.append((prefix, target, is_archive))
+        self._prefixes.sort(key=lambda item: len(item[0]), reverse=True)
+
+    @classmethod
+    def from_file(cls, path):
+        """Create a catalog from an OASIS XML catalog file.
+
+        The uri, system, rewriteURI and rewriteSystem entries are supported,
+        as well as nextCatalog references to other catalog files. Relative
+        paths are relative to the catalog file.
+
+        """
+        catalog = cls()
+        catalog.load_file(path)
+        return catalog
+
+    def load_file(self, path):
+        """Add the entries of the OASIS XML catalog file at path"""
+        base = os.path.dirname(os.path.abspath(path))
+        doc = etree.parse(path)
+
+        for node in doc.getroot().iter(etree.Element):
+            tag = etree.QName(node).localname
+            if tag == 'uri':
+                self.add(node.get('name'), _join(base, node.get('uri')))
+            elif tag == 'system':
+                self.add(node.get('systemId'), _join(base, node.get('uri')))
+            elif tag == 'rewriteURI':
+                self.add_prefix(
+                    node.get('uriStartString'),
+                    _join(base, node.get('rewritePrefix')))
+            elif tag == 'rewriteSystem':
+                self.add_prefix(
+                    node.get('systemIdStartString'),
+                    _join(base, node.get('rewritePrefix')))
+            elif tag == 'nextCatalog':
+                self.load_file(_join(base, node.get('catalog')))
+
+    def load(self, location):
+        """Return the content of the local file for the location, returns
+        None when the location is not in the catalog or when the local file
+        doesn't exist.
+
+        """
+        path = self._uris.get(location)
+        if path is not None:
+            return self._read_file(location, path)
+
+        for prefix, target, is_archive in self._prefixes:
+            if not location.startswith(prefix):
+                continue
+
+            # The location can come from a (remote) document, it may never
+            # refer to files outside of the target.
+            name = location[len(prefix):].lstrip('/')
+            if is_archive:
+                path = name if '..' not in name.split('/') else None
+            else:
+                path = _safe_join(target, name)
+            if path is None:
+                logger.warning(
+                    "Not loading %s from the catalog, the location is " +
+                    "outside of %s", location, target)
+                continue
+
+            if is_archive:
+                content = self._read_archive(location, target, path)
+            else:
+                content = self._read_file(location, path)
+            if content is not None:
+                return content
+
+    def _read_file(self, location, path):
+        try:
+            with open(path, 'rb') as fh:
+                logger.debug("Loading %s from %s", location, path)
+                if os.fstat(fh.fileno()).st_size == 0:
+                    return b''
+                with closing(mmap.mmap(
+                        fh.fileno(), 0, access=mmap.ACCESS_READ)) as data:
+                    return data[:]
+        except IOError:
+            logger.debug("Catalog file %s for %s not found", path, location)
+
+    def _read_archive(self, location, path, name):
+        with self._lock:
+            archive = self._archives.get(path)
+            if archive is None:
+                archive = self._archives[path] = zipfile.ZipFile(path)
+
+            try:
+                content = archive.read(name)
+            except KeyError:
+                logger.debug(
+                    "Catalog archive %s has no %s for %s",
+                    path, name, location)
+                return
+        logger.debug("Loading %s from %s (%s)", location, path, name)
+        return content
+
+
+def _join(base, path):
+    if path.startswith('file://'):
+        path = path[7:]
+    return os.path.join(base, path)
+
+
+def _safe_join(directory, name):
+    """Return the path of name within directory, None if the normalised path
+    is not within the directory.
+
+    """
+    directory = os.path.abspath(directory)
+    path = os.path.normpath(os.path.join(directory, *name.split('/')))
+    if not path.startswith(os.path.join(directory, '')):
+        return
+    return path
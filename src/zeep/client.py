@@ -1,5 +1,6 @@
 import logging
 
+from zeep.batch import Batch
 from zeep.transports import Transport
 from zeep.wsdl import Document
 
@@ -25,6 +26,8 @@ class OperationProxy(object):
 
 
 class ServiceProxy(object):
+    _operation_proxy_class = OperationProxy
+
     def __init__(self, client, binding, **binding_options):
         self._client = client
         self._binding_options = binding_options
@@ -38,19 +41,86 @@ class ServiceProxy(object):
             self._binding.get(key)
         except KeyError:
             raise AttributeError('Service has no operation %r' % key)
-        return OperationProxy(self, key)
+        return self._operation_proxy_class(self, key)
+
+    def stream(self, operation, *args, **kwargs):
+        """Call the operation and return a generator which yields the
+        repeated elements (maxOccurs > 1) in the response one by one.
+
+        The response is parsed incrementally so the memory usage is bounded
+        by the size of one element. Only SOAP bindings are supported.
+
+        """
+        if not hasattr(self._binding, 'stream'):
+            raise NotImplementedError(
+                "Streaming is only supported for SOAP bindings")
+        return self._binding.stream(
+            self._client, self._binding_options, operation, args, kwargs)
+
+    def prepare(self, operation, _soapheaders=None):
+        """Return a prepared version of the operation for repeated calls.
+
+        The soap:Envelope and the structure of the body are created once,
+        every call only converts the values. The `_soapheaders` are part of
+        the prepared operation. Only SOAP bindings are supported.
+
+        """
+        if not hasattr(self._binding, 'prepare'):
+            raise NotImplementedError(
+                "Prepared operations are only supported for SOAP bindings")
+        return self._binding.prepare(
+            self._client, self._binding_options, operation, _soapheaders)
+
+    def prewarm(self, operations=None):
+        """Resolve the given operations (default all) of the binding.
+
+        When the client is created with `lazy=True` the operations are
+        resolved on first use, use this to do that at startup for the
+        operations which are called by the application.
+
+        """
+        self._binding.prewarm(operations)
+
+    def map(self, operation, kwargs_list, concurrency=4, ordered=True):
+        """Call the operation for every dict of kwargs in `kwargs_list`
+        using `concurrency` threads.
+
+        Returns a `zeep.batch.Batch` which yields a `BatchResult` per call,
+        see `zeep.batch.Batch` for the details.
+
+        """
+        if not self._binding.get(operation):
+            raise ValueError("Operation %r not found" % operation)
+        return Batch(
+            self, operation, kwargs_list, concurrency=concurrency,
+            ordered=ordered)
 
 
 class Client(object):
+    _service_proxy_class = ServiceProxy
 
     def __init__(self, wsdl, wsse=None, transport=None,
-                 service_name=None, port_name=None):
+                 service_name=None, port_name=None, snapshot_store=None,
+                 lazy=False, schema_registry=None, plugins=None):
         if not wsdl:
             raise ValueError("No URL given for the wsdl")
 
+        # The snapshot contains the resolved document, which is neither lazy
+        # nor shares its schemas with the registry.
+        if snapshot_store and (lazy or schema_registry is not None):
+            raise ValueError(
+                "The snapshot_store can't be combined with the lazy or "
+                "schema_registry options")
+
         self.transport = transport or Transport()
-        self.wsdl = Document(wsdl, self.transport)
+        if snapshot_store and not hasattr(wsdl, 'read'):
+            self.wsdl = snapshot_store.load(wsdl, self.transport)
+        else:
+            self.wsdl = Document(
+                wsdl, self.transport, lazy=lazy,
+                schema_registry=schema_registry)
         self.wsse = wsse
+        self.plugins = plugins if plugins is not None else []
 
         self._default_service = None
         self._default_service_name = service_name
@@ -95,7 +165,8 @@ class Client(object):
                 raise ValueError("Port not found")
         else:
             port = list(service.ports.values())[0]
-        return ServiceProxy(self, port.binding, **port.binding_options)
+        return self._service_proxy_class(
+            self, port.binding, **port.binding_options)
 
     def create_service(self, binding_name, address):
         """Create a new ServiceProxy for the given binding name and address.
@@ -110,7 +181,7 @@ class Client(object):
             raise ValueError(
                 "No binding found with the given QName. Available bindings "
                 "are: %s" % (', '.join(self.wsdl.bindings.keys())))
-        return ServiceProxy(self, binding, address=address)
+        return self._service_proxy_class(self, binding, address=address)
 
     def get_type(self, name):
         return self.wsdl.types.get_type(name)
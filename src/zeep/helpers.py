@@ -1,20 +1,141 @@
-from collections import OrderedDict
+import re
+from collections import OrderedDict, namedtuple
 
+from zeep.xsd.elements import Element
+from zeep.xsd.types import ComplexType
 from zeep.xsd.valueobjects import CompoundValue
 
+# The namedtuple classes created by serialize_rows() and the fields with a
+# nested object are cached on the value classes, so they are released
+# together with the client which created the value classes.
+_ROW_CLASSES = '_zeep_row_classes'
+_NESTED_FIELDS = '_zeep_nested_fields'
 
-def serialize_object(obj):
-    """Serialize zeep objects to native python data structures"""
-    if obj is None:
-        return obj
 
+def serialize_object(obj, target_cls=OrderedDict):
+    """Serialize zeep objects to native python data structures
+
+    :param target_cls: The mapping class used for the objects, e.g. `dict`
+
+    """
+    if isinstance(obj, list):
+        return [serialize_object(sub, target_cls) for sub in obj]
+
+    if isinstance(obj, CompoundValue):
+        return target_cls([
+            (key, serialize_object(value, target_cls))
+            for key, value in obj._xsd_items()
+        ])
+
+    if isinstance(obj, dict):
+        return target_cls([
+            (key, serialize_object(value, target_cls))
+            for key, value in obj.items()
+        ])
+    return obj
+
+
+def serialize_rows(objects):
+    """Convert the given zeep objects to namedtuples.
+
+    A namedtuple class is created (once) for every combination of type and
+    fields. Nested objects are converted to namedtuples as well, field names
+    which aren't valid python identifiers are renamed to `_<index>`.
+
+    """
+    return [_serialize_row(obj) for obj in objects]
+
+
+def serialize_columns(objects, flatten=True, separator='.'):
+    """Convert the given zeep objects (for example the repeated elements of a
+    response) to a column oriented OrderedDict with a list of values per
+    field, which can be passed directly to `pandas.DataFrame()`.
+
+    The objects are consumed once, so this also accepts a generator (see
+    `ServiceProxy.stream()`). Fields which are missing in an object get the
+    value None.
+
+    :param flatten: Store the fields of nested objects in their own column
+                    (named `<name><separator><field>`) instead of as dict.
+    :param separator: The separator used for the flattened column names.
+
+    """
+    columns = OrderedDict()
+    num_rows = 0
+    for obj in objects:
+        row = OrderedDict()
+        _flatten_object(obj, row, '', flatten, separator)
+
+        for key, value in row.items():
+            column = columns.get(key)
+            if column is None:
+                column = columns[key] = [None] * num_rows
+            column.append(value)
+
+        num_rows += 1
+        if len(row) < len(columns):
+            for column in columns.values():
+                if len(column) < num_rows:
+                    column.append(None)
+    return columns
+
+
+def _serialize_row(obj):
     if isinstance(obj, list):
-        return [serialize_object(sub) for sub in obj]
-
-    result = OrderedDict()
-    for key in obj:
-        value = obj[key]
-        if isinstance(value, CompoundValue):
-            value = serialize_object(value)
-        result[key] = value
-    return result
+        return [_serialize_row(sub) for sub in obj]
+    if not isinstance(obj, CompoundValue):
+        return obj
+
+    items = obj._xsd_items()
+    row_class = _get_row_class(
+        obj.__class__, tuple(key for key, value in items))
+    return row_class(*[_serialize_row(value) for key, value in items])
+
+
+def _get_row_class(cls, fields):
+    # Use the class __dict__, subclasses have their own cache
+    row_classes = cls.__dict__.get(_ROW_CLASSES)
+    if row_classes is None:
+        row_classes = {}
+        setattr(cls, _ROW_CLASSES, row_classes)
+
+    row_class = row_classes.get(fields)
+    if row_class is None:
+        typename = re.sub(r'\W', '_', cls.__name__)
+        row_class = namedtuple(typename, fields, rename=True)
+        row_classes[fields] = row_class
+    return row_class
+
+
+def _flatten_object(obj, result, prefix, flatten, separator):
+    nested = _get_nested_fields(obj) if flatten else ()
+    items = obj._xsd_items() if isinstance(obj, CompoundValue) else obj.items()
+    for key, value in items:
+        if flatten and isinstance(value, (CompoundValue, dict)):
+            _flatten_object(
+                value, result, prefix + key + separator, flatten, separator)
+        elif value is None and key in nested:
+            # The columns of the nested object are filled with None
+            continue
+        else:
+            result[prefix + key] = serialize_object(value, dict)
+
+
+def _get_nested_fields(obj):
+    """Return the names of the fields of the object which contain a single
+    nested object.
+
+    """
+    if not isinstance(obj, CompoundValue):
+        return ()
+
+    cls = obj.__class__
+    fields = cls.__dict__.get(_NESTED_FIELDS)
+    if fields is None:
+        fields = frozenset(
+            name for name, element in cls._xsd_type.elements
+            if isinstance(element, Element) and
+            isinstance(element.type, ComplexType) and
+            not element.accepts_multiple)
+        setattr(cls, _NESTED_FIELDS, fields)
+    return fields
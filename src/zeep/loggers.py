@@ -0,0 +1,123 @@
+import codecs
+import logging
+import re
+
+import six
+
+__all__ = ['PayloadLogger']
+
+_charset_re = re.compile(r';\s*charset=["\']?([^"\';\s]+)', re.IGNORECASE)
+
+
+class PayloadLogger(object):
+    """Log the messages sent and received by the transport.
+
+    The messages are logged on the DEBUG level of the logger. Nothing is
+    formatted (and the content of the responses is not read) when this level
+    is not enabled. Long messages are truncated to `max_length` bytes,
+    streamed requests are logged when all chunks are sent.
+
+    Subclass this class and pass it to the transport to log the messages in
+    an other way::
+
+        transport = Transport(payload_logger=PayloadLogger(max_length=None))
+
+    :param logger: The logger (or name of the logger) to use
+    :param max_length: The maximum number of bytes of a message which are
+                       logged, None to log the complete messages.
+
+    """
+
+    def __init__(self, logger='zeep.transports', max_length=64 * 1024):
+        if isinstance(logger, six.string_types):
+            logger = logging.getLogger(logger)
+        self.logger = logger
+        self.max_length = max_length
+
+    @property
+    def enabled(self):
+        return self.logger.isEnabledFor(logging.DEBUG)
+
+    def log_request(self, address, message, encoding=None):
+        """Log the message which is posted to the address.
+
+        Returns the message, iterables are wrapped so that the chunks are
+        logged while they are sent. The message is decoded with the given
+        encoding (utf-8 by default).
+
+        """
+        if not self.enabled:
+            return message
+
+        if isinstance(message, (six.binary_type, six.text_type)):
+            self.logger.debug(
+                "HTTP Post to %s:\n%s", address,
+                self.format(message, len(message), encoding))
+            return message
+        return self._log_chunks(address, message, encoding)
+
+    def log_response(self, address, response, stream=False):
+        """Log the response, the content of streamed responses is not
+        logged. The content is decoded with the charset of the response
+        (utf-8 when there is none).
+
+        """
+        if not self.enabled:
+            return
+
+        if stream:
+            self.logger.debug(
+                "HTTP Response from %s (status: %d, streaming)",
+                address, response.status_code)
+        else:
+            content = response.content
+            self.logger.debug(
+                "HTTP Response from %s (status: %d):\n%s",
+                address, response.status_code,
+                self.format(content, len(content), _get_charset(response)))
+
+    def format(self, content, length, encoding=None):
+        """Return the (truncated) content as text, length is the size of the
+        complete content. Bytes are decoded with the encoding, or utf-8 when
+        it is not given or unknown.
+
+        """
+        truncated = self.max_length is not None and length > self.max_length
+        if truncated:
+            content = content[:self.max_length]
+        if isinstance(content, six.binary_type):
+            content = content.decode(_get_codec(encoding), 'replace')
+        if truncated:
+            content += u'\n[truncated, %d of %d bytes]' % (
+                self.max_length, length)
+        return content
+
+    def _log_chunks(self, address, chunks, encoding=None):
+        head = []
+        size = 0
+        for chunk in chunks:
+            if self.max_length is None or size < self.max_length:
+                head.append(chunk)
+            size += len(chunk)
+            yield chunk
+
+        content = head[0][:0].join(head) if head else b''
+        self.logger.debug(
+            "HTTP Post to %s (streamed):\n%s", address,
+            self.format(content, size, encoding))
+
+
+def _get_charset(response):
+    """Return the charset of the Content-Type header of the response"""
+    headers = getattr(response, 'headers', None) or {}
+    match = _charset_re.search(headers.get('Content-Type', ''))
+    return match.group(1) if match else None
+
+
+def _get_codec(encoding):
+    if encoding:
+        try:
+            return codecs.lookup(encoding).name
+        except LookupError:
+            pass
+    return 'utf-8'
@@ -6,6 +6,13 @@ from lxml import etree
 from six.moves.urllib.parse import urljoin, urlparse
 from zeep.exceptions import XMLSyntaxError
 
+# Mapping between the import statements and the attribute with the location
+IMPORT_LOCATIONS = {
+    '{http://www.w3.org/2001/XMLSchema}import': 'schemaLocation',
+    '{http://www.w3.org/2001/XMLSchema}include': 'schemaLocation',
+    '{http://schemas.xmlsoap.org/wsdl/}import': 'location',
+}
+
 
 def parse_xml(content, transport, base_url=None):
     parser = etree.XMLParser(remove_comments=True)
@@ -15,10 +22,16 @@ def parse_xml(content, transport, base_url=None):
         raise XMLSyntaxError("Invalid XML content received (%s)" % exc.message)
 
 
-def load_external(url, transport, base_url=None):
+def load_external(url, transport, base_url=None, prefetched=None):
     if base_url:
         url = absolute_location(url, base_url)
 
+    # Documents which are already parsed by prefetch_imports()
+    if prefetched:
+        document = prefetched.pop(url, None)
+        if document is not None:
+            return document
+
     response = transport.load(url)
     return parse_xml(response, transport, base_url)
 
@@ -38,3 +51,84 @@ def absolute_location(location, base):
         if base:
             return os.path.join(os.path.dirname(base), location)
     return location
+
+
+def prefetch_imports(node, transport, base_url=None):
+    """Load all documents referenced by the given document concurrently.
+
+    This walks the xsd:import, xsd:include and wsdl:import statements of the
+    document and of the imported documents. The documents of each level are
+    loaded concurrently via `Transport.prefetch()`.
+
+    Returns a dict with the parsed documents by their absolute location,
+    these are used for the (sequential) parsing of the wsdl afterwards
+    instead of loading and parsing them again.
+
+    """
+    result = {}
+    seen = set()
+    documents = [(node, base_url)]
+    while documents:
+        locations = collect_import_locations(documents, seen)
+        remote = remote_locations(locations)
+        contents = transport.prefetch(remote) if remote else {}
+        documents = parse_imports(locations, contents, transport)
+        result.update((url, document) for document, url in documents)
+    return result
+
+
+def collect_import_locations(documents, seen):
+    """Return the locations imported by the given (document, url) tuples
+    which are not yet in the `seen` set (which is updated).
+
+    """
+    result = []
+    for document, document_url in documents:
+        for location in find_import_locations(document, document_url):
+            if location not in seen:
+                seen.add(location)
+                result.append(location)
+    return result
+
+
+def remote_locations(locations):
+    return [
+        location for location in locations
+        if urlparse(location).scheme in ('http', 'https')
+    ]
+
+
+def parse_imports(locations, contents, transport):
+    """Parse the imported documents, the content is taken from the
+    `contents` dict when available or loaded via the transport.
+
+    Returns a list of (document, url) tuples.
+
+    """
+    result = []
+    for location in locations:
+        try:
+            if location in contents:
+                content = contents[location]
+            else:
+                content = transport.load(location)
+            document = parse_xml(content, transport, location)
+        except (IOError, XMLSyntaxError):
+            # Errors are raised again during the actual parsing
+            continue
+        result.append((document, location))
+    return result
+
+
+def find_import_locations(node, base_url=None):
+    """Return the absolute locations of the documents imported (or included)
+    by the given document.
+
+    """
+    result = []
+    for child in node.iter(*IMPORT_LOCATIONS):
+        location = child.get(IMPORT_LOCATIONS[child.tag])
+        if not location or location.startswith('intschema'):
+            continue
+        result.append(absolute_location(location, base_url))
+    return result
@@ -0,0 +1,276 @@
+import bisect
+import threading
+from collections import OrderedDict
+from timeit import default_timer
+
+import six
+
+__all__ = ['Plugin', 'TimingPlugin', 'Histogram']
+
+
+class Plugin(object):
+    """Base class for plugins, pass them to the client via
+    ``Client(plugins=[...])``.
+
+    The hooks are called in the order of the plugins for every operation
+    call, each hook returns the (possibly modified or replaced) values which
+    are passed to the next plugin:
+
+    - `egress` with the envelope before it is signed and serialized.
+    - `egress_raw` with the serialized envelope (bytes, or an iterable of
+      chunks of bytes when the request is streamed) before it is sent.
+    - `ingress_raw` with the content of the response before it is parsed.
+    - `ingress` with the parsed response envelope before it is processed.
+
+    When the call is done `timings` is called with a dict with the time
+    spent (in seconds) per phase of the call.
+
+    """
+
+    def egress(self, envelope, http_headers, operation, binding_options):
+        return envelope, http_headers
+
+    def egress_raw(self, message, http_headers, operation):
+        return message, http_headers
+
+    def ingress_raw(self, content, http_headers, operation):
+        return content, http_headers
+
+    def ingress(self, envelope, http_headers, operation):
+        return envelope, http_headers
+
+    def timings(self, operation, timings):
+        pass
+
+
+def apply_egress(client, envelope, http_headers, operation, binding_options):
+    for plugin in client.plugins:
+        envelope, http_headers = plugin.egress(
+            envelope, http_headers, operation, binding_options)
+    return envelope, http_headers
+
+
+def apply_egress_raw(client, message, http_headers, operation):
+    for plugin in client.plugins:
+        message, http_headers = plugin.egress_raw(
+            message, http_headers, operation)
+    return message, http_headers
+
+
+def apply_ingress_raw(client, content, http_headers, operation):
+    for plugin in client.plugins:
+        content, http_headers = plugin.ingress_raw(
+            content, http_headers, operation)
+    return content, http_headers
+
+
+def apply_ingress(client, envelope, http_headers, operation):
+    for plugin in client.plugins:
+        envelope, http_headers = plugin.ingress(
+            envelope, http_headers, operation)
+    return envelope, http_headers
+
+
+def uses_egress(client):
+    """Return True if one of the plugins of the client implements the
+    `egress` hook.
+
+    """
+    default = six.get_unbound_function(Plugin.egress)
+    return any(
+        six.get_unbound_function(type(plugin).egress) is not default
+        for plugin in client.plugins)
+
+
+def create_timer(client):
+    """Return a `PhaseTimer` for an operation call, or a timer which does
+    nothing when the client has no plugins.
+
+    """
+    if client.plugins:
+        return PhaseTimer(client.plugins)
+    return null_timer
+
+
+class PhaseTimer(object):
+    """Measures the time spent in the phases of an operation call.
+
+    `mark()` adds the time since the previous mark to the given phase, the
+    phases are reported to the plugins via `finish()`.
+
+    """
+
+    def __init__(self, plugins):
+        self.plugins = plugins
+        self.phases = OrderedDict()
+        self._last = default_timer()
+
+    def mark(self, phase):
+        now = default_timer()
+        self.phases[phase] = self.phases.get(phase, 0.0) + now - self._last
+        self._last = now
+
+    def restart(self):
+        """Don't record the time since the previous mark"""
+        self._last = default_timer()
+
+    def finish(self, operation):
+        for plugin in self.plugins:
+            plugin.timings(operation, self.phases)
+
+
+class _NullTimer(object):
+
+    def mark(self, phase):
+        pass
+
+    def restart(self):
+        pass
+
+    def finish(self, operation):
+        pass
+
+
+null_timer = _NullTimer()
+
+
+class Histogram(object):
+    """Histogram of observed durations (in seconds).
+
+    `counts` contains the number of observations per bucket (the last item
+    counts the observations larger than the largest bucket), they are not
+    cumulative.
+
+    """
+
+    def __init__(self, buckets):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def __repr__(self):
+        return '<Histogram(count=%d, sum=%f)>' % (self.count, self.sum)
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    @property
+    def mean(self):
+        return self.sum / self.count if self.count else 0.0
+
+    def percentile(self, percentile):
+        """Return the upper bound of the bucket which contains the given
+        percentile (0-100), None if it is larger than the largest bucket.
+
+        """
+        target = self.count * percentile / 100.0
+        total = 0
+        for bucket, count in zip(self.buckets, self.counts):
+            total += count
+            if total >= target:
+                return bucket
+
+    def copy(self):
+        obj = Histogram(self.buckets)
+        obj.counts = list(self.counts)
+        obj.count = self.count
+        obj.sum = self.sum
+        return obj
+
+
+class TimingPlugin(Plugin):
+    """Record the time spent in the phases of the operation calls in a
+    histogram per operation and phase.
+
+    The phases are `serialization`, `wsse` (signing and verifying), `http`,
+    `parsing` and `deserialization`. The time spent in the hooks of the
+    plugins is recorded as `plugins`. Streamed responses (see
+    `zeep.client.ServiceProxy.stream()`) are parsed and deserialized while
+    they are iterated, only the time until the response is received is
+    recorded for them.
+
+    The histograms are available via `get()` and `snapshot()`, or in the
+    Prometheus text format via `prometheus()`.
+
+    :param buckets: The upper bounds of the buckets in seconds
+
+    """
+    default_buckets = (
+        0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+        0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    def __init__(self, buckets=None):
+        self.buckets = tuple(sorted(buckets or self.default_buckets))
+        self._histograms = OrderedDict()
+        self._lock = threading.Lock()
+
+    def timings(self, operation, timings):
+        with self._lock:
+            for phase, value in timings.items():
+                key = (operation.name, phase)
+                histogram = self._histograms.get(key)
+                if histogram is None:
+                    histogram = self._histograms[key] = Histogram(
+                        self.buckets)
+                histogram.observe(value)
+
+    def get(self, operation, phase):
+        """Return a copy of the histogram of the phase of the operation (by
+        name), None when the operation wasn't called.
+
+        """
+        with self._lock:
+            histogram = self._histograms.get((operation, phase))
+            return histogram.copy() if histogram is not None else None
+
+    def snapshot(self, reset=False):
+        """Return a dict with a dict of phase -> histogram per operation"""
+        result = OrderedDict()
+        with self._lock:
+            for (operation, phase), histogram in self._histograms.items():
+                result.setdefault(operation, OrderedDict())[phase] = (
+                    histogram.copy())
+            if reset:
+                self._histograms.clear()
+        return result
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+
+    def prometheus(self, name='zeep_operation_phase_seconds'):
+        """Return the histograms in the Prometheus text exposition format"""
+        lines = [
+            '# HELP %s Time spent in the phases of the operation calls' % (
+                name),
+            '# TYPE %s histogram' % name,
+        ]
+        for operation, phases in self.snapshot().items():
+            for phase, histogram in phases.items():
+                labels = 'operation="%s",phase="%s"' % (
+                    _escape_label(operation), _escape_label(phase))
+
+                total = 0
+                for bucket, count in zip(histogram.buckets, histogram.counts):
+                    total += count
+                    lines.append('%s_bucket{%s,le="%s"} %d' % (
+                        name, labels, _format_float(bucket), total))
+                lines.append('%s_bucket{%s,le="+Inf"} %d' % (
+                    name, labels, histogram.count))
+                lines.append('%s_sum{%s} %s' % (
+                    name, labels, _format_float(histogram.sum)))
+                lines.append('%s_count{%s} %d' % (
+                    name, labels, histogram.count))
+        return '\n'.join(lines) + '\n'
+
+
+def _escape_label(value):
+    return (
+        value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+
+
+def _format_float(value):
+    return repr(float(value))
@@ -0,0 +1,173 @@
+"""Store fully resolved wsdl documents on disk.
+
+Parsing and resolving a large wsdl (with all the imported xsd's) is
+expensive. The SnapshotStore pickles the resolved `zeep.wsdl.Document` so that
+other processes can load it without parsing the documents again.
+
+Snapshots are keyed by the location of the wsdl and a hash of its content, so
+a changed wsdl results in a new snapshot. The content of the imported
+documents (xsd's and wsdl's) is not part of the key: when only an imported
+document changes the old snapshot is still used. Remove the snapshots (or use
+another path for the store) when this happens.
+
+"""
+import errno
+import hashlib
+import logging
+import os
+import tempfile
+import zlib
+
+import appdirs
+import six
+from lxml import etree
+
+from six.moves import cPickle as pickle
+from zeep.utils import get_version
+from zeep.wsdl import Document
+
+logger = logging.getLogger(__name__)
+
+# Modules of the classes which are created dynamically via type() while
+# parsing the xsd's. These can't be pickled by reference.
+DYNAMIC_MODULES = ('zeep.xsd.dynamic_types', 'zeep.objects')
+
+
+class SnapshotStore(object):
+    """Store pickled wsdl documents in a directory on the filesystem.
+
+    Only the content of the main wsdl document is checked when a snapshot is
+    loaded, changes in the imported documents are not detected.
+
+    """
+    _version = '1'
+
+    def __init__(self, path=None):
+        self._path = path if path else _get_default_snapshot_path()
+
+    def load(self, location, transport):
+        """Return the wsdl document for the given location.
+
+        The document is loaded from the snapshot when available, otherwise it
+        is parsed and a new snapshot is written. The wsdl is loaded only once
+        via the transport, the imported documents are only loaded when there
+        is no snapshot.
+
+        """
+        content = transport.load(location)
+        document = self.get(location, content, transport)
+        if document is None:
+            document = Document(location, transport, content=content)
+            self.add(location, content, document)
+        return document
+
+    def add(self, location, content, document):
+        filename = self._get_filename(location, content)
+        logger.debug("Writing snapshot of %s to %s", location, filename)
+
+        data = dumps(document, document.transport)
+        fd, tmp_filename = tempfile.mkstemp(dir=self._path)
+        with os.fdopen(fd, 'wb') as fh:
+            fh.write(self._version_string)
+            fh.write(zlib.compress(data))
+
+        # Make the new snapshot available atomically for other processes
+        os.rename(tmp_filename, filename)
+
+    def get(self, location, content, transport):
+        filename = self._get_filename(location, content)
+        try:
+            with open(filename, 'rb') as fh:
+                data = fh.read()
+        except IOError:
+            logger.debug("Snapshot MISS for %s", location)
+            return None
+
+        if not data.startswith(self._version_string):
+            logger.debug("Snapshot for %s has an old version", location)
+            return None
+
+        logger.debug("Snapshot HIT for %s", location)
+        data = zlib.decompress(data[len(self._version_string):])
+        return loads(data, transport)
+
+    def _get_filename(self, location, content):
+        url_hash = hashlib.sha1(location.encode('utf-8')).hexdigest()
+        content_hash = hashlib.sha1(content).hexdigest()
+        return os.path.join(
+            self._path, '%s-%s.snapshot' % (url_hash, content_hash))
+
+    @property
+    def _version_string(self):
+        prefix = u'$ZEEP:%s:%s$' % (get_version(), self._version)
+        return bytes(prefix.encode('ascii'))
+
+
+def dumps(document, transport):
+    """Pickle the given wsdl document.
+
+    The transport is not part of the pickle, it is passed again when the
+    snapshot is loaded via `loads()`.
+
+    """
+    def persistent_id(obj):
+        if obj is transport:
+            return ('transport',)
+        if isinstance(obj, etree.QName):
+            return ('qname', obj.text)
+        if isinstance(obj, etree._Element):
+            return ('element', id(obj), etree.tostring(obj))
+        if isinstance(obj, type) and obj.__module__ in DYNAMIC_MODULES:
+            # The slot descriptors are recreated from __slots__
+            excluded = set(obj.__dict__.get('__slots__', ()))
+            excluded.update(('__dict__', '__weakref__'))
+            attributes = {
+                key: value for key, value in obj.__dict__.items()
+                if key not in excluded
+            }
+            return ('class', id(obj), obj.__name__, obj.__bases__, attributes)
+
+    fh = six.BytesIO()
+    pickler = pickle.Pickler(fh, pickle.HIGHEST_PROTOCOL)
+    pickler.persistent_id = persistent_id
+    pickler.dump(document)
+    return fh.getvalue()
+
+
+def loads(data, transport):
+    """Load a wsdl document pickled with `dumps()`"""
+    objects = {}
+
+    def persistent_load(pid):
+        kind = pid[0]
+        if kind == 'transport':
+            return transport
+        if kind == 'qname':
+            return etree.QName(pid[1])
+
+        # Make sure objects which were shared before are still shared
+        if pid[1] not in objects:
+            if kind == 'element':
+                objects[pid[1]] = etree.fromstring(pid[2])
+            elif kind == 'class':
+                objects[pid[1]] = type(str(pid[2]), pid[3], pid[4])
+            else:
+                raise pickle.UnpicklingError(
+                    "Unsupported persistent id %r" % kind)
+        return objects[pid[1]]
+
+    unpickler = pickle.Unpickler(six.BytesIO(data))
+    unpickler.persistent_load = persistent_load
+    return unpickler.load()
+
+
+def _get_default_snapshot_path():
+    path = os.path.join(appdirs.user_cache_dir('zeep', False), 'snapshots')
+    try:
+        os.makedirs(path)
+    except OSError as exc:
+        if exc.errno == errno.EEXIST and os.path.isdir(path):
+            pass
+        else:
+            raise
+    return path
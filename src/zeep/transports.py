@@ -1,21 +1,46 @@
+import itertools
 import logging
+import threading
+import zlib
+from multiprocessing.pool import ThreadPool
 
 import requests
+import six
 
 from six.moves.urllib.parse import urlparse
-from zeep.cache import SqliteCache
+from zeep.cache import (
+    SqliteCache, get_conditional_headers, get_validators)
+from zeep.loggers import PayloadLogger
 from zeep.utils import NotSet, get_version
-from zeep.wsdl.utils import etree_to_string
+from zeep.wsdl.utils import SerializationPolicy
 
 
 class Transport(object):
 
-    def __init__(self, cache=NotSet, timeout=300, verify=True, http_auth=None):
+    def __init__(self, cache=NotSet, timeout=300, verify=True, http_auth=None,
+                 prefetch_concurrency=None, catalog=None, serialization=None,
+                 compression=None, compression_level=6,
+                 compression_min_size=1024, payload_logger=None):
+        if compression not in (None, 'gzip', 'deflate'):
+            raise ValueError(
+                "Invalid compression %r, use 'gzip' or 'deflate'" % compression)
+
         self.cache = SqliteCache() if cache is NotSet else cache
+        self.serialization = serialization or SerializationPolicy()
+        self.compression = compression
+        self.compression_level = compression_level
+        self.compression_min_size = compression_min_size
+        self.catalog = catalog
         self.timeout = timeout
         self.verify = verify
         self.http_auth = http_auth
+        self.prefetch_concurrency = prefetch_concurrency
         self.logger = logging.getLogger(__name__)
+        self.payload_logger = payload_logger or PayloadLogger(self.logger)
+
+        # Concurrent fetches of the same url are done only once
+        self._fetches = _SingleFlight()
+
         self.session = self.create_session()
         self.session.verify = verify
         self.session.auth = http_auth
@@ -29,21 +54,28 @@ class Transport(object):
         if not url:
             raise ValueError("No url given to load")
 
+        # Local copies of the document take precedence
+        if self.catalog is not None:
+            content = self.catalog.load(url)
+            if content is not None:
+                return content
+
         scheme = urlparse(url).scheme
         if scheme in ('http', 'https'):
 
-            if self.cache:
+            if self.cache is not None:
                 response = self.cache.get(url)
                 if response:
                     return bytes(response)
 
-            response = self.session.get(url, timeout=self.timeout)
-            response.raise_for_status()
-
-            if self.cache:
-                self.cache.add(url, response.content)
+                # Serve the expired document while it is being refreshed
+                if getattr(self.cache, 'max_stale', None) is not None:
+                    response = self.cache.get(url, stale=True)
+                    if response:
+                        self._refresh_in_background(url)
+                        return bytes(response)
 
-            return response.content
+            return self._fetches.do(url, self._fetch, url)
 
         elif scheme == 'file':
             if url.startswith('file://'):
@@ -52,25 +84,213 @@ class Transport(object):
         with open(url, 'rb') as fh:
             return fh.read()
 
-    def post(self, address, message, headers):
-        self.logger.debug("HTTP Post to %s:\n%s", address, message)
-        response = self.session.post(address, data=message, headers=headers)
+    def _fetch(self, url):
+        """Fetch the document and add it to the cache.
+
+        When the cache has an expired copy of the document with validators
+        (ETag / Last-Modified) then a conditional request is done, the cached
+        copy is used when the document is not modified.
+
+        """
+        stale = None
+        get_stale = getattr(self.cache, 'get_stale', None)
+        if get_stale is not None:
+            stale = get_stale(url)
+
+        headers = get_conditional_headers(stale[1]) if stale else None
+        response = self.session.get(
+            url, timeout=self.timeout, headers=headers)
+
+        if stale and response.status_code == 304:
+            self.logger.debug("Document %s is not modified", url)
+            validators = dict(stale[1])
+            validators.update(get_validators(response.headers))
+            self.cache.touch(url, validators)
+            return stale[0]
+
+        response.raise_for_status()
+        if self.cache is not None:
+            self._add_to_cache(url, response.content, response.headers)
+        return response.content
+
+    def _refresh_in_background(self, url):
+        if self._fetches.is_running(url):
+            return
+        thread = threading.Thread(target=self._refresh, args=(url,))
+        thread.daemon = True
+        thread.start()
+
+    def _refresh(self, url):
+        try:
+            self._fetches.do(url, self._fetch, url)
+        except Exception:
+            self.logger.warning("Refreshing %s failed", url, exc_info=True)
+
+    def _add_to_cache(self, url, content, headers):
+        validators = get_validators(headers)
+        if validators:
+            self.cache.add(url, content, validators)
+        else:
+            # Caches which don't support validators only take 2 arguments
+            self.cache.add(url, content)
+
+    def prefetch(self, urls):
+        """Load the given urls concurrently and return a dict with the content
+        of each url.
+
+        The documents are also added to the cache. Urls which fail to load
+        are left out, the error is raised again when the url is loaded.
+
+        """
+        if not self.prefetch_concurrency:
+            return {}
+
+        num_workers = min(self.prefetch_concurrency, len(urls))
         self.logger.debug(
-            "HTTP Response from %s (status: %d):\n%s",
-            address, response.status_code, response.content)
+            "Prefetching %d documents with %d workers", len(urls), num_workers)
+
+        pool = ThreadPool(num_workers)
+        try:
+            contents = pool.map(self._prefetch_url, urls)
+        finally:
+            pool.close()
+            pool.join()
+
+        result = {}
+        for url, content in zip(urls, contents):
+            if content is None:
+                continue
+            result[url] = content
+        return result
+
+    def _prefetch_url(self, url):
+        try:
+            return self.load(url)
+        except (IOError, requests.RequestException):
+            self.logger.debug("Prefetching %s failed", url)
+
+    def post(self, address, message, headers, stream=False):
+        message = self.payload_logger.log_request(
+            address, message, encoding=self.serialization.encoding)
+        if self.compression:
+            message, headers = self.compress(message, headers)
+
+        response = self.session.post(
+            address, data=message, headers=headers, stream=stream)
+        self.payload_logger.log_response(address, response, stream)
         return response
 
-    def post_xml(self, address, envelope, headers):
+    def post_xml(self, address, envelope, headers, stream=False):
         """Post the envelope xml element to the given address with the headers.
 
-        This method is intended to be overriden if you want to customize the
-        serialization of the xml element. By default the body is formatted
-        and encoded as utf-8. See ``zeep.wsdl.utils.etree_to_string``.
+        The envelope is serialized according to the `serialization` policy
+        of the transport, see ``zeep.wsdl.utils.SerializationPolicy``. By
+        default this is compact xml encoded as utf-8.
+
+        When `stream` is True the content of the response is not read, it
+        is available via ``response.raw``.
 
         """
-        message = etree_to_string(envelope)
-        return self.post(address, message, headers)
+        message = self.serialization.serialize(envelope)
+        return self.post(address, message, headers, stream=stream)
 
     def get(self, address, params, headers):
         response = self.session.get(address, params=params, headers=headers)
         return response
+
+    def compress(self, message, headers):
+        """Compress the message (bytes or an iterable of chunks of bytes) with
+        the `compression` of the transport.
+
+        Messages smaller than `compression_min_size` are not compressed. For
+        iterables the chunks are read until this size is reached, when the
+        message is compressed the chunks are compressed one by one.
+
+        Returns a tuple with the message and the headers (with the
+        Content-Encoding header if the message is compressed).
+
+        """
+        if isinstance(message, six.text_type):
+            message = message.encode('utf-8')
+
+        if isinstance(message, six.binary_type):
+            if len(message) < self.compression_min_size:
+                return message, headers
+            compressor = self._create_compressor()
+            message = compressor.compress(message) + compressor.flush()
+        else:
+            chunks = iter(message)
+            head = []
+            size = 0
+            for chunk in chunks:
+                head.append(chunk)
+                size += len(chunk)
+                if size >= self.compression_min_size:
+                    break
+            else:
+                return b''.join(head), headers
+            message = self._compress_chunks(itertools.chain(head, chunks))
+
+        headers = dict(headers)
+        headers['Content-Encoding'] = self.compression
+        return message, headers
+
+    def _compress_chunks(self, chunks):
+        compressor = self._create_compressor()
+        for chunk in chunks:
+            data = compressor.compress(chunk)
+            if data:
+                yield data
+        yield compressor.flush()
+
+    def _create_compressor(self):
+        # gzip uses the gzip container, deflate the zlib container (RFC 7230)
+        wbits = zlib.MAX_WBITS
+        if self.compression == 'gzip':
+            wbits += 16
+        return zlib.compressobj(self.compression_level, zlib.DEFLATED, wbits)
+
+
+class _SingleFlight(object):
+    """Run a function only once for concurrent calls with the same key, the
+    other callers wait for (and share) the result.
+
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def is_running(self, key):
+        return key in self._calls
+
+    def do(self, key, func, *args):
+        with self._lock:
+            call = self._calls.get(key)
+            is_owner = call is None
+            if is_owner:
+                call = self._calls[key] = _Call()
+
+        if not is_owner:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func(*args)
+        except Exception as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+        return call.result
+
+
+class _Call(object):
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
@@ -10,25 +10,36 @@ class _NotSetClass(object):
 NotSet = _NotSetClass()
 
 
-def qname_attr(node, attr_name, target_namespace=None):
+def qname_attr(node, attr_name, target_namespace=None, qnames=None):
     value = node.get(attr_name)
     if value is not None:
-        return as_qname(value, node.nsmap, target_namespace)
+        # Getting the nsmap of a node is relatively expensive, so skip it
+        # when it isn't needed.
+        if target_namespace and ':' not in value:
+            create = qnames.get if qnames is not None else etree.QName
+            return create(target_namespace, value)
+        return as_qname(value, node.nsmap, target_namespace, qnames)
 
 
-def as_qname(value, nsmap, target_namespace):
-    """Convert the given value to a QName"""
+def as_qname(value, nsmap, target_namespace, qnames=None):
+    """Convert the given value to a QName.
+
+    The QName is taken from the given `zeep.xsd.context.QNameTable` if
+    available.
+
+    """
+    create = qnames.get if qnames is not None else etree.QName
     if ':' in value:
         prefix, local = value.split(':')
         namespace = nsmap.get(prefix, prefix)
-        return etree.QName(namespace, local)
+        return create(namespace, local)
 
     if target_namespace:
-        return etree.QName(target_namespace, value)
+        return create(target_namespace, value)
 
     if None in nsmap:
-        return etree.QName(nsmap[None], value)
-    return etree.QName(value)
+        return create(nsmap[None], value)
+    return create(value)
 
 
 def findall_multiple_ns(node, name, namespace_sets):
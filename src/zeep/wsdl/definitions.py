@@ -1,9 +1,13 @@
+import logging
 from collections import OrderedDict, namedtuple
 
 from lxml import etree
 from six import python_2_unicode_compatible
 
 from zeep.utils import qname_attr
+from zeep.xsd.context import resolve_lock
+
+logger = logging.getLogger(__name__)
 
 NSMAP = {
     'wsdl': 'http://schemas.xmlsoap.org/wsdl/',
@@ -26,13 +30,45 @@ class AbstractMessage(object):
     """
     def __init__(self, name):
         self.name = name
-        self.parts = OrderedDict()
+        self._parts = OrderedDict()
+
+        # The (name, element qname, type qname) of the parts which are not
+        # yet looked up in the schema, see resolve().
+        self._unresolved_parts = []
+        self._definitions = None
 
     def __repr__(self):
         return '<%s(name=%r)>' % (self.__class__.__name__, self.name.text)
 
+    @property
+    def parts(self):
+        if self._unresolved_parts:
+            self.resolve(self._definitions)
+        return self._parts
+
+    @parts.setter
+    def parts(self, value):
+        self._parts = value
+        self._unresolved_parts = []
+
     def resolve(self, definitions):
-        pass
+        """Lookup the elements and types of the parts in the schema.
+
+        This is done when the definitions are resolved or, in lazy mode, when
+        the parts are first used.
+
+        """
+        if not self._unresolved_parts:
+            return
+
+        with resolve_lock:
+            for part_name, part_element, part_type in self._unresolved_parts:
+                if part_element is not None:
+                    part_element = definitions.types.get_element(part_element)
+                if part_type is not None:
+                    part_type = definitions.types.get_type(part_type)
+                self._parts[part_name] = MessagePart(part_element, part_type)
+            self._unresolved_parts = []
 
     def add_part(self, name, element):
         self.parts[name] = element
@@ -51,18 +87,13 @@ class AbstractMessage(object):
         """
         tns = definitions.target_namespace
         msg = cls(name=qname_attr(xmlelement, 'name', tns))
+        msg._definitions = definitions
 
         for part in xmlelement.findall('wsdl:part', namespaces=NSMAP):
             part_name = part.get('name')
             part_element = qname_attr(part, 'element', tns)
             part_type = qname_attr(part, 'type', tns)
-
-            if part_element is not None:
-                part_element = definitions.types.get_element(part_element)
-            if part_type is not None:
-                part_type = definitions.types.get_type(part_type)
-
-            msg.add_part(part_name, MessagePart(part_element, part_type))
+            msg._unresolved_parts.append((part_name, part_element, part_type))
         return msg
 
 
@@ -181,11 +212,34 @@ class Binding(object):
         self.wsdl = wsdl
         self._operations = {}
 
+        # Names of the operations which are resolved on first use (lazy mode)
+        self._unresolved_operations = set()
+        self._definitions = None
+
     def resolve(self, definitions):
         self.port_type = definitions.get('port_types', self.port_name.text)
+
+        if self.wsdl._parser_context.lazy:
+            self._definitions = definitions
+            self._unresolved_operations = set(self._operations)
+            return
+
         for operation in self._operations.values():
             operation.resolve(definitions)
 
+    def prewarm(self, names=None):
+        """Resolve the given operations (all operations when no names are
+        given) so that the first call of these doesn't pay the cost.
+
+        This is only useful for wsdl documents loaded in lazy mode.
+
+        """
+        if names is None:
+            names = list(self._operations)
+        for name in names:
+            if not self.get(name):
+                raise ValueError("Operation %r not found" % name)
+
     def _operation_add(self, operation):
         # XXX: operation name is not unique
         self._operations[operation.name] = operation
@@ -198,7 +252,22 @@ class Binding(object):
             self.__class__.__name__, self.name.text, self.port_type)
 
     def get(self, name):
-        return self._operations.get(name)
+        """Return the operation with the given name, the operation is
+        resolved first if this didn't happen yet.
+
+        """
+        operation = self._operations.get(name)
+        if operation is not None and name in self._unresolved_operations:
+            with resolve_lock:
+                if name in self._unresolved_operations:
+                    logger.debug("Resolving operation %s", name)
+                    operation.resolve(self._definitions)
+                    self._unresolved_operations.discard(name)
+        return operation
+
+    def all(self):
+        """Return a dict with all (resolved) operations of this binding"""
+        return {name: self.get(name) for name in self._operations}
 
     @classmethod
     def match(cls, node):
@@ -8,6 +8,7 @@ from lxml.builder import ElementMaker
 from zeep import exceptions, xsd
 from zeep.helpers import serialize_object
 from zeep.utils import as_qname
+from zeep.wsdl.templates import EnvelopeTemplate
 from zeep.wsdl.utils import etree_to_string
 
 SerializedMessage = namedtuple('SerializedMessage', ['path', 'headers', 'content'])
@@ -65,9 +66,7 @@ class SoapMessage(ConcreteMessage):
         self.type = type
 
     def serialize(self, *args, **kwargs):
-        nsmap = self.nsmap.copy()
-        nsmap.update(self.wsdl.types._prefix_map)
-
+        nsmap = self.get_nsmap()
         soap = ElementMaker(namespace=self.nsmap['soap-env'], nsmap=nsmap)
         body = header = None
 
@@ -75,23 +74,7 @@ class SoapMessage(ConcreteMessage):
         headers_value = kwargs.pop('_soapheaders', None)
         if headers_value:
             header = soap.Header()
-            if isinstance(headers_value, list):
-                for header_value in headers_value:
-                    if hasattr(header_value, '_xsd_elm'):
-                        header_value._xsd_elm.render(header, header_value)
-                    elif isinstance(header_value, etree._Element):
-                        header.append(header_value)
-                    else:
-                        raise ValueError("Invalid value given to _soapheaders")
-            elif isinstance(headers_value, dict):
-                if not self.headers:
-                    raise ValueError(
-                        "_soapheaders only accepts a dictionary if the wsdl "
-                        "defines the headers.")
-                headers_value = self.headers(**headers_value)
-                self.headers.render(header, headers_value)
-            else:
-                raise ValueError("Invalid value given to _soapheaders")
+            self.render_headers(header, headers_value)
 
         # Create the soap:body element
         if self.body:
@@ -114,6 +97,123 @@ class SoapMessage(ConcreteMessage):
         return SerializedMessage(
             path=None, headers=headers, content=envelope)
 
+    def get_nsmap(self):
+        """Return the namespaces declared on the soap:Envelope"""
+        nsmap = self.nsmap.copy()
+        nsmap.update(self.wsdl.types._prefix_map)
+        return nsmap
+
+    def render_headers(self, header, headers_value):
+        """Render the value of `_soapheaders` in the soap:Header element"""
+        if isinstance(headers_value, list):
+            for header_value in headers_value:
+                if hasattr(header_value, '_xsd_elm'):
+                    header_value._xsd_elm.render(header, header_value)
+                elif isinstance(header_value, etree._Element):
+                    header.append(header_value)
+                else:
+                    raise ValueError("Invalid value given to _soapheaders")
+        elif isinstance(headers_value, dict):
+            if not self.headers:
+                raise ValueError(
+                    "_soapheaders only accepts a dictionary if the wsdl "
+                    "defines the headers.")
+            headers_value = self.headers(**headers_value)
+            self.headers.render(header, headers_value)
+        else:
+            raise ValueError("Invalid value given to _soapheaders")
+
+    def prepare(self, soapheaders=None, policy=None):
+        """Return an `zeep.wsdl.templates.EnvelopeTemplate` for this message.
+
+        The template renders the same envelope as `serialize()`, with the
+        given soap headers, directly to bytes (serialized according to the
+        `zeep.wsdl.utils.SerializationPolicy`).
+
+        """
+        return EnvelopeTemplate(self, soapheaders, policy)
+
+    def record_path(self):
+        """Return the path to the repeated element in the body and the xsd
+        element of it, used to deserialize the records of the body one by one.
+
+        The path starts at the soap:Body element and descends into the body
+        element (and wrapper elements with only one child element) until an
+        element with maxOccurs > 1 is found.
+
+        """
+        if not self.body:
+            raise ValueError("The message has no body")
+
+        element = self.body
+        path = [element.qname.text]
+        while isinstance(element.type, xsd.ComplexType):
+            children = [
+                child for name, child in element.type.elements
+                if isinstance(child, xsd.Element)
+            ]
+            for child in children:
+                if child.max_occurs != 1:
+                    path.append(child.qname.text)
+                    return path, child
+
+            if len(children) != 1:
+                break
+            element = children[0]
+            path.append(element.qname.text)
+
+        raise ValueError(
+            "No repeated element found in the body of the message")
+
+    def iter_deserialize(self, body, path, element):
+        """Deserialize the elements at the given path of the (parsed)
+        soap:Body one by one.
+
+        """
+        for node in body.iterfind('/'.join(path)):
+            yield element.parse(node, self.wsdl.types)
+
+    def iterparse(self, source, path, element, on_fault):
+        """Incrementally parse the SOAP envelope from the file-like `source`
+        and yield the deserialized elements at the given path.
+
+        Every element is removed from the tree after it is deserialized so
+        the memory usage is bounded by the size of one record. When a
+        soap:Fault is found the parsed envelope is passed to `on_fault`.
+
+        """
+        body_tag = '{%s}Body' % self.nsmap['soap-env']
+        fault_tag = '{%s}Fault' % self.nsmap['soap-env']
+        full_path = [
+            '{%s}Envelope' % self.nsmap['soap-env'], body_tag] + path
+
+        stack = []
+        events = etree.iterparse(
+            source, events=('start', 'end'), remove_comments=True,
+            resolve_entities=False, no_network=True)
+        for event, node in events:
+            if event == 'start':
+                if not stack and node.tag != full_path[0]:
+                    raise exceptions.XMLSyntaxError((
+                        "The XML returned by the server does not contain a "
+                        "valid %s root element. The root element found is %s"
+                    ) % (full_path[0], node.tag))
+                stack.append(node.tag)
+                continue
+
+            if stack == full_path:
+                yield element.parse(node, self.wsdl.types)
+
+                # Remove the processed element (and the text in between)
+                node.clear()
+                while node.getprevious() is not None:
+                    del node.getparent()[0]
+
+            elif node.tag == fault_tag and stack[:-1] == full_path[:2]:
+                on_fault(node.getroottree().getroot())
+                return
+            stack.pop()
+
     def resolve(self, definitions, abstract_message):
         self.abstract = abstract_message
 
@@ -2,11 +2,16 @@ import six
 from defusedxml.lxml import fromstring
 from lxml import etree
 
+from zeep import plugins
 from zeep.exceptions import Fault, TransportError, XMLSyntaxError
+from zeep.plugins import null_timer
 from zeep.utils import qname_attr
 from zeep.wsdl.definitions import Binding, Operation
 from zeep.wsdl.messages import DocumentMessage, RpcMessage
-from zeep.wsdl.utils import etree_to_string
+from zeep.wsdl.utils import (
+    etree_to_chunks, etree_to_string, get_serialization_policy,
+    uses_post_xml)
+from zeep.xsd.context import defer_generators
 
 
 class SoapBinding(Binding):
@@ -69,6 +74,36 @@ class SoapBinding(Binding):
         :type args: tuple
         :param kwargs: The **kwargs to pass to the operation
         :type kwargs: dict
+        """
+        timer = plugins.create_timer(client)
+
+        # Generator values are rendered while the request is sent, this is
+        # not possible when the envelope needs to be signed or canonicalized
+        # or when it is passed as tree to the egress hooks of the plugins or
+        # to the transport.
+        policy = get_serialization_policy(client.transport)
+        if (client.wsse or policy.c14n or plugins.uses_egress(client) or
+                uses_post_xml(client.transport)):
+            operation_obj, envelope, headers = self._create(
+                client, operation, args, kwargs, options, timer)
+            deferred = None
+        else:
+            with defer_generators() as deferred:
+                operation_obj, envelope, headers = self._create(
+                    client, operation, args, kwargs, options, timer)
+
+        response = self._post(
+            client, options, operation_obj, envelope, headers, deferred,
+            timer=timer)
+        return self.process_reply(client, operation_obj, response, timer)
+
+    def _create(self, client, operation, args, kwargs, options=None,
+                timer=null_timer):
+        """Create the SOAP envelope and the http headers for the operation.
+
+        Returns a tuple with the operation object, the envelope (with the
+        plugins and the wsse applied) and the http headers.
+
         """
         operation_obj = self.get(operation)
         if not operation_obj:
@@ -76,22 +111,122 @@ class SoapBinding(Binding):
 
         # Create the SOAP envelope
         serialized = operation_obj.create(*args, **kwargs)
-        serialized.headers['Content-Type'] = self.content_type
+        policy = get_serialization_policy(client.transport)
+        serialized.headers['Content-Type'] = policy.content_type(
+            self.content_type)
 
         envelope = serialized.content
         headers = serialized.headers
+        timer.mark('serialization')
 
         # Apply plugins
+        envelope, headers = plugins.apply_egress(
+            client, envelope, headers, operation_obj, options)
+        timer.mark('plugins')
 
         # Apply WSSE
         if client.wsse:
-            envelope, http_headers = client.wsse.sign(envelope, headers)
+            envelope, headers = client.wsse.sign(envelope, headers)
+            timer.mark('wsse')
+
+        return operation_obj, envelope, headers
+
+    def _serialize(self, client, operation, envelope, headers, deferred=None,
+                   timer=null_timer):
+        """Serialize the envelope according to the serialization policy of
+        the transport and apply the egress_raw hooks of the plugins.
+
+        Returns a tuple with the message (bytes, or a generator of chunks of
+        bytes when the envelope contains deferred values) and the headers.
+
+        """
+        policy = get_serialization_policy(client.transport)
+        if deferred:
+            message = etree_to_chunks(
+                envelope, deferred, encoding=policy.encoding,
+                xml_declaration=policy.xml_declaration)
+        else:
+            message = policy.serialize(envelope)
+        timer.mark('serialization')
+
+        message, headers = plugins.apply_egress_raw(
+            client, message, headers, operation)
+        timer.mark('plugins')
+        return message, headers
+
+    def _post(self, client, options, operation, envelope, headers,
+              deferred=None, stream=False, timer=null_timer):
+        if not deferred and uses_post_xml(client.transport):
+            if stream:
+                response = client.transport.post_xml(
+                    options['address'], envelope, headers, stream=True)
+            else:
+                response = client.transport.post_xml(
+                    options['address'], envelope, headers)
+            timer.mark('http')
+            return response
+
+        message, headers = self._serialize(
+            client, operation, envelope, headers, deferred, timer)
+        if stream:
+            response = client.transport.post(
+                options['address'], message, headers, stream=True)
+        else:
+            response = client.transport.post(
+                options['address'], message, headers)
+        timer.mark('http')
+        return response
+
+    def prepare(self, client, options, operation, soapheaders=None):
+        """Return a `PreparedOperation` for the operation, see
+        `zeep.client.ServiceProxy.prepare()`.
+
+        """
+        operation_obj = self.get(operation)
+        if not operation_obj:
+            raise ValueError("Operation %r not found" % operation)
+        return PreparedOperation(
+            client, self, options, operation_obj, soapheaders)
 
-        response = client.transport.post_xml(options['address'], envelope, headers)
+    def stream(self, client, options, operation, args, kwargs):
+        """Call the operation and return a generator which yields the
+        repeated elements in the body of the response one by one.
 
-        return self.process_reply(client, operation_obj, response)
+        The response is parsed incrementally, see
+        `zeep.wsdl.messages.SoapMessage.iterparse()`.
 
-    def process_reply(self, client, operation, response):
+        """
+        timer = plugins.create_timer(client)
+        operation_obj, envelope, headers = self._create(
+            client, operation, args, kwargs, options, timer)
+        path, element = operation_obj.output.record_path()
+
+        response = self._post(
+            client, options, operation_obj, envelope, headers, stream=True,
+            timer=timer)
+        timer.finish(operation_obj)
+        return self._iter_records(
+            client, operation_obj, response, path, element)
+
+    def _iter_records(self, client, operation, response, path, element):
+        message = operation.output
+        try:
+            # Faults and signed messages can only be processed as a whole
+            if response.status_code != 200 or client.wsse:
+                doc = self._load_reply(client, response, operation)
+                body = doc.find('soap-env:Body', namespaces=self.nsmap)
+                for item in message.iter_deserialize(body, path, element):
+                    yield item
+            else:
+                response.raw.decode_content = True
+                items = message.iterparse(
+                    response.raw, path, element, self.process_error)
+                for item in items:
+                    yield item
+        finally:
+            response.close()
+
+    def process_reply(self, client, operation, response, timer=null_timer):
         """Process the XML reply from the server.
 
         :param client: The client with which the operation was called
@@ -100,27 +235,51 @@ class SoapBinding(Binding):
         :type operation: zeep.wsdl.definitions.Operation
         :param response: The response object returned by the remote server
         :type response: requests.Response
+        :param timer: The timer of the call, see `zeep.plugins.PhaseTimer`
+
+        """
+        try:
+            doc = self._load_reply(client, response, operation, timer)
+            result = operation.process_reply(doc)
+            timer.mark('deserialization')
+            return result
+        finally:
+            timer.finish(operation)
+
+    def _load_reply(self, client, response, operation, timer=null_timer):
+        """Parse the XML reply, verify the wsse signature and apply the
+        ingress hooks of the plugins. A Fault is raised when the server
+        returned an error.
 
         """
-        if response.status_code != 200 and not response.content:
+        content, http_headers = plugins.apply_ingress_raw(
+            client, response.content, response.headers, operation)
+        timer.mark('plugins')
+
+        if response.status_code != 200 and not content:
             raise TransportError(
                 u'Server returned HTTP status %d (no content available)'
                 % response.status_code)
 
         try:
-            doc = fromstring(response.content)
+            doc = fromstring(content)
         except etree.XMLSyntaxError:
             raise TransportError(
                 u'Server returned HTTP status %d (%s)'
-                % (response.status_code, response.content))
+                % (response.status_code, content))
+        timer.mark('parsing')
 
         if client.wsse:
             client.wsse.verify(doc)
+            timer.mark('wsse')
 
-        if response.status_code != 200:
-            return self.process_error(doc)
+        doc, http_headers = plugins.apply_ingress(
+            client, doc, http_headers, operation)
+        timer.mark('plugins')
 
-        return operation.process_reply(doc)
+        if response.status_code != 200:
+            self.process_error(doc)
+        return doc
 
     def process_error(self, doc):
         raise NotImplementedError
@@ -329,3 +488,73 @@ class SoapOperation(Operation):
             self.output.resolve(definitions, self.abstract.output)
         if self.input:
             self.input.resolve(definitions, self.abstract.input)
+
+
+class PreparedOperation(object):
+    """Operation with a precompiled envelope, see
+    `zeep.wsdl.templates.EnvelopeTemplate`.
+
+    The soap headers are fixed when the operation is prepared. The envelopes
+    are the same as the envelopes of the normal calls of the operation, they
+    are serialized according to the serialization policy of the transport.
+
+    """
+
+    def __init__(self, client, binding, options, operation, soapheaders=None):
+        self.client = client
+        self.binding = binding
+        self.options = options
+        self.operation = operation
+        self.soapheaders = soapheaders
+
+        # Canonical xml can only be created from the tree
+        self.policy = get_serialization_policy(client.transport)
+        self.template = None
+        if not self.policy.c14n:
+            self.template = operation.input.prepare(soapheaders, self.policy)
+
+        self.headers = {
+            'SOAPAction': '"%s"' % operation.soapaction,
+            'Content-Type': self.policy.content_type(binding.content_type),
+        }
+
+    def __repr__(self):
+        return '<%s(name=%r)>' % (self.__class__.__name__, self.operation.name)
+
+    def create(self, *args, **kwargs):
+        """Return the (serialized) envelope for the arguments as bytes"""
+        if '_soapheaders' in kwargs:
+            raise ValueError(
+                "The soap headers of a prepared operation can only be " +
+                "passed to prepare()")
+        if self.template is None:
+            if self.soapheaders:
+                kwargs['_soapheaders'] = self.soapheaders
+            serialized = self.operation.create(*args, **kwargs)
+            return self.policy.serialize(serialized.content)
+        return self.template(*args, **kwargs)
+
+    def __call__(self, *args, **kwargs):
+        client = self.client
+
+        # The envelope needs to be available as tree to sign it or to pass it
+        # to the egress hooks of the plugins or to post_xml() of the transport
+        if (client.wsse or plugins.uses_egress(client) or
+                uses_post_xml(client.transport)):
+            if self.soapheaders:
+                kwargs['_soapheaders'] = self.soapheaders
+            return self.binding.send(
+                client, self.options, self.operation.name, args, kwargs)
+
+        timer = plugins.create_timer(client)
+        message = self.create(*args, **kwargs)
+        timer.mark('serialization')
+        message, headers = plugins.apply_egress_raw(
+            client, message, dict(self.headers), self.operation)
+        timer.mark('plugins')
+
+        response = client.transport.post(
+            self.options['address'], message, headers)
+        timer.mark('http')
+        return self.binding.process_reply(
+            client, self.operation, response, timer)
@@ -0,0 +1,447 @@
+"""Envelope templates for prepared operations.
+
+The envelope of a SOAP message is normally created as lxml tree, this
+includes a lot of work which is the same for every call of an operation: the
+soap:Envelope, soap:Header and soap:Body elements, the namespace declarations
+and the structure of the body element. An `EnvelopeTemplate` does all this
+once. The elements of the body are compiled into nodes which write the xml
+directly, so only the leaf values are converted per call.
+
+Elements which can't be compiled (choices, any elements, attributes, ...)
+are rendered via lxml and then inserted in the output, so the result is
+always the same as serializing the envelope created by
+`zeep.wsdl.messages.SoapMessage.serialize()` with the same
+`zeep.wsdl.utils.SerializationPolicy`.
+
+"""
+import inspect
+import re
+
+import six
+from lxml import etree
+
+from zeep.wsdl.utils import default_serialization
+from zeep.xsd.elements import Element
+from zeep.xsd.indicators import All, Sequence
+from zeep.xsd.types import ComplexType, SimpleType
+from zeep.xsd.valueobjects import CompoundValue
+
+__all__ = ['EnvelopeTemplate']
+
+_FRAGMENT_NS = 'urn:zeep:fragment'
+_FRAGMENT_TAG = '{%s}wrapper' % _FRAGMENT_NS
+_FRAGMENT_START = '<zeep-fragment:wrapper'
+_FRAGMENT_END = '</zeep-fragment:wrapper>'
+
+_special_re = re.compile(u'[&<>\r\x00-\x08\x0b\x0c\x0e-\x1f]')
+_invalid_re = re.compile(u'[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+
+class EnvelopeTemplate(object):
+    """Render the envelope of the message for the given arguments.
+
+    :param message: The message to render
+    :type message: zeep.wsdl.messages.SoapMessage
+    :param soapheaders: The (fixed) value for the soap:Header element, see
+                        the `_soapheaders` argument of the operations.
+    :param policy: The serialization policy, canonical xml is not supported
+    :type policy: zeep.wsdl.utils.SerializationPolicy
+
+    """
+
+    def __init__(self, message, soapheaders=None, policy=None):
+        policy = policy or default_serialization
+        if policy.c14n:
+            raise ValueError("Canonical xml can't be created via a template")
+
+        self.message = message
+        self.policy = policy
+        if policy.pretty_print:
+            self.newline, self.indent = u'\n', u'  '
+        else:
+            self.newline, self.indent = u'', u''
+        self._nsmap = message.get_nsmap()
+        self._prefixes = _get_prefixes(self._nsmap)
+        self._env_prefix = self._prefixes.get(
+            message.nsmap['soap-env'], 'soap-env')
+        self._declarations = {}
+
+        self._header = u''
+        self._header_namespaces = frozenset()
+        if soapheaders:
+            header_tag = etree.QName(message.nsmap['soap-env'], 'Header')
+
+            def render_header(parent):
+                header = etree.SubElement(parent, header_tag)
+                message.render_headers(header, soapheaders)
+
+            self._header, self._header_namespaces = self.render_fragment(
+                render_header, 1)
+
+        self._body = None
+        if message.body:
+            self._body = self.compile(message.body, {})
+
+    def __call__(self, *args, **kwargs):
+        """Return the envelope (utf-8 encoded) for the given arguments"""
+        used = set(self._header_namespaces)
+        used.add(self.message.nsmap['soap-env'])
+        result = [None, self._header]
+        indent = self.newline + self.indent
+
+        if self._body is not None:
+            prefix = self._env_prefix
+            start = len(result)
+            result.append(u'%s<%s:Body>' % (indent, prefix))
+            if isinstance(self._body, _Complex) and not args:
+                self._body.write_kwargs(result, used, kwargs, 2)
+            else:
+                value = self.message.body(*args, **kwargs)
+                self._body.write(result, used, value, 2)
+
+            if len(result) == start + 1:
+                result[start] = u'%s<%s:Body/>' % (indent, prefix)
+            else:
+                result.append(u'%s</%s:Body>' % (indent, prefix))
+
+        if len(result) == 2 and not self._header:
+            result[0] = self._get_declaration(used) + u'/>' + self.newline
+        else:
+            result[0] = self._get_declaration(used) + u'>'
+            result.append(u'%s</%s:Envelope>%s' % (
+                self.newline, self._env_prefix, self.newline))
+
+        content = u''.join(result)
+        if self.policy.encoding.lower() in ('utf-8', 'utf8'):
+            return content.encode('utf-8')
+        return content.encode(self.policy.encoding, 'xmlcharrefreplace')
+
+    def _get_declaration(self, namespaces):
+        """Return the xml declaration and the soap:Envelope start tag (without
+        the closing `>`) which declares the given namespaces.
+
+        """
+        key = frozenset(namespaces)
+        declaration = self._declarations.get(key)
+        if declaration is None:
+            parts = [u'<%s:Envelope' % self._env_prefix]
+            if self.policy.xml_declaration:
+                parts.insert(0, u"<?xml version='1.0' encoding='%s'?>\n" % (
+                    self.policy.encoding))
+            for prefix, namespace in self._nsmap.items():
+                if namespace not in key:
+                    continue
+                if prefix is None:
+                    parts.append(
+                        u' xmlns="%s"' % _escape_attribute(namespace))
+                else:
+                    parts.append(u' xmlns:%s="%s"' % (
+                        prefix, _escape_attribute(namespace)))
+            declaration = self._declarations[key] = u''.join(parts)
+        return declaration
+
+    def compile(self, element, nodes):
+        """Return the node which writes the given element.
+
+        The `nodes` dict contains the already compiled nodes (by the id of
+        the element), this is required for recursive types.
+
+        """
+        node = nodes.get(id(element))
+        if node is not None:
+            return node
+
+        tag = self._get_tag(element)
+        xsd_type = element.type
+        if tag is None:
+            node = _Fallback(self, element)
+        elif (
+            isinstance(xsd_type, SimpleType) and
+            type(xsd_type).render is SimpleType.render
+        ):
+            node = _Leaf(self, element, tag)
+        elif (
+            isinstance(xsd_type, ComplexType) and
+            type(xsd_type).render is ComplexType.render and
+            not xsd_type.attributes and
+            _get_elements(xsd_type) is not None
+        ):
+            node = _Complex(self, element, tag)
+            nodes[id(element)] = node
+            node.children = [
+                (name, self.compile(child, nodes), child.default_value)
+                for name, child in _get_elements(xsd_type)
+            ]
+            node.names = frozenset(name for name, _, _ in node.children)
+        else:
+            node = _Fallback(self, element)
+
+        nodes[id(element)] = node
+        return node
+
+    def _get_tag(self, element):
+        """Return the (prefixed) tag of the element in the envelope or None
+        if it isn't known which prefix lxml would use.
+
+        """
+        if type(element) is not Element or element.qname is None:
+            return None
+
+        namespace = element.qname.namespace
+        if namespace is None:
+            if None in self._nsmap:
+                return None
+            return element.qname.localname
+
+        prefix = self._prefixes.get(namespace)
+        if prefix is None:
+            return None
+        return u'%s:%s' % (prefix, element.qname.localname)
+
+    def render_fragment(self, render, depth):
+        """Render the elements via lxml and return the serialized elements
+        as they would appear at the given depth in the envelope, and the
+        namespaces used by them.
+
+        The elements are rendered in a tree of wrapper elements so that the
+        namespace declarations and the indentation are the same as in the
+        envelope.
+
+        """
+        nsmap = dict(self._nsmap)
+        nsmap['zeep-fragment'] = _FRAGMENT_NS
+        root = parent = etree.Element(_FRAGMENT_TAG, nsmap=nsmap)
+        for i in range(depth - 1):
+            parent = etree.SubElement(parent, _FRAGMENT_TAG)
+
+        render(parent)
+        if not len(parent):
+            return u'', frozenset()
+
+        namespaces = set()
+        for node in parent.iterdescendants():
+            if isinstance(node.tag, six.string_types):
+                namespaces.add(etree.QName(node).namespace)
+            for name in node.attrib:
+                namespaces.add(etree.QName(name).namespace)
+        namespaces.discard(None)
+
+        content = etree.tostring(
+            root, pretty_print=self.policy.pretty_print,
+            encoding=six.text_type)
+        start = content.rindex(_FRAGMENT_START)
+        start = content.index(u'>', start) + 1
+        end = content.index(_FRAGMENT_END)
+        content = content[start:end]
+        return content[:content.rindex(u'>') + 1], frozenset(namespaces)
+
+
+class _Node(object):
+    """Base class for the compiled elements"""
+
+    def __init__(self, template, element):
+        self.template = template
+        self.element = element
+
+    def write(self, result, used, value, depth):
+        """Write the value(s) of the element, this is the same as
+        `zeep.xsd.elements.Element.render()`.
+
+        """
+        if self.element.accepts_multiple and (
+            isinstance(value, list) or inspect.isgenerator(value)
+        ):
+            for item in value:
+                self.write_item(result, used, item, depth)
+        else:
+            self.write_item(result, used, value, depth)
+
+    def write_item(self, result, used, value, depth):
+        raise NotImplementedError()
+
+    def fallback(self, result, used, value, depth):
+        """Render the value via lxml"""
+        element = self.element
+        content, namespaces = self.template.render_fragment(
+            lambda parent: element._render_value_item(parent, value), depth)
+        result.append(content)
+        used.update(namespaces)
+
+
+class _Fallback(_Node):
+    """Element which is always rendered via lxml"""
+
+    write_item = _Node.fallback
+
+
+class _Leaf(_Node):
+    """Element with a simple type"""
+
+    def __init__(self, template, element, tag):
+        super(_Leaf, self).__init__(template, element)
+        self.namespace = element.qname.namespace
+        self.xmlvalue = element.type.xmlvalue
+        self.start = u'<%s>' % tag
+        self.end = u'</%s>' % tag
+        self.empty = u'<%s/>' % tag
+
+    def write_item(self, result, used, value, depth):
+        if value is None:
+            if self.element.is_optional:
+                return
+            if self.element.nillable:
+                return self.fallback(result, used, value, depth)
+            result.append(
+                self.template.newline + self.template.indent * depth +
+                self.empty)
+
+        elif hasattr(value, '_xsd_type'):
+            return self.fallback(result, used, value, depth)
+
+        else:
+            text = self.xmlvalue(value)
+            if isinstance(text, six.binary_type):
+                text = text.decode('utf-8')
+            elif not isinstance(text, six.text_type):
+                return self.fallback(result, used, value, depth)
+
+            if _special_re.search(text):
+                text = _escape_text(text)
+            result.append(
+                self.template.newline + self.template.indent * depth +
+                self.start + text + self.end)
+
+        if self.namespace is not None:
+            used.add(self.namespace)
+
+
+class _Complex(_Node):
+    """Element with a complex type which consists of a sequence of elements
+    (see `_get_elements()`).
+
+    """
+
+    def __init__(self, template, element, tag):
+        super(_Complex, self).__init__(template, element)
+        self.namespace = element.qname.namespace
+        self.start = u'<%s>' % tag
+        self.end = u'</%s>' % tag
+        self.empty = u'<%s/>' % tag
+
+        # Set by EnvelopeTemplate.compile()
+        self.children = []
+        self.names = frozenset()
+
+    def write_kwargs(self, result, used, kwargs, depth):
+        """Write the element with the keyword arguments of the operation,
+        the missing values get the default value just like the value objects.
+
+        """
+        if not self.names.issuperset(kwargs):
+            # Let the value object raise the error for unknown arguments
+            return self.write(result, used, self.element(**kwargs), depth)
+
+        indent = self.template.newline + self.template.indent * depth
+        start = len(result)
+        result.append(indent + self.start)
+        depth += 1
+        for name, node, default in self.children:
+            node.write(result, used, kwargs.get(name, default), depth)
+        self._finish(result, used, start, indent)
+
+    def write_item(self, result, used, value, depth):
+        element = self.element
+        if value is None:
+            if element.is_optional:
+                return
+            if element.nillable:
+                return self.fallback(result, used, value, depth)
+            result.append(
+                self.template.newline + self.template.indent * depth +
+                self.empty)
+            if self.namespace is not None:
+                used.add(self.namespace)
+            return
+
+        xsd_type = getattr(value, '_xsd_type', element.type)
+        if (
+            (xsd_type is not element.type and xsd_type != element.type) or
+            not isinstance(value, (CompoundValue, dict))
+        ):
+            return self.fallback(result, used, value, depth)
+
+        indent = self.template.newline + self.template.indent * depth
+        start = len(result)
+        result.append(indent + self.start)
+        depth += 1
+        if isinstance(value, dict):
+            for name, node, default in self.children:
+                node.write(result, used, value.get(name), depth)
+        else:
+            for name, node, default in self.children:
+                node.write(result, used, getattr(value, name, None), depth)
+        self._finish(result, used, start, indent)
+
+    def _finish(self, result, used, start, indent):
+        if len(result) == start + 1:
+            result[start] = indent + self.empty
+        else:
+            result.append(indent + self.end)
+        if self.namespace is not None:
+            used.add(self.namespace)
+
+
+def _get_elements(xsd_type):
+    """Return the list of (name, element) tuples of the complex type, or
+    None when the type doesn't consist of sequences (or all indicators) of
+    elements. These are rendered in order (see
+    `zeep.xsd.indicators.OrderIndicator.render()`).
+
+    """
+    result = []
+    for name, container in xsd_type.elements_nested:
+        if (
+            not isinstance(container, (Sequence, All)) or
+            container.accepts_multiple
+        ):
+            return None
+
+        for element_name, element in container.elements_nested:
+            if type(element) is not Element or element.qname is None:
+                return None
+
+            # The values are read as attribute of the value objects
+            if hasattr(CompoundValue, element_name):
+                return None
+            result.append((element_name, element))
+    return result
+
+
+def _get_prefixes(nsmap):
+    """Return a dict with the prefix per namespace, namespaces which are
+    declared with multiple prefixes are left out.
+
+    """
+    result = {}
+    duplicates = set()
+    for prefix, namespace in nsmap.items():
+        if namespace in result or prefix is None:
+            duplicates.add(namespace)
+        result[namespace] = prefix
+    for namespace in duplicates:
+        result.pop(namespace, None)
+    return result
+
+
+def _escape_text(text):
+    if _invalid_re.search(text):
+        raise ValueError(
+            "All strings must be XML compatible: Unicode or ASCII, " +
+            "no NULL bytes or control characters")
+    return (
+        text.replace(u'&', u'&amp;').replace(u'<', u'&lt;')
+        .replace(u'>', u'&gt;').replace(u'\r', u'&#13;'))
+
+
+def _escape_attribute(value):
+    return _escape_text(value).replace(u'"', u'&quot;')
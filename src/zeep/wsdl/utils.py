@@ -1,11 +1,157 @@
+import re
+
+import six
 from lxml import etree
 
+from zeep.xsd.context import DeferredValues
+
+
+_charset_re = re.compile(r';\s*charset=[^;]*', re.IGNORECASE)
+
 
 def etree_to_string(node):
     return etree.tostring(
         node, pretty_print=True, xml_declaration=True, encoding='utf-8')
 
 
+class SerializationPolicy(object):
+    """Defines how the envelopes are serialized before they are sent, see
+    the `serialization` option of `zeep.transports.Transport`.
+
+    The default is compact xml (without indentation) encoded as utf-8 with
+    an xml declaration.
+
+    :param pretty_print: Indent the xml, useful when debugging
+    :param xml_declaration: Start with the <?xml ... ?> declaration
+    :param encoding: The encoding of the xml, this is also used as charset
+                     of the Content-Type header.
+    :param c14n: Serialize as canonical xml, the `pretty_print` and
+                 `xml_declaration` options are then ignored and the encoding
+                 is always utf-8.
+    :param exclusive: Use exclusive canonicalization (only with `c14n`)
+
+    """
+
+    def __init__(self, pretty_print=False, xml_declaration=True,
+                 encoding='utf-8', c14n=False, exclusive=False):
+        self.pretty_print = pretty_print
+        self.xml_declaration = xml_declaration
+        self.encoding = 'utf-8' if c14n else encoding
+        self.c14n = c14n
+        self.exclusive = exclusive
+
+    def __repr__(self):
+        return (
+            '<%s(pretty_print=%r, xml_declaration=%r, encoding=%r, c14n=%r, ' +
+            'exclusive=%r)>'
+        ) % (
+            self.__class__.__name__, self.pretty_print, self.xml_declaration,
+            self.encoding, self.c14n, self.exclusive)
+
+    def serialize(self, node):
+        """Return the node serialized as bytes"""
+        if self.c14n:
+            return etree.tostring(
+                node, method='c14n', exclusive=self.exclusive)
+        return etree.tostring(
+            node, pretty_print=self.pretty_print,
+            xml_declaration=self.xml_declaration, encoding=self.encoding)
+
+    def content_type(self, content_type):
+        """Return the content type with the charset of this policy"""
+        return _charset_re.sub('; charset=%s' % self.encoding, content_type)
+
+
+default_serialization = SerializationPolicy()
+
+
+def get_serialization_policy(transport):
+    """Return the serialization policy of the transport"""
+    return getattr(transport, 'serialization', None) or default_serialization
+
+
+def uses_post_xml(transport):
+    """Return True if the class of the transport overrides `post_xml()`.
+
+    The envelopes are normally serialized by the binding and sent via
+    `post()`. Custom transports which override `post_xml()` still receive
+    the envelope as xml tree, the `egress_raw` hooks of the plugins are not
+    applied then.
+
+    """
+    for cls in type(transport).__mro__:
+        if 'post_xml' in vars(cls):
+            return cls.__module__ not in (
+                'zeep.transports', 'zeep.asyncio.transport')
+    return False
+
+
+def etree_to_chunks(node, deferred, chunk_size=64 * 1024, encoding='utf-8',
+                    xml_declaration=True):
+    """Serialize the node incrementally and yield chunks of bytes.
+
+    The values of the `zeep.xsd.context.DeferredValues` are rendered one by
+    one while the document is written, so they are never all in memory.
+
+    """
+    buf = six.BytesIO()
+    with etree.xmlfile(buf, encoding=encoding) as xf:
+        if xml_declaration:
+            xf.write_declaration()
+        for _ in _write_node(xf, node, deferred, {}):
+            xf.flush()
+            if buf.tell() >= chunk_size:
+                yield buf.getvalue()
+                buf.seek(0)
+                buf.truncate()
+    if buf.tell():
+        yield buf.getvalue()
+
+
+def _write_node(xf, node, deferred, declared):
+    """Write the node via the xmlfile, yields after every deferred value.
+
+    Only the namespaces which are not yet declared by the parents (`declared`)
+    are declared on the node.
+
+    """
+    nsmap = {
+        prefix: namespace for prefix, namespace in node.nsmap.items()
+        if declared.get(prefix) != namespace
+    }
+    if nsmap:
+        # The default namespace has None as prefix, so no dict(**nsmap)
+        declared = dict(declared)
+        declared.update(nsmap)
+
+    with xf.element(node.tag, attrib=dict(node.attrib), nsmap=nsmap):
+        if node.text:
+            xf.write(node.text)
+
+        for child in node:
+            # Comments and processing instructions are not written
+            if not isinstance(child.tag, six.string_types):
+                if child.tail:
+                    xf.write(child.tail)
+                continue
+
+            if child.tag == DeferredValues.tag:
+                element, values = deferred.pop(child)
+                for value in values:
+                    container = etree.Element(node.tag, nsmap=node.nsmap)
+                    element.render(container, [value])
+                    for item in container:
+                        for _ in _write_node(xf, item, deferred, declared):
+                            yield
+                    yield
+            else:
+                for _ in _write_node(xf, child, deferred, declared):
+                    yield
+
+            if child.tail:
+                xf.write(child.tail)
+
+
 def combine_schemas(schema_nodes, location, parser_context):
     """Combine multiple xsd:schema elements in one schema
 
@@ -2,12 +2,14 @@ from __future__ import print_function
 
 import logging
 import operator
+import time
 from collections import OrderedDict
 
 import six
 from lxml import etree
 
-from zeep.parser import absolute_location, load_external, parse_xml
+from zeep.parser import (
+    absolute_location, load_external, parse_xml, prefetch_imports)
 from zeep.utils import findall_multiple_ns
 from zeep.wsdl import definitions, http, soap
 from zeep.wsdl.utils import combine_schemas
@@ -37,7 +39,8 @@ class Document(object):
 
     """
 
-    def __init__(self, location, transport):
+    def __init__(self, location, transport, lazy=False,
+                 schema_registry=None, content=None):
         """Initialize a WSDL document.
 
         The root definition properties are exposed as entry points.
@@ -46,6 +49,15 @@ class Document(object):
         :type location: string
         :param transport: The transport object to be used
         :type transport: zeep.transports.Transport
+        :param lazy: Resolve the types, elements and messages on first use
+                     instead of directly after loading the documents
+        :type lazy: bool
+        :param schema_registry: Registry to share the imported schema
+                                documents with other documents
+        :type schema_registry: zeep.xsd.registry.SchemaRegistry
+        :param content: The content of the WSDL when it is already loaded
+                        from the location
+        :type content: bytes
 
         """
         self.location = location if not hasattr(location, 'read') else None
@@ -55,12 +67,25 @@ class Document(object):
         self._definitions = {}
 
         # Dict with internal schema objects, used for lxml.ImportResolver
-        self._parser_context = ParserContext()
+        self._parser_context = ParserContext(
+            lazy=lazy, registry=schema_registry)
 
-        document = self._load_content(location)
+        if content is not None:
+            document = parse_xml(content, self.transport, self.location)
+        else:
+            document = self._load_content(location)
+
+        try:
+            # Load all imported documents concurrently before parsing them
+            if getattr(self.transport, 'prefetch_concurrency', None):
+                self._parser_context.prefetched = prefetch_imports(
+                    document, self.transport, self.location)
 
-        root_definitions = Definition(self, document, self.location)
-        root_definitions.resolve_imports()
+            root_definitions = Definition(self, document, self.location)
+            root_definitions.resolve_imports()
+        finally:
+            # Don't keep the prefetched documents which were not used
+            self._parser_context.prefetched.clear()
 
         # Make the wsdl definitions public
         self.types = root_definitions.types
@@ -109,7 +134,7 @@ class Document(object):
                 print(' ' * 8, 'Operations:')
 
                 operations = sorted(
-                    port.binding._operations.values(),
+                    port.binding.all().values(),
                     key=operator.attrgetter('name'))
 
                 for operation in operations:
@@ -126,14 +151,18 @@ class Document(object):
         """
         if hasattr(location, 'read'):
             return parse_xml(location.read(), self.transport)
-        return load_external(location, self.transport, self.location)
+        return load_external(
+            location, self.transport, self.location,
+            self._parser_context.prefetched)
 
 
 class Definition(object):
     """The Definition represents one wsdl:definition within a Document."""
 
     def __init__(self, wsdl, doc, location):
-        logger.debug("Creating definition for %s", location)
+        debug = logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            start = time.time()
         self.wsdl = wsdl
         self.location = location
 
@@ -159,6 +188,14 @@ class Definition(object):
         self.bindings = self.parse_binding(doc)
         self.services = self.parse_service(doc)
 
+        if debug:
+            logger.debug(
+                "Loaded definition %s (%d messages, %d port types, " +
+                "%d bindings, %d services) in %.1fms",
+                location, len(self.messages), len(self.port_types),
+                len(self.bindings), len(self.services),
+                (time.time() - start) * 1000)
+
     def __repr__(self):
         return '<Definition(location=%r)>' % self.location
 
@@ -207,8 +244,10 @@ class Definition(object):
         for definition in self.imports.values():
             definition.resolve_imports()
 
-        for message in self.messages.values():
-            message.resolve(self)
+        # The parts of the messages are resolved on first use in lazy mode
+        if not self.wsdl._parser_context.lazy:
+            for message in self.messages.values():
+                message.resolve(self)
 
         for port_type in self.port_types.values():
             port_type.resolve(self)
@@ -332,7 +371,6 @@ class Definition(object):
         for msg_node in doc.findall("wsdl:message", namespaces=NSMAP):
             msg = definitions.AbstractMessage.parse(self, msg_node)
             result[msg.name.text] = msg
-            logger.debug("Adding message: %s", msg.name.text)
         return result
 
     def parse_ports(self, doc):
@@ -352,7 +390,6 @@ class Definition(object):
         for port_node in doc.findall('wsdl:portType', namespaces=NSMAP):
             port_type = definitions.PortType.parse(self, port_node)
             result[port_type.name.text] = port_type
-            logger.debug("Adding port: %s", port_type.name.text)
         return result
 
     def parse_binding(self, doc):
@@ -400,7 +437,6 @@ class Definition(object):
             else:
                 continue
 
-            logger.debug("Adding binding: %s", binding.name.text)
             result[binding.name.text] = binding
         return result
 
@@ -422,5 +458,4 @@ class Definition(object):
         for service_node in doc.findall('wsdl:service', namespaces=NSMAP):
             service = definitions.Service.parse(self, service_node)
             result[service.name] = service
-            logger.debug("Adding service: %s", service.name)
         return result
@@ -1,3 +1,16 @@
+import threading
+from contextlib import contextmanager
+
+from lxml import etree
+
+_render_state = threading.local()
+
+# Lock held while resolving types, elements and messages on first use (in
+# lazy mode). Resolving one object can resolve others, so a single
+# (reentrant) lock is used for all of them.
+resolve_lock = threading.RLock()
+
+
 class SchemaRepository(object):
     """Mapping between schema target namespace and schema object"""
     def __init__(self):
@@ -32,18 +45,102 @@ class SchemaNodeRepository(object):
         return len(self._nodes)
 
 
-class ParserContext(object):
-    """Parser context when parsing wsdl/xsd files"""
+class QNameTable(object):
+    """Table of interned `lxml.etree.QName` objects, the QName for a
+    (namespace, localname) pair is only created once.
+
+    """
     def __init__(self):
+        self._qnames = {}
+
+    def get(self, namespace, localname=None):
+        """Return the QName, the arguments are the same as for
+        `lxml.etree.QName()`.
+
+        """
+        key = (namespace, localname)
+        try:
+            return self._qnames[key]
+        except KeyError:
+            pass
+
+        qname = etree.QName(namespace, localname)
+        qname = self._qnames.setdefault(
+            (qname.namespace, qname.localname), qname)
+        self._qnames[key] = qname
+        return qname
+
+    def __len__(self):
+        return len(set(self._qnames.values()))
+
+
+class ParserContext(object):
+    """Parser context when parsing wsdl/xsd files
+
+    :param lazy: Resolve the global types and elements of the schemas when
+                 they are used instead of directly after parsing them.
+    :param registry: The `zeep.xsd.registry.SchemaRegistry` used to share
+                     the imported schema documents with other documents.
+
+    """
+    def __init__(self, lazy=False, registry=None):
         self.schema_nodes = SchemaNodeRepository()
         self.schema_objects = SchemaRepository()
+        self.qnames = QNameTable()
+        self.lazy = lazy
+        self.registry = registry
 
         # Mapping between internal nodes and original location
         self.schema_locations = {}
 
+        # Imported documents which are already parsed, by their location
+        self.prefetched = {}
+
 
 class XmlParserContext(object):
     """Parser context when parsing XML elements"""
 
     def __init__(self):
         self.schemas = SchemaRepository()
+
+
+class DeferredValues(object):
+    """Generator values of elements with maxOccurs > 1 which are rendered
+    while the document is written (see `zeep.wsdl.utils.etree_to_chunks`).
+
+    A placeholder node is added to the tree for every generator.
+
+    """
+    tag = '{http://www.python-zeep.org/deferred}values'
+
+    def __init__(self):
+        self._items = {}
+
+    def add(self, parent, element, values):
+        key = str(len(self._items))
+        etree.SubElement(parent, self.tag, id=key)
+        self._items[key] = (element, values)
+
+    def pop(self, node):
+        return self._items.pop(node.get('id'))
+
+    def __len__(self):
+        return len(self._items)
+
+
+@contextmanager
+def defer_generators():
+    """Defer the rendering of generator values of elements within this
+    block, yields the `DeferredValues` instance.
+
+    """
+    deferred = DeferredValues()
+    _render_state.deferred = deferred
+    try:
+        yield deferred
+    finally:
+        _render_state.deferred = None
+
+
+def get_deferred_values():
+    return getattr(_render_state, 'deferred', None)
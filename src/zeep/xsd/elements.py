@@ -1,9 +1,10 @@
 import copy
+import inspect
 
 from lxml import etree
 
 from zeep.utils import qname_attr
-from zeep.xsd.context import XmlParserContext
+from zeep.xsd.context import XmlParserContext, get_deferred_values
 from zeep.xsd.utils import max_occurs_iter
 
 
@@ -115,6 +116,13 @@ class Any(Base):
         if self.accepts_multiple and isinstance(value, list):
             for val in value:
                 self._render_value_item(parent, val)
+        elif self.accepts_multiple and inspect.isgenerator(value):
+            deferred = get_deferred_values()
+            if deferred is not None:
+                deferred.add(parent, self, value)
+            else:
+                for val in value:
+                    self._render_value_item(parent, val)
         else:
             self._render_value_item(parent, value)
 
@@ -249,6 +257,13 @@ class Element(Base):
         if self.accepts_multiple and isinstance(value, list):
             for val in value:
                 self._render_value_item(parent, val)
+        elif self.accepts_multiple and inspect.isgenerator(value):
+            deferred = get_deferred_values()
+            if deferred is not None:
+                deferred.add(parent, self, value)
+            else:
+                for val in value:
+                    self._render_value_item(parent, val)
         else:
             self._render_value_item(parent, value)
 
@@ -272,7 +287,7 @@ class Element(Base):
         node = etree.SubElement(parent, self.qname)
         xsd_type = getattr(value, '_xsd_type', self.type)
 
-        if xsd_type != self.type:
+        if xsd_type is not self.type and xsd_type != self.type:
             return value._xsd_type.render(node, value, xsd_type)
         return self.type.render(node, value)
 
@@ -38,5 +38,11 @@ def load_external(url, transport, parser_context=None, base_url=None):
     if base_url:
         url = absolute_location(url, base_url)
 
+    # Documents which are already parsed by zeep.parser.prefetch_imports()
+    if parser_context and parser_context.prefetched:
+        document = parser_context.prefetched.pop(url, None)
+        if document is not None:
+            return document
+
     response = transport.load(url)
     return parse_xml(response, transport, parser_context, base_url)
@@ -0,0 +1,116 @@
+import hashlib
+import logging
+import os
+import threading
+
+from lxml import etree
+
+from zeep.xsd.parser import parse_xml
+
+logger = logging.getLogger(__name__)
+
+__all__ = ['SchemaRegistry', 'default_registry']
+
+
+class SchemaRegistry(object):
+    """Process wide registry of resolved schema documents.
+
+    Imported schema documents are registered by their target namespace,
+    location and the hash of their content. Other documents which import the
+    same schema reuse the already parsed (and resolved) schema document
+    instead of parsing it again. This is mostly useful for the large standard
+    schemas which are imported by a lot of wsdl documents.
+
+    Pass the registry to the client to use it::
+
+        from zeep.xsd.registry import default_registry
+
+        default_registry.add_local(
+            'http://www.w3.org/2000/09/xmldsig#', 'schemas/xmldsig.xsd')
+        client = Client(wsdl, schema_registry=default_registry)
+
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._documents = {}
+        self._local = {}
+
+    def __len__(self):
+        return len(self._documents)
+
+    def add_local(self, namespace, path):
+        """Use the local copy at `path` for all imports of the namespace.
+
+        The schema is then also loaded for xsd:import statements without
+        schemaLocation attribute.
+
+        """
+        with self._lock:
+            self._local[namespace] = os.path.abspath(path)
+
+    def get_local(self, namespace):
+        """Return the path of the local copy for the namespace (or None)"""
+        return self._local.get(namespace)
+
+    def load_local(self, namespace, transport, parser_context):
+        """Parse the local copy of the schema for the namespace"""
+        path = self._local[namespace]
+        with open(path, 'rb') as fh:
+            content = fh.read()
+        return parse_xml(content, transport, parser_context, base_url=path)
+
+    def create_key(self, namespace, location, node):
+        content = etree.tostring(node)
+        return (namespace, location, hashlib.sha1(content).hexdigest())
+
+    def add(self, key, document):
+        """Register the resolved schema document under the given key"""
+        with self._lock:
+            if key not in self._documents:
+                logger.debug("Registering schema %r", document)
+                self._documents[key] = document
+
+    def get(self, key, parser_context):
+        """Return the schema document for the key if it can be used within
+        the given parser context, otherwise return None.
+
+        The document is registered with its (transitive) imports in the
+        parser context. This is only possible when the parser context doesn't
+        contain an other schema document for one of these namespaces.
+
+        """
+        with self._lock:
+            document = self._documents.get(key)
+        if document is None:
+            return
+
+        documents = _collect_imports(document)
+        for namespace, schema in documents.items():
+            existing = parser_context.schema_objects.get(namespace)
+            if existing is not None and existing is not schema:
+                logger.debug(
+                    "Not reusing schema %r, the namespace %r is already " +
+                    "imported from %r", document, namespace, existing)
+                return
+
+        for schema in documents.values():
+            parser_context.schema_objects.add(schema)
+        return document
+
+    def clear(self):
+        with self._lock:
+            self._documents.clear()
+
+
+def _collect_imports(document, target=None):
+    if target is None:
+        target = {}
+    target[document._target_namespace] = document
+    for namespace, schema in document._imports.items():
+        if namespace not in target:
+            _collect_imports(schema, target)
+    return target
+
+
+default_registry = SchemaRegistry()
@@ -1,4 +1,5 @@
 import logging
+import time
 from collections import OrderedDict
 
 from lxml import etree
@@ -6,7 +7,7 @@ from lxml import etree
 from zeep import exceptions
 from zeep.utils import NotSet
 from zeep.xsd import builtins as xsd_builtins
-from zeep.xsd.context import ParserContext
+from zeep.xsd.context import ParserContext, resolve_lock
 from zeep.xsd.visitor import SchemaVisitor
 
 logger = logging.getLogger(__name__)
@@ -42,6 +43,13 @@ class Schema(object):
             self._schemas = _collect_imports_recursive(self._root)
             self._prefix_map = self._create_prefix_map()
 
+            # Share the imported schema documents with other documents
+            registry = self._parser_context.registry
+            if registry is not None:
+                for schema in self._schemas.values():
+                    if schema._registry_key:
+                        registry.add(schema._registry_key, schema)
+
     def __repr__(self):
         return '<Schema(location=%r)>' % (self._root._location)
 
@@ -54,15 +62,15 @@ class Schema(object):
     def elements(self):
         """Yield all globla xsd.Type objects"""
         for schema in self._schemas.values():
-            for element in schema._elements.values():
-                yield element
+            for name in list(schema._elements):
+                yield schema._get_component('_elements', name)
 
     @property
     def types(self):
         """Yield all globla xsd.Type objects"""
         for schema in self._schemas.values():
-            for type_ in schema._types.values():
-                yield type_
+            for name in list(schema._types):
+                yield schema._get_component('_types', name)
 
     def get_element(self, qname):
         """Return a global xsd.Element object with the given qname"""
@@ -72,7 +80,7 @@ class Schema(object):
 
         try:
             schema = self._get_schema_document(qname.namespace)
-            return schema._elements[qname]
+            return schema._get_component('_elements', qname.text)
         except ValueError:
             raise KeyError((
                 "Unable to resolve element %s. " +
@@ -92,7 +100,7 @@ class Schema(object):
 
         try:
             schema = self._get_schema_document(qname.namespace)
-            return schema._types[qname]
+            return schema._get_component('_types', qname.text)
         except ValueError:
             raise KeyError((
                 "Unable to resolve type %s. " +
@@ -122,12 +130,13 @@ class Schema(object):
         if not name.startswith('{') and ':' in name and self._prefix_map:
             prefix, localname = name.split(':', 1)
             if prefix in self._prefix_map:
-                return etree.QName(self._prefix_map[prefix], localname)
+                return self._parser_context.qnames.get(
+                    self._prefix_map[prefix], localname)
             else:
                 raise ValueError(
                     "No namespace defined for the prefix %r" % prefix)
         else:
-            return etree.QName(name)
+            return self._parser_context.qnames.get(name)
 
     def _create_prefix_map(self):
         prefix_map = {
@@ -148,7 +157,9 @@ class Schema(object):
 
 class SchemaDocument(object):
     def __init__(self, node, transport, location, parser_context, base_url):
-        logger.debug("Init schema for %r", location)
+        debug = logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            start = time.time()
         assert node is not None
         assert parser_context
 
@@ -159,7 +170,13 @@ class SchemaDocument(object):
         self._target_namespace = (
             node.get('targetNamespace') if node is not None else None)
         self._elm_instances = []
+        self._qnames = parser_context.qnames
+        self._lazy = parser_context.lazy
+
+        # Names of the components which are not yet resolved (lazy mode)
+        self._unresolved = set()
 
+        # The global types, elements, attributes and groups by QName text
         self._types = {}
         self._elements = {}
         self._attributes = {}
@@ -171,6 +188,9 @@ class SchemaDocument(object):
         self._resolved = False
         # self._xml_schema = None
 
+        # Key in the SchemaRegistry, only set for imported documents
+        self._registry_key = None
+
         parser_context.schema_objects.add(self)
 
         if node is not None:
@@ -181,20 +201,33 @@ class SchemaDocument(object):
             visitor = SchemaVisitor(self, parser_context)
             visitor.visit_schema(node)
 
+        if debug:
+            logger.debug(
+                "Loaded schema %r (%d types, %d elements, %d attributes, " +
+                "%d groups, %d imports) in %.1fms",
+                location, len(self._types), len(self._elements),
+                len(self._attributes), len(self._groups), len(self._imports),
+                (time.time() - start) * 1000)
+
     def __repr__(self):
         return '<SchemaDocument(location=%r, tns=%r, is_empty=%r)>' % (
             self._location, self._target_namespace, self.is_empty)
 
     def resolve(self):
-        logger.info("Resolving in schema %s", self)
-
         if self._resolved:
             return
         self._resolved = True
+        logger.debug("Resolving in schema %s", self)
 
         for schema in self._imports.values():
             schema.resolve()
 
+        # The types and elements are resolved on first use via
+        # _get_component() in lazy mode.
+        if self._lazy:
+            self._elm_instances = []
+            return
+
         for key, type_ in self._types.items():
             new = type_.resolve()
             assert new is not None, "resolve() should return a type"
@@ -210,26 +243,30 @@ class SchemaDocument(object):
 
         if isinstance(name, etree.QName):
             name = name.text
-        logger.debug("register_type(%r, %r)", name, value)
         self._types[name] = value
+        if self._lazy:
+            self._unresolved.add(('_types', name))
 
     def register_element(self, name, value):
         if isinstance(name, etree.QName):
             name = name.text
-        logger.debug("register_element(%r, %r)", name, value)
         self._elements[name] = value
+        if self._lazy:
+            self._unresolved.add(('_elements', name))
 
     def register_attribute(self, name, value):
         if isinstance(name, etree.QName):
             name = name.text
-        logger.debug("register_attribute(%r, %r)", name, value)
         self._attributes[name] = value
+        if self._lazy:
+            self._unresolved.add(('_attributes', name))
 
     def register_group(self, name, value):
         if isinstance(name, etree.QName):
             name = name.text
-        logger.debug("register_group(%r, %r)", name, value)
         self._groups[name] = value
+        if self._lazy:
+            self._unresolved.add(('_groups', name))
 
     def get_type(self, name, default=NotSet):
         """Return a xsd.Type object from this schema or one of the imported
@@ -243,7 +280,7 @@ class SchemaDocument(object):
         self._check_namespace_reference(name)
         if name.namespace == self._target_namespace:
             if name.text in self._types:
-                return self._types[name]
+                return self._get_component('_types', name.text)
             elif default is not NotSet:
                 return default
             else:
@@ -270,7 +307,7 @@ class SchemaDocument(object):
         self._check_namespace_reference(name)
         if name.namespace == self._target_namespace:
             if name.text in self._elements:
-                return self._elements[name]
+                return self._get_component('_elements', name.text)
             elif default is not NotSet:
                 return default
             else:
@@ -298,8 +335,8 @@ class SchemaDocument(object):
 
         """
         name = self._create_qname(name)
-        if name in self._attributes:
-            return self._attributes[name]
+        if name.text in self._attributes:
+            return self._get_component('_attributes', name.text)
 
         if name.namespace in self._imports:
             return self._imports[name.namespace].get_attribute(name)
@@ -317,8 +354,8 @@ class SchemaDocument(object):
 
         """
         name = self._create_qname(name)
-        if name in self._groups:
-            return self._groups[name]
+        if name.text in self._groups:
+            return self._get_component('_groups', name.text)
 
         if name.namespace in self._imports:
             return self._imports[name.namespace].get_group(name)
@@ -330,6 +367,27 @@ class SchemaDocument(object):
             "No such group: %r (Only have %s) (from: %s)" % (
                 name.text, ', '.join(self._attributes), self))
 
+    def _get_component(self, container_name, name):
+        """Return the global type, element, attribute or group with the given
+        name from the container, which is resolved first if needed.
+
+        """
+        container = getattr(self, container_name)
+        value = container[name]
+
+        # Don't resolve while the schema is still being parsed
+        if self._unresolved and self._resolved:
+            key = (container_name, name)
+            if key in self._unresolved:
+                with resolve_lock:
+                    if key in self._unresolved:
+                        logger.debug("Resolving %s", name)
+                        value = container[name] = value.resolve()
+                        self._unresolved.discard(key)
+                    else:
+                        value = container[name]
+        return value
+
     def _check_namespace_reference(self, name):
         """See https://www.w3.org/TR/xmlschema-1/#src-resolve"""
         ns = name.namespace
@@ -341,9 +399,8 @@ class SchemaDocument(object):
             ) % (self._target_namespace, ns))
 
     def _create_qname(self, name):
-        # TODO: Remove me
         if not isinstance(name, etree.QName):
-            name = etree.QName(name)
+            name = self._qnames.get(name)
         return name
 
     @property
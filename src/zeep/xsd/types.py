@@ -3,12 +3,16 @@ from collections import OrderedDict
 
 import six
 from cached_property import threaded_cached_property
+from lxml import etree
 
 from zeep.exceptions import XMLParseError
+from zeep.xsd.context import XmlParserContext
 from zeep.xsd.elements import Element
 from zeep.xsd.indicators import Sequence
-from zeep.xsd.utils import NamePrefixGenerator
-from zeep.xsd.valueobjects import CompoundValue
+from zeep.xsd.utils import NamePrefixGenerator, max_occurs_iter
+from zeep.xsd.valueobjects import CompoundValue, create_value_class
+
+XSI_TYPE = '{http://www.w3.org/2001/XMLSchema-instance}type'
 
 
 class Type(object):
@@ -169,12 +173,7 @@ class ComplexType(Type):
         super(ComplexType, self).__init__(qname=qname, is_global=is_global)
 
     def __call__(self, *args, **kwargs):
-        if not hasattr(self, '_value_class'):
-            self._value_class = type(
-                self.__class__.__name__, (CompoundValue,),
-                {'_xsd_type': self, '__module__': 'zeep.objects'})
-
-        return self._value_class(*args, **kwargs)
+        return self.value_class(*args, **kwargs)
 
     def __str__(self):
         return '%s(%s)' % (self.__class__.__name__, self.signature())
@@ -237,6 +236,33 @@ class ComplexType(Type):
             result.append((generator.get_name(), self._element))
         return result
 
+    @threaded_cached_property
+    def parse_plan(self):
+        """Flat list of (name, tag, element) tuples used to parse the child
+        elements of this type without walking the indicators.
+
+        Only types which consist of sequences (with maxOccurs=1) of elements
+        are supported, None is returned for all other types.
+
+        """
+        if isinstance(self._extension, SimpleType):
+            return None
+
+        plan = []
+        for name, container in self.elements_nested:
+            if not isinstance(container, Sequence):
+                return None
+            if container.accepts_multiple:
+                return None
+
+            sequence = []
+            for element_name, element in container.elements_nested:
+                if type(element) is not Element or element.qname is None:
+                    return None
+                sequence.append((element_name, element.qname.text, element))
+            plan.append(sequence)
+        return plan
+
     def parse_xmlelement(self, xmlelement, schema, allow_none=True,
                          context=None):
         """Consume matching xmlelements and call parse() on each"""
@@ -244,6 +270,10 @@ class ComplexType(Type):
         if not self.attributes and not self.elements:
             return None
 
+        if self.parse_plan is not None:
+            return self._parse_xmlelement_plan(
+                xmlelement, schema, allow_none, context)
+
         attributes = xmlelement.attrib
         init_kwargs = OrderedDict()
 
@@ -281,7 +311,117 @@ class ComplexType(Type):
             else:
                 init_kwargs[name] = attribute.parse(attributes)
 
-        return self(**init_kwargs)
+        return self.value_class._xsd_create(init_kwargs)
+
+    def _parse_xmlelement_plan(self, xmlelement, schema, allow_none, context):
+        """Parse the xmlelement using the `parse_plan`. This results in the
+        same object as the generic parsing via the indicators, but uses an
+        index into the child elements and creates the object directly.
+
+        """
+        attributes = xmlelement.attrib
+        elements = xmlelement.getchildren()
+        num_elements = len(elements)
+        if allow_none and num_elements == 0 and len(attributes) == 0:
+            return
+
+        context = context or XmlParserContext()
+        tags = [node.tag for node in elements]
+        values = OrderedDict()
+        parsed = []
+        index = 0
+        for sequence in self.parse_plan:
+            for name, tag, element in sequence:
+                values[name] = element.default_value
+
+            for name, tag, element in sequence:
+                if element.max_occurs == 1:
+                    result = None
+                    if index < num_elements and tags[index] == tag:
+                        result = self._parse_child(
+                            element, elements[index], schema, context)
+                        index += 1
+                else:
+                    result = []
+                    for _ in max_occurs_iter(element.max_occurs):
+                        if index == num_elements or tags[index] != tag:
+                            break
+                        item = self._parse_child(
+                            element, elements[index], schema, context)
+                        index += 1
+                        if item is not None:
+                            result.append(item)
+                parsed.append((name, result))
+
+                # Same as the indicators: the remaining elements of the
+                # sequence keep their default value.
+                if index == num_elements:
+                    break
+
+        if index < num_elements:
+            raise XMLParseError("Unexpected element: %s" % tags[index])
+
+        if self.attributes:
+            for name, attribute in self.attributes:
+                values[name] = attribute.default_value
+        for name, value in parsed:
+            values[name] = value
+
+        # Parse attributes
+        if self.attributes:
+            attributes = copy.copy(attributes)
+            for name, attribute in self.attributes:
+                if attribute.name:
+                    if attribute.qname.text in attributes:
+                        value = attributes.pop(attribute.qname.text)
+                        values[name] = attribute.parse(value)
+                else:
+                    values[name] = attribute.parse(attributes)
+
+        return self.value_class._xsd_create(values, defaults=False)
+
+    def _parse_child(self, element, node, schema, context):
+        if node.get(XSI_TYPE) is None:
+            return element.type.parse_xmlelement(
+                node, schema, allow_none=True, context=context)
+        return element.parse(node, schema, allow_none=True, context=context)
+
+    @property
+    def value_class(self):
+        """The CompoundValue subclass for the instances of this type"""
+        if not hasattr(self, '_value_class'):
+            self._value_class = create_value_class(self)
+        return self._value_class
+
+    @threaded_cached_property
+    def render_plan(self):
+        """Flat list of (name, element, qname, xmlvalue) tuples used to render
+        the elements of this type without walking the indicators.
+
+        The `xmlvalue` is the conversion function of the simple type for
+        elements which occur once and is None for all other elements. This is
+        only available for the types which have a `parse_plan`.
+
+        """
+        if self.parse_plan is None:
+            return None
+
+        plan = []
+        for sequence in self.parse_plan:
+            for name, tag, element in sequence:
+                # The values are read as attribute of the value objects
+                if hasattr(CompoundValue, name):
+                    return None
+
+                xmlvalue = None
+                if (
+                    element.max_occurs == 1 and
+                    isinstance(element.type, SimpleType) and
+                    type(element.type).render is SimpleType.render
+                ):
+                    xmlvalue = element.type.xmlvalue
+                plan.append((name, element, element.qname, xmlvalue))
+        return plan
 
     def render(self, parent, value, xsd_type=None):
         if not self.elements_nested and not self.attributes:
@@ -291,6 +431,41 @@ class ComplexType(Type):
             attr_value = getattr(value, name, None)
             attribute.render(parent, attr_value)
 
+        if (
+            self.render_plan is not None and
+            isinstance(value, (CompoundValue, dict))
+        ):
+            self._render_plan(parent, value)
+        else:
+            self._render_elements(parent, value)
+
+        if xsd_type and xsd_type._xsd_name:
+            parent.set(
+                '{http://www.w3.org/2001/XMLSchema-instance}type',
+                xsd_type._xsd_name)
+
+    def _render_plan(self, parent, value):
+        """Render the elements via the `render_plan`, this is equivalent to
+        rendering the sequences via the indicators.
+
+        """
+        is_dict = isinstance(value, dict)
+        for name, element, qname, xmlvalue in self.render_plan:
+            if is_dict:
+                element_value = value.get(name)
+            else:
+                element_value = getattr(value, name, None)
+            if element_value is None:
+                if not element.is_optional:
+                    element.render(parent, element_value)
+            elif xmlvalue is not None and not hasattr(
+                element_value, '_xsd_type'
+            ):
+                etree.SubElement(parent, qname).text = xmlvalue(element_value)
+            else:
+                element.render(parent, element_value)
+
+    def _render_elements(self, parent, value):
         for name, element in self.elements_nested:
             if isinstance(element, Element):
                 element.type.render(parent, getattr(value, name))
@@ -300,11 +475,6 @@ class ComplexType(Type):
                 else:
                     element.render(parent, value)
 
-        if xsd_type and xsd_type._xsd_name:
-            parent.set(
-                '{http://www.w3.org/2001/XMLSchema-instance}type',
-                xsd_type._xsd_name)
-
     def resolve(self):
         """ EXTENDS / RESTRICTS """
         if self._resolved:
@@ -1,12 +1,22 @@
+import re
 from collections import OrderedDict
 
 import six
 
-from zeep.xsd.indicators import Indicator
+try:
+    from collections.abc import MutableMapping
+except ImportError:  # Python 2
+    from collections import MutableMapping
+
+from zeep.xsd.elements import Any, Element
+from zeep.xsd.indicators import All, Indicator, Sequence
 from zeep.xsd.printer import PrettyPrinter
 
 __all__ = ['AnyObject', 'CompoundValue']
 
+_missing = object()
+_identifier_re = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+
 
 class AnyObject(object):
     def __init__(self, xsd_element, value):
@@ -19,60 +29,274 @@ class AnyObject(object):
 
 
 class CompoundValue(object):
+    """Base class of the value objects of complex types.
+
+    A subclass is created for every complexType (see
+    `create_value_class()`). The fields of the type are stored in
+    `__slots__` of that class, so reading an attribute is a plain slot read.
+    Other values (for example the elements of a choice) are stored in the
+    `_xsd_extra` dict.
+
+    """
+    __slots__ = ('_xsd_elm', '_xsd_extra')
+
+    _xsd_type = None
+    _xsd_fields = ()
+    _xsd_slots = frozenset()
+    _xsd_trusted = False
 
     def __init__(self, *args, **kwargs):
-        self.__values__ = OrderedDict()
+        self._xsd_extra = None
+        self._xsd_set_defaults()
+
+        items = _process_signature(self._xsd_type, args, kwargs)
+        for key, value in items.items():
+            self[key] = value
+
+    @classmethod
+    def _xsd_create(cls, values, defaults=True):
+        """Create an object from the given values without processing them
+        via the signature of the type.
+
+        This is used by the parser, the values are already in the same form
+        as the result of `_process_signature()`. Pass `defaults=False` when
+        the values already contain a value for every field.
+
+        Types with choices or groups still go through the signature since it
+        also normalizes the values of these.
 
-        # Set default values
+        """
+        if not cls._xsd_trusted:
+            return cls(**values)
+
+        instance = cls.__new__(cls)
+        object.__setattr__(instance, '_xsd_extra', None)
+        if defaults:
+            instance._xsd_set_defaults()
+
+        slots = cls._xsd_slots
+        for key, value in values.items():
+            if key in slots:
+                object.__setattr__(instance, key, value)
+            else:
+                instance[key] = value
+        return instance
+
+    def _xsd_set_defaults(self):
         for container_name, container in self._xsd_type.elements_nested:
             values = container.default_value
             if isinstance(container, Indicator):
-                self.__values__.update(values)
+                for key, value in values.items():
+                    self[key] = value
             else:
-                self.__values__[container_name] = values
+                self[container_name] = values
 
         for attribute_name, attribute in self._xsd_type.attributes:
-            self.__values__[attribute_name] = attribute.default_value
-
-        items = _process_signature(self._xsd_type, args, kwargs)
-        for key, value in items.items():
-            self.__values__[key] = value
+            self[attribute_name] = attribute.default_value
+
+    @property
+    def __values__(self):
+        """Mapping with the values of this object, changes are written
+        through to the object.
+
+        """
+        return _ValuesView(self)
+
+    @__values__.setter
+    def __values__(self, values):
+        for key in list(self):
+            del self[key]
+        for key, value in values.items():
+            self[key] = value
+
+    def __copy__(self):
+        cls = self.__class__
+        new = cls.__new__(cls)
+        for key in self._xsd_slots:
+            try:
+                object.__setattr__(
+                    new, key, object.__getattribute__(self, key))
+            except AttributeError:
+                pass
+        extra = self._xsd_extra
+        new._xsd_extra = OrderedDict(extra) if extra is not None else None
+        try:
+            new._xsd_elm = self._xsd_elm
+        except AttributeError:
+            pass
+        return new
 
     def __contains__(self, key):
-        return self.__values__.__contains__(key)
+        if key in self._xsd_slots:
+            try:
+                object.__getattribute__(self, key)
+            except AttributeError:
+                return False
+            return True
+        extra = self._xsd_extra
+        return extra is not None and key in extra
 
     def __len__(self):
-        return self.__values__.__len__()
+        return len(self._xsd_items())
 
     def __iter__(self):
-        return self.__values__.__iter__()
+        return iter([key for key, value in self._xsd_items()])
+
+    def _xsd_items(self):
+        """Return a list with the (key, value) tuples of this object"""
+        slots = self._xsd_slots
+        extra = self._xsd_extra
+        result = []
+        for key in self._xsd_fields:
+            if key in slots:
+                value = getattr(self, key, _missing)
+                if value is not _missing:
+                    result.append((key, value))
+            elif extra is not None and key in extra:
+                result.append((key, extra[key]))
+
+        if extra:
+            fields = self._xsd_fields
+            result.extend(
+                (key, value) for key, value in extra.items()
+                if key not in fields)
+        return result
 
     def __repr__(self):
-        return PrettyPrinter().pformat(self.__values__)
+        return PrettyPrinter().pformat(OrderedDict(self._xsd_items()))
 
     def __delitem__(self, key):
-        return self.__values__.__delitem__(key)
+        if key in self._xsd_slots:
+            try:
+                object.__delattr__(self, key)
+            except AttributeError:
+                raise KeyError(key)
+        elif self._xsd_extra is not None:
+            del self._xsd_extra[key]
+        else:
+            raise KeyError(key)
 
     def __getitem__(self, key):
-        return self.__values__[key]
+        if key in self._xsd_slots:
+            try:
+                return object.__getattribute__(self, key)
+            except AttributeError:
+                raise KeyError(key)
+        if self._xsd_extra is None:
+            raise KeyError(key)
+        return self._xsd_extra[key]
 
     def __setitem__(self, key, value):
-        self.__values__[key] = value
+        if key in self._xsd_slots:
+            object.__setattr__(self, key, value)
+        else:
+            if self._xsd_extra is None:
+                self._xsd_extra = OrderedDict()
+            self._xsd_extra[key] = value
 
     def __setattr__(self, key, value):
-        if key.startswith('__') or key in ('_xsd_type', '_xsd_elm'):
-            return super(CompoundValue, self).__setattr__(key, value)
-        self.__values__[key] = value
+        if key.startswith('__') or key in ('_xsd_elm', '_xsd_extra'):
+            return object.__setattr__(self, key, value)
+        self[key] = value
+
+    def __getattr__(self, key):
+        # Only called when the attribute is not found, which is the case for
+        # values which are not stored in a slot.
+        if not key.startswith('__') and key not in ('_xsd_elm', '_xsd_extra'):
+            extra = self._xsd_extra
+            if extra is not None and key in extra:
+                return extra[key]
+        raise AttributeError(
+            "%s instance has no attribute '%s'" % (
+                self.__class__.__name__, key))
+
+
+class _ValuesView(MutableMapping):
+    """The values of a `CompoundValue` as (mutable) mapping, returned by
+    `CompoundValue.__values__`.
 
-    def __getattribute__(self, key):
-        if key.startswith('__') or key in ('_xsd_type', '_xsd_elm'):
-            return super(CompoundValue, self).__getattribute__(key)
-        try:
-            return self.__values__[key]
-        except KeyError:
-            raise AttributeError(
-                "%s instance has no attribute '%s'" % (
-                    self.__class__.__name__, key))
+    """
+    __slots__ = ('_obj',)
+
+    def __init__(self, obj):
+        self._obj = obj
+
+    def __getitem__(self, key):
+        return self._obj[key]
+
+    def __setitem__(self, key, value):
+        self._obj[key] = value
+
+    def __delitem__(self, key):
+        del self._obj[key]
+
+    def __iter__(self):
+        return iter(self._obj)
+
+    def __len__(self):
+        return len(self._obj)
+
+    def __repr__(self):
+        return repr(OrderedDict(self._obj._xsd_items()))
+
+    def copy(self):
+        return OrderedDict(self._obj._xsd_items())
+
+
+def create_value_class(xsd_type):
+    """Create the CompoundValue subclass for the given complexType.
+
+    Every field of the type with a name which is a valid (and available)
+    attribute name gets a slot.
+
+    """
+    fields = []
+    for container_name, container in xsd_type.elements_nested:
+        if isinstance(container, Indicator):
+            names = container.default_value
+        else:
+            names = [container_name]
+        for name in names:
+            if name not in fields:
+                fields.append(name)
+
+    for attribute_name, attribute in xsd_type.attributes:
+        if attribute_name not in fields:
+            fields.append(attribute_name)
+
+    slots = tuple(name for name in fields if _is_slot_name(name))
+    return type(xsd_type.__class__.__name__, (CompoundValue,), {
+        '__slots__': slots,
+        '__module__': 'zeep.objects',
+        '_xsd_type': xsd_type,
+        '_xsd_fields': tuple(fields),
+        '_xsd_slots': frozenset(slots),
+        '_xsd_trusted': all(
+            _is_trusted(container)
+            for name, container in xsd_type.elements_nested),
+    })
+
+
+def _is_trusted(element):
+    """Return if the parsed values of the element are left as-is by
+    `_process_signature()`.
+
+    """
+    if isinstance(element, (Sequence, All)):
+        return (
+            not element.accepts_multiple and
+            all(_is_trusted(child) for child in element))
+    return isinstance(element, (Any, Element))
+
+
+def _is_slot_name(name):
+    return (
+        isinstance(name, six.string_types) and
+        _identifier_re.match(name) is not None and
+        not name.startswith('__') and
+        not name.startswith('_xsd_') and
+        not hasattr(CompoundValue, name)
+    )
 
 
 def _process_signature(xsd_type, args, kwargs):
@@ -11,6 +11,7 @@ from zeep.xsd import builtins as xsd_builtins
 from zeep.xsd import elements as xsd_elements
 from zeep.xsd import indicators as xsd_indicators
 from zeep.xsd import types as xsd_types
+from zeep.xsd.context import QNameTable
 from zeep.xsd.parser import load_external
 
 logger = logging.getLogger(__name__)
@@ -42,6 +43,8 @@ class SchemaVisitor(object):
         self.schema = schema
         self.parser_context = parser_context
         self._includes = set()
+        self._qnames = (
+            parser_context.qnames if parser_context else QNameTable())
 
     def process(self, node, parent):
         visit_func = self.visitors.get(node.tag)
@@ -51,7 +54,7 @@ class SchemaVisitor(object):
         return result
 
     def process_ref_attribute(self, node):
-        ref = qname_attr(node, 'ref')
+        ref = qname_attr(node, 'ref', qnames=self._qnames)
         if ref:
             ref = self._create_qname(ref)
 
@@ -63,7 +66,7 @@ class SchemaVisitor(object):
             return xsd_elements.RefAttribute(node.tag, ref, self.schema)
 
     def process_reference(self, node, **kwargs):
-        ref = qname_attr(node, 'ref')
+        ref = qname_attr(node, 'ref', qnames=self._qnames)
         if not ref:
             return
         if node.tag == tags.element:
@@ -142,6 +145,14 @@ class SchemaVisitor(object):
             self.schema._imports[namespace] = schema
             return schema
 
+        # Use the local copy of the schema when it is registered
+        registry = self.parser_context.registry if self.parser_context else None
+        local_location = None
+        if registry is not None:
+            local_location = registry.get_local(namespace)
+            if local_location:
+                location = local_location
+
         # Silently ignore import statements which we can't resolve via the
         # namespace and doesn't have a schemaLocation attribute.
         if not location:
@@ -151,8 +162,12 @@ class SchemaVisitor(object):
             return
 
         # Load the XML
-        schema_node = load_external(
-            location, self.schema._transport, self.parser_context)
+        if local_location:
+            schema_node = registry.load_local(
+                namespace, self.schema._transport, self.parser_context)
+        else:
+            schema_node = load_external(
+                location, self.schema._transport, self.parser_context)
 
         # Check if the xsd:import namespace matches the targetNamespace. If
         # the xsd:import statement didn't specify a namespace then make sure
@@ -172,6 +187,18 @@ class SchemaVisitor(object):
                 ) % (location, namespace or '(null)', schema._location)
             warnings.warn(message, ZeepWarning, stacklevel=6)
 
+        # Reuse the schema document when it is already parsed for an other
+        # document.
+        registry_key = None
+        if registry is not None:
+            registry_key = registry.create_key(
+                schema_tns, location, schema_node)
+            schema = registry.get(registry_key, self.parser_context)
+            if schema is not None:
+                logger.debug("Using shared schema: %r", location)
+                self.schema._imports[namespace] = schema
+                return schema
+
         # If this schema location is 'internal' then retrieve the original
         # location since that is used as base url for sub include/imports
         if location in self.parser_context.schema_locations:
@@ -182,6 +209,7 @@ class SchemaVisitor(object):
         schema = self.schema.__class__(
             schema_node, self.schema._transport, location,
             self.parser_context, base_url)
+        schema._registry_key = registry_key
 
         self.schema._imports[namespace] = schema
         return schema
@@ -251,9 +279,10 @@ class SchemaVisitor(object):
 
         element_form = node.get('form', self.schema._element_form)
         if element_form == 'qualified' or is_global:
-            qname = qname_attr(node, 'name', self.schema._target_namespace)
+            qname = qname_attr(
+                node, 'name', self.schema._target_namespace, self._qnames)
         else:
-            qname = etree.QName(node.get('name'))
+            qname = self._qnames.get(node.get('name'))
 
         children = node.getchildren()
         xsd_type = None
@@ -270,9 +299,9 @@ class SchemaVisitor(object):
                     xsd_type = self.process(child, node)
 
         if not xsd_type:
-            node_type = qname_attr(node, 'type')
+            node_type = qname_attr(node, 'type', qnames=self._qnames)
             if node_type:
-                xsd_type = self._get_type(node_type.text)
+                xsd_type = self._get_type(node_type)
             else:
                 xsd_type = xsd_builtins.AnyType()
 
@@ -317,17 +346,18 @@ class SchemaVisitor(object):
                 return result
 
         attribute_form = node.get('form', self.schema._attribute_form)
-        qname = qname_attr(node, 'name', self.schema._target_namespace)
+        qname = qname_attr(
+            node, 'name', self.schema._target_namespace, self._qnames)
         if attribute_form == 'qualified' or is_global:
             name = qname
         else:
-            name = etree.QName(node.get('name'))
+            name = self._qnames.get(node.get('name'))
 
         annotation, items = self._pop_annotation(node.getchildren())
         if items:
             xsd_type = self.visit_simple_type(items[0], node)
         else:
-            node_type = qname_attr(node, 'type')
+            node_type = qname_attr(node, 'type', qnames=self._qnames)
             if node_type:
                 xsd_type = self._get_type(node_type)
             else:
@@ -364,7 +394,8 @@ class SchemaVisitor(object):
             name = parent.get('name', 'Anonymous')
             is_global = False
         base_type = '{http://www.w3.org/2001/XMLSchema}string'
-        qname = as_qname(name, node.nsmap, self.schema._target_namespace)
+        qname = as_qname(
+            name, node.nsmap, self.schema._target_namespace, self._qnames)
 
         annotation, items = self._pop_annotation(node.getchildren())
         child = items[0]
@@ -414,7 +445,8 @@ class SchemaVisitor(object):
             name = parent.get('name')
             is_global = False
 
-        qname = as_qname(name, node.nsmap, self.schema._target_namespace)
+        qname = as_qname(
+            name, node.nsmap, self.schema._target_namespace, self._qnames)
         cls_attributes = {
             '__module__': 'zeep.xsd.dynamic_types',
             '_xsd_base': base_type,
@@ -523,7 +555,7 @@ class SchemaVisitor(object):
                     maxLength | enumeration | whiteSpace | pattern)*))
             </restriction>
         """
-        base_name = qname_attr(node, 'base')
+        base_name = qname_attr(node, 'base', qnames=self._qnames)
         base_type = self._get_type(base_name)
         return base_type
 
@@ -541,7 +573,7 @@ class SchemaVisitor(object):
                 )?, ((attribute | attributeGroup)*, anyAttribute?))
             </restriction>
         """
-        base_name = qname_attr(node, 'base')
+        base_name = qname_attr(node, 'base', qnames=self._qnames)
         base_type = self._get_type(base_name)
         return base_type, []
 
@@ -556,7 +588,7 @@ class SchemaVisitor(object):
                     ((attribute | attributeGroup)*, anyAttribute?))
             </restriction>
         """
-        base_name = qname_attr(node, 'base')
+        base_name = qname_attr(node, 'base', qnames=self._qnames)
         base_type = self._get_type(base_name)
         annotation, children = self._pop_annotation(node.getchildren())
 
@@ -582,7 +614,7 @@ class SchemaVisitor(object):
                         ((attribute | attributeGroup)*, anyAttribute?)))
             </extension>
         """
-        base_name = qname_attr(node, 'base')
+        base_name = qname_attr(node, 'base', qnames=self._qnames)
         base_type = self._get_type(base_name)
         annotation, children = self._pop_annotation(node.getchildren())
 
@@ -607,7 +639,7 @@ class SchemaVisitor(object):
             Content: (annotation?, ((attribute | attributeGroup)*, anyAttribute?))
             </extension>
         """
-        base_name = qname_attr(node, 'base')
+        base_name = qname_attr(node, 'base', qnames=self._qnames)
         base_type = self._get_type(base_name)
         annotation, children = self._pop_annotation(node.getchildren())
         attributes = self._process_attributes(node, children)
@@ -721,7 +753,8 @@ class SchemaVisitor(object):
         if result:
             return result
 
-        qname = qname_attr(node, 'name', self.schema._target_namespace)
+        qname = qname_attr(
+            node, 'name', self.schema._target_namespace, self._qnames)
 
         # There should be only max nodes, first node (annotation) is irrelevant
         annotation, children = self._pop_annotation(node.getchildren())
@@ -747,9 +780,9 @@ class SchemaVisitor(object):
         mutually exclusive.
 
         """
-        item_type = qname_attr(node, 'itemType')
+        item_type = qname_attr(node, 'itemType', qnames=self._qnames)
         if item_type:
-            sub_type = self._get_type(item_type.text)
+            sub_type = self._get_type(item_type)
         else:
             subnodes = node.getchildren()
             child = subnodes[-1]  # skip annotation
@@ -843,11 +876,11 @@ class SchemaVisitor(object):
 
     def _create_qname(self, name):
         if not isinstance(name, etree.QName):
-            name = etree.QName(name)
+            name = self._qnames.get(name)
 
         # Handle reserved namespace
         if name.namespace == 'xml':
-            name = etree.QName(
+            name = self._qnames.get(
                 'http://www.w3.org/XML/1998/namespace', name.localname)
 
         # Various xsd builders assume that some schema's are available by
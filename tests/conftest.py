@@ -1,4 +1,11 @@
+import sys
+import threading
+
 import pytest
+from six.moves import BaseHTTPServer, socketserver
+
+if sys.version_info < (3, 5):
+    collect_ignore = ['test_asyncio.py']
 
 
 @pytest.fixture(autouse=True)
@@ -10,3 +17,75 @@ def no_requests(request, monkeypatch):
         pytest.fail("External connections not allowed during tests.")
 
     monkeypatch.setattr("socket.socket", func)
+
+
+class _RequestHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        self._handle()
+
+    def do_POST(self):
+        self._handle()
+
+    def _handle(self):
+        if self.headers.get('Transfer-Encoding') == 'chunked':
+            body = b''
+            while True:
+                size = int(self.rfile.readline().strip(), 16)
+                body += self.rfile.read(size)
+                self.rfile.readline()
+                if not size:
+                    break
+        else:
+            body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+
+        self.server.requests.append({
+            'method': self.command,
+            'path': self.path,
+            'headers': dict(
+                (key.lower(), value) for key, value in self.headers.items()),
+            'body': body,
+        })
+
+        status, headers, content = self.server.response
+        self.send_response(status)
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, *args):
+        pass
+
+
+class HTTPServer(socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+    """Local http server which records the requests and returns the
+    configured response.
+
+    """
+    daemon_threads = True
+
+    def __init__(self):
+        BaseHTTPServer.HTTPServer.__init__(
+            self, ('127.0.0.1', 0), _RequestHandler)
+        self.requests = []
+        self.set_response(b'')
+
+    @property
+    def url(self):
+        return 'http://127.0.0.1:%d/' % self.server_address[1]
+
+    def set_response(self, content, status=200, headers=None):
+        self.response = (status, headers or {}, content)
+
+
+@pytest.fixture
+def http_server():
+    server = HTTPServer()
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
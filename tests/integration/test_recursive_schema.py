@@ -9,3 +9,11 @@ def test_hello_world():
         'recursive_schema_main.wsdl')
     client = zeep.Client(path)
     client.wsdl.dump()
+
+
+def test_hello_world_lazy():
+    path = os.path.join(
+        os.path.dirname(os.path.realpath(__file__)),
+        'recursive_schema_main.wsdl')
+    client = zeep.Client(path, lazy=True)
+    client.wsdl.dump()
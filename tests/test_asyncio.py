@@ -0,0 +1,296 @@
+import asyncio
+import os
+
+import pytest
+
+aiohttp = pytest.importorskip('aiohttp')
+
+from aiohttp import web  # noqa
+from aiohttp.test_utils import TestServer  # noqa
+from zeep.asyncio import AsyncClient, AsyncTransport  # noqa
+from zeep.cache import InMemoryCache  # noqa
+from zeep.plugins import TimingPlugin  # noqa
+
+
+WSDL_DIR = os.path.join(os.path.dirname(__file__), 'wsdl_files')
+
+RESPONSE = """
+<?xml version="1.0"?>
+<soapenv:Envelope
+    xmlns:soapenv="http://schemas.xmlsoap.org/soap/envelope/"
+    xmlns:stoc="http://example.com/stockquote.xsd">
+   <soapenv:Header/>
+   <soapenv:Body>
+      <stoc:TradePrice>
+         <price>120.123</price>
+      </stoc:TradePrice>
+   </soapenv:Body>
+</soapenv:Envelope>
+""".strip()
+
+
+def run_with_server(routes, func):
+    async def main():
+        app = web.Application()
+        app.add_routes(routes)
+        server = TestServer(app)
+        await server.start_server()
+        try:
+            return await func(str(server.make_url('')).rstrip('/'))
+        finally:
+            await server.close()
+
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(main())
+    finally:
+        loop.close()
+
+
+@pytest.mark.requests
+def test_async_client_service():
+    requests = []
+
+    async def wsdl(request):
+        with open(os.path.join(WSDL_DIR, 'soap.wsdl'), 'rb') as fh:
+            return web.Response(body=fh.read())
+
+    async def stockquote(request):
+        requests.append(await request.read())
+        return web.Response(text=RESPONSE, content_type='text/xml')
+
+    routes = [
+        web.get('/soap.wsdl', wsdl),
+        web.post('/stockquote', stockquote),
+    ]
+
+    async def func(url):
+        transport = AsyncTransport(cache=None)
+        client = await AsyncClient.create(
+            url + '/soap.wsdl', transport=transport)
+        assert transport._prefetched == {}
+        service = client.create_service(
+            '{http://example.com/stockquote.wsdl}StockQuoteBinding',
+            url + '/stockquote')
+
+        results = await asyncio.gather(
+            service.GetLastTradePrice('foo'),
+            service.GetLastTradePrice('bar'))
+        await client.close()
+        return results
+
+    assert run_with_server(routes, func) == [120.123, 120.123]
+
+
+@pytest.mark.requests
+def test_async_client_prepare():
+    requests = []
+
+    async def stockquote(request):
+        requests.append(await request.read())
+        return web.Response(text=RESPONSE, content_type='text/xml')
+
+    routes = [web.post('/stockquote', stockquote)]
+
+    async def func(url):
+        transport = AsyncTransport(cache=None)
+        client = AsyncClient(
+            os.path.join(WSDL_DIR, 'soap.wsdl'), transport=transport)
+        service = client.create_service(
+            '{http://example.com/stockquote.wsdl}StockQuoteBinding',
+            url + '/stockquote')
+
+        operation = service.prepare('GetLastTradePrice')
+        results = await asyncio.gather(
+            operation(tickerSymbol='foo'),
+            service.GetLastTradePrice(tickerSymbol='foo'))
+        await client.close()
+        return results
+
+    assert run_with_server(routes, func) == [120.123, 120.123]
+    assert requests[0] == requests[1]
+    assert len(requests) == 2
+    assert requests[0].startswith(b"<?xml version='1.0' encoding='utf-8'?>")
+
+
+@pytest.mark.requests
+def test_async_transport_load_document():
+    documents = {
+        '/main.wsdl': """
+            <?xml version="1.0"?>
+            <definitions xmlns="http://schemas.xmlsoap.org/wsdl/"
+                targetNamespace="http://tests.python-zeep.org/main">
+              <types>
+                <schema xmlns="http://www.w3.org/2001/XMLSchema"
+                    targetNamespace="http://tests.python-zeep.org/a">
+                  <import namespace="http://tests.python-zeep.org/b"
+                          schemaLocation="b.xsd"/>
+                </schema>
+              </types>
+            </definitions>
+        """,
+        '/b.xsd': """
+            <?xml version="1.0"?>
+            <schema xmlns="http://www.w3.org/2001/XMLSchema"
+                    targetNamespace="http://tests.python-zeep.org/b">
+              <include schemaLocation="c.xsd"/>
+            </schema>
+        """,
+        '/c.xsd': """
+            <?xml version="1.0"?>
+            <schema xmlns="http://www.w3.org/2001/XMLSchema"
+                    targetNamespace="http://tests.python-zeep.org/b">
+              <element name="foo" type="string"/>
+            </schema>
+        """,
+    }
+    requested = []
+
+    async def handler(request):
+        requested.append(request.path)
+        return web.Response(text=documents[request.path].strip())
+
+    async def func(url):
+        transport = AsyncTransport(cache=None)
+        await transport.load_document(url + '/main.wsdl')
+        await transport.close()
+        return url, transport
+
+    url, transport = run_with_server([web.get('/{name}', handler)], func)
+    assert requested == ['/main.wsdl', '/b.xsd', '/c.xsd']
+    assert sorted(transport._prefetched) == [
+        url + '/b.xsd', url + '/c.xsd', url + '/main.wsdl']
+
+
+def test_async_client_requires_async_transport():
+    with pytest.raises(TypeError):
+        AsyncClient('tests/wsdl_files/soap.wsdl', transport=object())
+
+
+def test_async_client_map_and_stream_not_supported():
+    client = AsyncClient(
+        'tests/wsdl_files/soap.wsdl', transport=AsyncTransport(cache=None))
+
+    with pytest.raises(NotImplementedError):
+        client.service.map(
+            'GetLastTradePrice', [{'tickerSymbol': 'foo'}])
+    with pytest.raises(NotImplementedError):
+        client.service.stream('GetLastTradePrice', 'foo')
+
+
+@pytest.mark.requests
+def test_async_transport_conditional_request():
+    requested = []
+
+    async def handler(request):
+        requested.append(request.headers.get('If-None-Match'))
+        if request.headers.get('If-None-Match') == '"v1"':
+            return web.Response(status=304)
+        return web.Response(text='<a/>', headers={'ETag': '"v1"'})
+
+    async def func(url):
+        transport = AsyncTransport(cache=InMemoryCache(timeout=0))
+        first = await transport.load_async(url + '/a.xsd')
+        second = await transport.load_async(url + '/a.xsd')
+        await transport.close()
+        return first, second
+
+    assert run_with_server([web.get('/{name}', handler)], func) == (
+        b'<a/>', b'<a/>')
+    assert requested == [None, '"v1"']
+
+
+@pytest.mark.requests
+def test_async_transport_compression():
+    message = b'<envelope>' + b'<item>x</item>' * 100 + b'</envelope>'
+    received = []
+
+    async def handler(request):
+        # aiohttp decompresses the request body
+        received.append((
+            request.headers.get('Content-Encoding'),
+            int(request.headers['Content-Length']),
+            await request.read()))
+        response = web.Response(body=message)
+        response.enable_compression()
+        return response
+
+    async def func(url):
+        transport = AsyncTransport(cache=None, compression='gzip')
+        response = await transport.post(url + '/', message, {})
+        await transport.close()
+        return response.content
+
+    assert run_with_server([web.post('/', handler)], func) == message
+    assert received[0][0] == 'gzip'
+    assert received[0][1] < len(message)
+    assert received[0][2] == message
+
+
+@pytest.mark.requests
+def test_async_client_timing_plugin():
+
+    async def stockquote(request):
+        return web.Response(text=RESPONSE, content_type='text/xml')
+
+    routes = [web.post('/stockquote', stockquote)]
+    timing = TimingPlugin()
+
+    async def func(url):
+        transport = AsyncTransport(cache=None)
+        client = AsyncClient(
+            os.path.join(WSDL_DIR, 'soap.wsdl'), transport=transport,
+            plugins=[timing])
+        service = client.create_service(
+            '{http://example.com/stockquote.wsdl}StockQuoteBinding',
+            url + '/stockquote')
+
+        operation = service.prepare('GetLastTradePrice')
+        results = await asyncio.gather(
+            operation(tickerSymbol='foo'),
+            service.GetLastTradePrice(tickerSymbol='foo'))
+        await client.close()
+        return results
+
+    assert run_with_server(routes, func) == [120.123, 120.123]
+    assert timing.get('GetLastTradePrice', 'http').count == 2
+    assert timing.get('GetLastTradePrice', 'deserialization').count == 2
+
+
+class XmlAsyncTransport(AsyncTransport):
+
+    def __init__(self, *args, **kwargs):
+        super(XmlAsyncTransport, self).__init__(*args, **kwargs)
+        self.envelopes = []
+
+    async def post_xml(self, address, envelope, headers):
+        self.envelopes.append(envelope)
+        return await super(XmlAsyncTransport, self).post_xml(
+            address, envelope, headers)
+
+
+@pytest.mark.requests
+def test_async_transport_post_xml_override():
+    async def stockquote(request):
+        return web.Response(text=RESPONSE, content_type='text/xml')
+
+    routes = [web.post('/stockquote', stockquote)]
+
+    async def func(url):
+        transport = XmlAsyncTransport(cache=None)
+        client = AsyncClient(
+            os.path.join(WSDL_DIR, 'soap.wsdl'), transport=transport)
+        service = client.create_service(
+            '{http://example.com/stockquote.wsdl}StockQuoteBinding',
+            url + '/stockquote')
+
+        operation = service.prepare('GetLastTradePrice')
+        results = await asyncio.gather(
+            operation(tickerSymbol='foo'),
+            service.GetLastTradePrice(tickerSymbol='foo'))
+        await client.close()
+        return results, transport.envelopes
+
+    results, envelopes = run_with_server(routes, func)
+    assert results == [120.123, 120.123]
+    assert len(envelopes) == 2
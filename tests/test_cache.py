@@ -1,4 +1,6 @@
 import datetime
+import sqlite3
+import threading
 
 import freezegun
 
@@ -25,6 +27,91 @@ def test_sqlite_cache_timeout(tmpdir):
         assert result is None
 
 
+def test_sqlite_cache_replace(tmpdir):
+    c = cache.SqliteCache(path=tmpdir.join('sqlite.cache.db').strpath)
+    c.add('http://tests.python-zeep.org/example.wsdl', b'content')
+    c.add('http://tests.python-zeep.org/example.wsdl', b'\x00new content')
+
+    result = c.get('http://tests.python-zeep.org/example.wsdl')
+    assert result == b'\x00new content'
+
+
+def test_sqlite_cache_old_table(tmpdir):
+    path = tmpdir.join('sqlite.cache.db').strpath
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE request (created timestamp, url text, content text)")
+    conn.execute(
+        "INSERT INTO request VALUES ('2016-01-01', 'http://foo', 'Zm9v')")
+    conn.commit()
+    conn.close()
+
+    c = cache.SqliteCache(path=path)
+    assert c.get('http://foo') is None
+
+    c.add('http://foo', b'content')
+    assert c.get('http://foo') == b'content'
+
+
+def test_sqlite_cache_old_version_rows(tmpdir):
+    path = tmpdir.join('sqlite.cache.db').strpath
+    c = cache.SqliteCache(path=path)
+    c.add('http://bar', b'<bar/>')
+
+    # Older versions still use the request table in the same database
+    conn = sqlite3.connect(path, detect_types=sqlite3.PARSE_DECLTYPES)
+    conn.execute(
+        """
+            CREATE TABLE IF NOT EXISTS request
+            (created timestamp, url text, content text)
+        """)
+    for url in ('http://foo', 'http://bar'):
+        conn.execute(
+            "INSERT INTO request (created, url, content) VALUES (?, ?, ?)",
+            (datetime.datetime.utcnow(), url, b'$ZEEP:1$PHNjaGVtYS8+'))
+    conn.commit()
+
+    c = cache.SqliteCache(path=path)
+    assert c.get('http://foo') is None
+    assert c.get('http://bar') == b'<bar/>'
+    assert c.get_stale('http://foo') is None
+
+    rows = conn.execute("SELECT url, content FROM request ORDER BY url")
+    assert [row[0] for row in rows] == ['http://bar', 'http://foo']
+    conn.close()
+
+
+def test_sqlite_cache_threads(tmpdir):
+    c = cache.SqliteCache(path=tmpdir.join('sqlite.cache.db').strpath)
+    connections = []
+    errors = []
+
+    def worker(num):
+        try:
+            for i in range(25):
+                url = 'http://tests.python-zeep.org/%d-%d.xsd' % (num, i)
+                c.add(url, url.encode('utf-8'))
+                c.add('http://tests.python-zeep.org/shared.xsd', b'shared')
+                assert c.get(url) == url.encode('utf-8')
+                assert c.get('http://tests.python-zeep.org/shared.xsd') == (
+                    b'shared')
+            with c.db_connection() as conn:
+                connections.append(conn)
+        except Exception as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert len(set(id(conn) for conn in connections)) == 16
+    assert c.get('http://tests.python-zeep.org/15-24.xsd') == (
+        b'http://tests.python-zeep.org/15-24.xsd')
+
+
 def test_memory_cache_timeout(tmpdir):
     c = cache.InMemoryCache()
     c.add('http://tests.python-zeep.org/example.wsdl', b'content')
@@ -38,9 +125,168 @@ def test_memory_cache_timeout(tmpdir):
 
 
 def test_memory_cache_share_data(tmpdir):
-    a = cache.InMemoryCache()
-    b = cache.InMemoryCache()
+    a = cache.InMemoryCache(shared=True)
+    b = cache.InMemoryCache(shared=True)
     a.add('http://tests.python-zeep.org/example.wsdl', b'content')
 
     result = b.get('http://tests.python-zeep.org/example.wsdl')
     assert result == b'content'
+
+
+def test_memory_cache_per_instance(tmpdir):
+    a = cache.InMemoryCache()
+    b = cache.InMemoryCache()
+    a.add('http://tests.python-zeep.org/example.wsdl', b'content')
+
+    assert b.get('http://tests.python-zeep.org/example.wsdl') is None
+    assert a.get('http://tests.python-zeep.org/example.wsdl') == b'content'
+
+
+def test_memory_cache_lru_maxentries():
+    c = cache.InMemoryCache(maxentries=2)
+    c.add('http://tests.python-zeep.org/a.xsd', b'a')
+    c.add('http://tests.python-zeep.org/b.xsd', b'b')
+    assert c.get('http://tests.python-zeep.org/a.xsd') == b'a'
+
+    c.add('http://tests.python-zeep.org/c.xsd', b'c')
+    assert len(c) == 2
+    assert c.get('http://tests.python-zeep.org/b.xsd') is None
+    assert c.get('http://tests.python-zeep.org/a.xsd') == b'a'
+    assert c.get('http://tests.python-zeep.org/c.xsd') == b'c'
+    assert (c.hits, c.misses, c.evictions) == (3, 1, 1)
+
+
+def test_memory_cache_counters_threads():
+    c = cache.InMemoryCache()
+    c.add('http://tests.python-zeep.org/a.xsd', b'a')
+
+    def worker():
+        for i in range(1000):
+            c.get('http://tests.python-zeep.org/a.xsd')
+            c.get('http://tests.python-zeep.org/b.xsd')
+
+    threads = [threading.Thread(target=worker) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert (c.hits, c.misses) == (8000, 8000)
+
+
+def test_memory_cache_lru_maxsize():
+    c = cache.InMemoryCache(maxsize=10)
+    c.add('http://tests.python-zeep.org/a.xsd', b'a' * 4)
+    c.add('http://tests.python-zeep.org/b.xsd', b'b' * 4)
+    c.add('http://tests.python-zeep.org/a.xsd', b'a' * 5)
+    assert c.size == 9
+
+    c.add('http://tests.python-zeep.org/c.xsd', b'c' * 4)
+    assert c.size == 9
+    assert c.get('http://tests.python-zeep.org/b.xsd') is None
+
+    # Contents larger than maxsize are never cached
+    c.add('http://tests.python-zeep.org/d.xsd', b'd' * 11)
+    assert c.get('http://tests.python-zeep.org/d.xsd') is None
+    assert c.size == 9
+
+
+def test_memory_cache_purge_expired():
+    c = cache.InMemoryCache(timeout=60)
+    c.add('http://tests.python-zeep.org/a.xsd', b'a')
+
+    freeze_dt = datetime.datetime.utcnow() + datetime.timedelta(seconds=120)
+    with freezegun.freeze_time(freeze_dt):
+        c.add('http://tests.python-zeep.org/b.xsd', b'b')
+        assert len(c) == 1
+        assert c.size == 1
+        assert c.evictions == 1
+        assert c.get('http://tests.python-zeep.org/b.xsd') == b'b'
+
+
+def test_sqlite_cache_validators(tmpdir):
+    c = cache.SqliteCache(path=tmpdir.join('sqlite.cache.db').strpath)
+    c.add('http://tests.python-zeep.org/a.wsdl', b'a')
+    c.add('http://tests.python-zeep.org/b.wsdl', b'b', {
+        'etag': '"v1"', 'max_age': 60})
+
+    assert c.get_stale('http://tests.python-zeep.org/a.wsdl') is None
+    assert c.get_stale('http://tests.python-zeep.org/b.wsdl') == (b'b', {
+        'etag': '"v1"', 'last_modified': None, 'max_age': 60})
+
+    # The max_age of the validators takes precedence over the timeout
+    freeze_dt = datetime.datetime.utcnow() + datetime.timedelta(seconds=120)
+    with freezegun.freeze_time(freeze_dt):
+        assert c.get('http://tests.python-zeep.org/a.wsdl') == b'a'
+        assert c.get('http://tests.python-zeep.org/b.wsdl') is None
+        assert c.get_stale('http://tests.python-zeep.org/b.wsdl')[0] == b'b'
+
+        c.touch('http://tests.python-zeep.org/b.wsdl')
+        assert c.get('http://tests.python-zeep.org/b.wsdl') == b'b'
+
+
+def test_memory_cache_validators():
+    c = cache.InMemoryCache(timeout=60)
+    c.add('http://tests.python-zeep.org/a.wsdl', b'a')
+    c.add('http://tests.python-zeep.org/b.wsdl', b'b', {'etag': '"v1"'})
+    assert c.get_stale('http://tests.python-zeep.org/a.wsdl') is None
+
+    freeze_dt = datetime.datetime.utcnow() + datetime.timedelta(seconds=120)
+    with freezegun.freeze_time(freeze_dt):
+        # Expired documents with validators are kept for revalidation
+        assert c.get('http://tests.python-zeep.org/a.wsdl') is None
+        assert c.get('http://tests.python-zeep.org/b.wsdl') is None
+        assert len(c) == 1
+        assert c.get_stale('http://tests.python-zeep.org/b.wsdl') == (
+            b'b', {'etag': '"v1"'})
+
+        c.touch('http://tests.python-zeep.org/b.wsdl', {
+            'etag': '"v1"', 'max_age': 600})
+        assert c.get('http://tests.python-zeep.org/b.wsdl') == b'b'
+
+    freeze_dt += datetime.timedelta(seconds=300)
+    with freezegun.freeze_time(freeze_dt):
+        assert c.get('http://tests.python-zeep.org/b.wsdl') == b'b'
+
+
+def test_get_validators():
+    assert cache.get_validators({
+        'ETag': '"v1"',
+        'Last-Modified': 'Sat, 01 Jul 2017 10:00:00 GMT',
+        'Cache-Control': 'public, max-age=300',
+    }) == {
+        'etag': '"v1"',
+        'last_modified': 'Sat, 01 Jul 2017 10:00:00 GMT',
+        'max_age': 300,
+    }
+    assert cache.get_validators({'Cache-Control': 'max-age=x'}) == {}
+
+
+def test_memory_cache_max_stale():
+    c = cache.InMemoryCache(timeout=60, max_stale=60)
+    c.add('http://tests.python-zeep.org/a.wsdl', b'a')
+
+    freeze_dt = datetime.datetime.utcnow() + datetime.timedelta(seconds=90)
+    with freezegun.freeze_time(freeze_dt):
+        assert c.get('http://tests.python-zeep.org/a.wsdl') is None
+        assert c.get('http://tests.python-zeep.org/a.wsdl', stale=True) == b'a'
+        assert (c.hits, c.misses, c.stale_hits) == (0, 1, 1)
+
+    freeze_dt += datetime.timedelta(seconds=60)
+    with freezegun.freeze_time(freeze_dt):
+        assert c.get('http://tests.python-zeep.org/a.wsdl', stale=True) is None
+        assert len(c) == 0
+
+
+def test_sqlite_cache_max_stale(tmpdir):
+    c = cache.SqliteCache(
+        path=tmpdir.join('sqlite.cache.db').strpath, timeout=60, max_stale=60)
+    c.add('http://tests.python-zeep.org/a.wsdl', b'a')
+
+    freeze_dt = datetime.datetime.utcnow() + datetime.timedelta(seconds=90)
+    with freezegun.freeze_time(freeze_dt):
+        assert c.get('http://tests.python-zeep.org/a.wsdl') is None
+        assert c.get('http://tests.python-zeep.org/a.wsdl', stale=True) == b'a'
+
+    freeze_dt += datetime.timedelta(seconds=60)
+    with freezegun.freeze_time(freeze_dt):
+        assert c.get('http://tests.python-zeep.org/a.wsdl', stale=True) is None
@@ -0,0 +1,112 @@
+import zipfile
+
+import requests_mock
+
+from zeep import client
+from zeep.catalog import Catalog
+from zeep.transports import Transport
+
+
+def test_add(tmpdir):
+    path = tmpdir.join('a.xsd')
+    path.write(b'<a/>', mode='wb')
+
+    catalog = Catalog()
+    catalog.add('http://tests.python-zeep.org/a.xsd', str(path))
+    assert catalog.load('http://tests.python-zeep.org/a.xsd') == b'<a/>'
+    assert catalog.load('http://tests.python-zeep.org/b.xsd') is None
+
+
+def test_add_prefix_directory(tmpdir):
+    tmpdir.mkdir('sub').join('a.xsd').write(b'<a/>', mode='wb')
+
+    catalog = Catalog({'http://tests.python-zeep.org/': str(tmpdir)})
+    assert catalog.load('http://tests.python-zeep.org/sub/a.xsd') == b'<a/>'
+    assert catalog.load('http://tests.python-zeep.org/sub/b.xsd') is None
+    assert catalog.load('http://other.python-zeep.org/sub/a.xsd') is None
+
+
+def test_add_prefix_archive(tmpdir):
+    path = str(tmpdir.join('schemas.zip'))
+    with zipfile.ZipFile(path, 'w') as archive:
+        archive.writestr('sub/a.xsd', b'<a/>')
+
+    catalog = Catalog()
+    catalog.add_prefix('http://tests.python-zeep.org/', str(tmpdir))
+    catalog.add_prefix('http://tests.python-zeep.org/sub/', path)
+    assert catalog.load('http://tests.python-zeep.org/sub/sub/a.xsd') == b'<a/>'
+    assert catalog.load('http://tests.python-zeep.org/sub/b.xsd') is None
+
+
+def test_add_prefix_directory_traversal(tmpdir):
+    tmpdir.join('secret.xml').write(b'<secret/>', mode='wb')
+    schemas = tmpdir.mkdir('schemas')
+    schemas.join('a.xsd').write(b'<a/>', mode='wb')
+
+    catalog = Catalog({'http://tests.python-zeep.org/': str(schemas)})
+    assert catalog.load('http://tests.python-zeep.org/../secret.xml') is None
+    assert catalog.load(
+        'http://tests.python-zeep.org/sub/../../secret.xml') is None
+    assert catalog.load('http://tests.python-zeep.org/sub/../a.xsd') == b'<a/>'
+
+
+def test_add_prefix_archive_traversal(tmpdir):
+    path = str(tmpdir.join('schemas.zip'))
+    with zipfile.ZipFile(path, 'w') as archive:
+        archive.writestr('a.xsd', b'<a/>')
+        archive.writestr('../secret.xml', b'<secret/>')
+
+    catalog = Catalog({'http://tests.python-zeep.org/': path})
+    assert catalog.load('http://tests.python-zeep.org/a.xsd') == b'<a/>'
+    assert catalog.load('http://tests.python-zeep.org/../secret.xml') is None
+
+
+def test_from_file(tmpdir):
+    tmpdir.mkdir('schemas').join('a.xsd').write(b'<a/>', mode='wb')
+    tmpdir.join('b.xsd').write(b'<b/>', mode='wb')
+    tmpdir.join('next.xml').write("""
+        <catalog xmlns="urn:oasis:names:tc:entity:xmlns:xml:catalog">
+          <system systemId="http://tests.python-zeep.org/b.xsd" uri="b.xsd"/>
+        </catalog>
+    """.strip())
+    tmpdir.join('catalog.xml').write("""
+        <catalog xmlns="urn:oasis:names:tc:entity:xmlns:xml:catalog">
+          <!-- Comment -->
+          <uri name="http://tests.python-zeep.org/c.xsd" uri="b.xsd"/>
+          <rewriteURI
+            uriStartString="http://tests.python-zeep.org/schemas/"
+            rewritePrefix="schemas/"/>
+          <nextCatalog catalog="next.xml"/>
+        </catalog>
+    """.strip())
+
+    catalog = Catalog.from_file(str(tmpdir.join('catalog.xml')))
+    assert catalog.load('http://tests.python-zeep.org/schemas/a.xsd') == b'<a/>'
+    assert catalog.load('http://tests.python-zeep.org/b.xsd') == b'<b/>'
+    assert catalog.load('http://tests.python-zeep.org/c.xsd') == b'<b/>'
+
+
+def test_transport_load(tmpdir):
+    tmpdir.join('a.xsd').write(b'<a/>', mode='wb')
+    transport = Transport(
+        cache=None,
+        catalog=Catalog({'http://tests.python-zeep.org/': str(tmpdir)}))
+
+    with requests_mock.mock() as m:
+        m.get('http://tests.python-zeep.org/b.xsd', text='<b/>')
+        assert transport.load('http://tests.python-zeep.org/a.xsd') == b'<a/>'
+        assert transport.load('http://tests.python-zeep.org/b.xsd') == b'<b/>'
+        assert m.call_count == 1
+
+
+def test_client(tmpdir):
+    with open('tests/wsdl_files/soap.wsdl', 'rb') as fh:
+        tmpdir.join('soap.wsdl').write(fh.read(), mode='wb')
+    transport = Transport(
+        cache=None,
+        catalog=Catalog({'http://tests.python-zeep.org/': str(tmpdir)}))
+
+    with requests_mock.mock():
+        client_obj = client.Client(
+            'http://tests.python-zeep.org/soap.wsdl', transport=transport)
+        assert client_obj.service.GetLastTradePrice
@@ -1,10 +1,18 @@
 import os
+import threading
+import time
 
 import pytest
 import requests_mock
+from lxml import etree
+from requests.adapters import HTTPAdapter
+from six import StringIO
 
 from zeep import client
 from zeep.exceptions import Error
+from zeep.plugins import Plugin
+from zeep.transports import Transport
+from zeep.wsdl.utils import SerializationPolicy
 
 
 def test_bind():
@@ -85,6 +93,125 @@ def test_service_proxy():
         assert result == 120.123
 
 
+def test_service_proxy_lazy_operations():
+    client_obj = client.Client('tests/wsdl_files/soap.wsdl', lazy=True)
+    binding = client_obj.service._binding
+    assert binding._unresolved_operations == set(['GetLastTradePrice'])
+    assert binding._operations['GetLastTradePrice'].input is not None
+    assert binding._operations['GetLastTradePrice'].abstract is None
+
+    operation = binding.get('GetLastTradePrice')
+    assert operation.abstract is not None
+    assert binding._unresolved_operations == set()
+
+
+def test_service_proxy_lazy_operations_threads():
+    client_obj = client.Client('tests/wsdl_files/soap.wsdl', lazy=True)
+    binding = client_obj.service._binding
+    operation = binding._operations['GetLastTradePrice']
+
+    calls = []
+    resolve = operation.resolve
+
+    def slow_resolve(definitions):
+        calls.append(definitions)
+        time.sleep(0.05)
+        resolve(definitions)
+
+    operation.resolve = slow_resolve
+    threads = [
+        threading.Thread(target=binding.get, args=('GetLastTradePrice',))
+        for i in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
+
+
+def test_service_proxy_prewarm():
+    client_obj = client.Client('tests/wsdl_files/soap.wsdl', lazy=True)
+    client_obj.service.prewarm(['GetLastTradePrice'])
+    assert client_obj.service._binding._unresolved_operations == set()
+
+    with pytest.raises(ValueError):
+        client_obj.service.prewarm(['Unknown'])
+
+
+@pytest.mark.requests
+def test_service_proxy_prepare():
+    client_obj = client.Client('tests/wsdl_files/soap.wsdl')
+    operation = client_obj.service.prepare('GetLastTradePrice')
+
+    response = """
+    <?xml version="1.0"?>
+    <soapenv:Envelope
+        xmlns:soapenv="http://schemas.xmlsoap.org/soap/envelope/"
+        xmlns:stoc="http://example.com/stockquote.xsd">
+       <soapenv:Body>
+          <stoc:TradePrice>
+             <price>120.123</price>
+          </stoc:TradePrice>
+       </soapenv:Body>
+    </soapenv:Envelope>
+    """.strip()
+
+    with requests_mock.mock() as m:
+        m.post('http://example.com/stockquote', text=response)
+        client_obj.service.GetLastTradePrice(
+            tickerSymbol='foobar', account={'id': 1, 'user': 'x'})
+        result = operation(
+            tickerSymbol='foobar', account={'id': 1, 'user': 'x'})
+        assert result == 120.123
+
+        expected, request = m.request_history
+        assert request.body == expected.body
+        assert request.headers['SOAPAction'] == (
+            '"http://example.com/GetLastTradePrice"')
+        assert request.headers['Content-Type'] == 'text/xml; charset=utf-8'
+
+    with pytest.raises(ValueError):
+        operation(tickerSymbol='foobar', _soapheaders=[])
+    with pytest.raises(ValueError):
+        client_obj.service.prepare('Unknown')
+
+
+@pytest.mark.requests
+def test_serialization_policy():
+    policy = SerializationPolicy(pretty_print=True, encoding='iso-8859-1')
+    client_obj = client.Client(
+        'tests/wsdl_files/soap.wsdl',
+        transport=Transport(cache=None, serialization=policy))
+    operation = client_obj.service.prepare('GetLastTradePrice')
+
+    response = """
+    <?xml version="1.0"?>
+    <soapenv:Envelope
+        xmlns:soapenv="http://schemas.xmlsoap.org/soap/envelope/"
+        xmlns:stoc="http://example.com/stockquote.xsd">
+       <soapenv:Body>
+          <stoc:TradePrice>
+             <price>120.123</price>
+          </stoc:TradePrice>
+       </soapenv:Body>
+    </soapenv:Envelope>
+    """.strip()
+
+    with requests_mock.mock() as m:
+        m.post('http://example.com/stockquote', text=response)
+        client_obj.service.GetLastTradePrice(tickerSymbol=u'caf\xe9')
+        operation(tickerSymbol=u'caf\xe9')
+
+        for request in m.request_history:
+            assert request.headers['Content-Type'] == (
+                'text/xml; charset=iso-8859-1')
+            assert request.body.startswith(
+                b"<?xml version='1.0' encoding='iso-8859-1'?>\n")
+            assert b'<tickerSymbol>caf\xe9</tickerSymbol>' in request.body
+        assert m.request_history[0].body == m.request_history[1].body
+
+
 @pytest.mark.requests
 def test_call_method_fault():
     obj = client.Client('tests/wsdl_files/soap.wsdl')
@@ -117,3 +244,409 @@ def test_call_method_fault():
         m.post('http://example.com/stockquote', text=response, status_code=500)
         with pytest.raises(Error):
             obj.service.GetLastTradePrice(tickerSymbol='foobar')
+
+
+@pytest.mark.requests
+def test_service_proxy_map():
+    client_obj = client.Client('tests/wsdl_files/soap.wsdl')
+
+    response = """
+    <?xml version="1.0"?>
+    <soapenv:Envelope
+        xmlns:soapenv="http://schemas.xmlsoap.org/soap/envelope/"
+        xmlns:stoc="http://example.com/stockquote.xsd">
+       <soapenv:Header/>
+       <soapenv:Body>
+          <stoc:TradePrice>
+             <price>%s</price>
+          </stoc:TradePrice>
+       </soapenv:Body>
+    </soapenv:Envelope>
+    """.strip()
+
+    def callback(request, context):
+        if b'error' in request.body:
+            context.status_code = 500
+            return ''
+        price = request.body.split(b'<tickerSymbol>')[1].split(b'<')[0]
+        return response % price.decode('utf-8')
+
+    kwargs_list = [{'tickerSymbol': str(i)} for i in range(20)]
+    kwargs_list[3] = {'tickerSymbol': 'error'}
+    kwargs_list[5] = {'unknown': 'foobar'}
+
+    with requests_mock.mock() as m:
+        m.post('http://example.com/stockquote', text=callback)
+        batch = client_obj.service.map(
+            'GetLastTradePrice', kwargs_list, concurrency=4)
+        results = list(batch)
+
+    assert [result.index for result in results] == list(range(20))
+    assert results[0].value == 0
+    assert results[19].value == 19
+    assert results[3].value is None
+    assert isinstance(results[3].error, Error)
+    assert isinstance(results[5].error, TypeError)
+    assert m.call_count == 19
+
+    assert batch.stats.count == 20
+    assert batch.stats.errors == 2
+    assert batch.stats.throughput > 0
+    assert batch.stats.max_time >= batch.stats.mean_time
+
+
+@pytest.mark.requests
+def test_service_proxy_map_unordered():
+    client_obj = client.Client('tests/wsdl_files/soap.wsdl')
+
+    with requests_mock.mock() as m:
+        m.post('http://example.com/stockquote', text='', status_code=500)
+        batch = client_obj.service.map(
+            'GetLastTradePrice', [{'tickerSymbol': 'foo'}] * 10,
+            concurrency=3, ordered=False)
+        results = list(batch)
+
+    assert sorted(result.index for result in results) == list(range(10))
+    assert all(isinstance(result.error, Error) for result in results)
+    assert batch.stats.errors == 10
+
+
+@pytest.mark.requests
+def test_service_proxy_map_pool_size():
+    transport = Transport(cache=None)
+    client_obj = client.Client(
+        'tests/wsdl_files/soap.wsdl', transport=transport)
+    address = 'http://example.com/stockquote'
+
+    with requests_mock.mock() as m:
+        m.post(address, text='', status_code=500)
+        list(client_obj.service.map(
+            'GetLastTradePrice', [{'tickerSymbol': 'foo'}] * 12,
+            concurrency=4))
+    assert transport.session.adapters['http://']._pool_maxsize == 10
+    assert 'http://example.com' not in transport.session.adapters
+
+    with requests_mock.mock() as m:
+        m.post(address, text='', status_code=500)
+        list(client_obj.service.map(
+            'GetLastTradePrice', [{'tickerSymbol': 'foo'}] * 12,
+            concurrency=12))
+    adapter = transport.session.adapters['http://example.com']
+    assert adapter._pool_maxsize == 12
+    assert transport.session.get_adapter(address) is adapter
+
+
+@pytest.mark.requests
+def test_service_proxy_map_custom_adapter():
+    class CustomAdapter(HTTPAdapter):
+        pass
+
+    transport = Transport(cache=None)
+    adapter = CustomAdapter()
+    transport.session.mount('http://', adapter)
+    client_obj = client.Client(
+        'tests/wsdl_files/soap.wsdl', transport=transport)
+
+    with requests_mock.mock() as m:
+        m.post('http://example.com/stockquote', text='', status_code=500)
+        list(client_obj.service.map(
+            'GetLastTradePrice', [{'tickerSymbol': 'foo'}] * 12,
+            concurrency=12))
+    assert transport.session.get_adapter(
+        'http://example.com/stockquote') is adapter
+
+
+def test_service_proxy_map_unknown_operation():
+    client_obj = client.Client('tests/wsdl_files/soap.wsdl')
+    with pytest.raises(ValueError):
+        client_obj.service.map('Unknown', [{}])
+
+
+STREAM_WSDL = """
+<?xml version="1.0"?>
+<definitions xmlns="http://schemas.xmlsoap.org/wsdl/"
+             xmlns:soap="http://schemas.xmlsoap.org/wsdl/soap/"
+             xmlns:tns="http://tests.python-zeep.org/"
+             targetNamespace="http://tests.python-zeep.org/">
+  <types>
+    <schema xmlns="http://www.w3.org/2001/XMLSchema"
+            xmlns:tns="http://tests.python-zeep.org/"
+            targetNamespace="http://tests.python-zeep.org/"
+            elementFormDefault="qualified">
+      <element name="GetReport" type="string"/>
+      <element name="PutReport">
+        <complexType>
+          <sequence>
+            <element name="record" type="string" maxOccurs="unbounded"/>
+          </sequence>
+        </complexType>
+      </element>
+      <element name="GetReportResponse">
+        <complexType>
+          <sequence>
+            <element name="records">
+              <complexType>
+                <sequence>
+                  <element name="record" maxOccurs="unbounded">
+                    <complexType>
+                      <sequence>
+                        <element name="id" type="int"/>
+                        <element name="name" type="string"/>
+                      </sequence>
+                    </complexType>
+                  </element>
+                </sequence>
+              </complexType>
+            </element>
+          </sequence>
+        </complexType>
+      </element>
+    </schema>
+  </types>
+  <message name="GetReportInput">
+    <part name="body" element="tns:GetReport"/>
+  </message>
+  <message name="GetReportOutput">
+    <part name="body" element="tns:GetReportResponse"/>
+  </message>
+  <message name="PutReportInput">
+    <part name="body" element="tns:PutReport"/>
+  </message>
+  <message name="PutReportOutput">
+    <part name="body" element="tns:GetReportResponse"/>
+  </message>
+  <portType name="ReportPortType">
+    <operation name="GetReport">
+      <input message="tns:GetReportInput"/>
+      <output message="tns:GetReportOutput"/>
+    </operation>
+    <operation name="PutReport">
+      <input message="tns:PutReportInput"/>
+      <output message="tns:PutReportOutput"/>
+    </operation>
+  </portType>
+  <binding name="ReportBinding" type="tns:ReportPortType">
+    <soap:binding style="document"
+                  transport="http://schemas.xmlsoap.org/soap/http"/>
+    <operation name="GetReport">
+      <soap:operation soapAction="http://tests.python-zeep.org/GetReport"/>
+      <input>
+        <soap:body use="literal"/>
+      </input>
+      <output>
+        <soap:body use="literal"/>
+      </output>
+    </operation>
+    <operation name="PutReport">
+      <soap:operation soapAction="http://tests.python-zeep.org/PutReport"/>
+      <input>
+        <soap:body use="literal"/>
+      </input>
+      <output>
+        <soap:body use="literal"/>
+      </output>
+    </operation>
+  </binding>
+  <service name="ReportService">
+    <port name="ReportPort" binding="tns:ReportBinding">
+      <soap:address location="http://tests.python-zeep.org/report"/>
+    </port>
+  </service>
+</definitions>
+""".strip()
+
+
+@pytest.mark.requests
+def test_service_proxy_stream():
+    client_obj = client.Client(StringIO(STREAM_WSDL))
+
+    records = ''.join(
+        '<tns:record><tns:id>%d</tns:id><tns:name>item %d</tns:name>'
+        '</tns:record>' % (i, i) for i in range(100))
+    response = """
+    <?xml version="1.0"?>
+    <soapenv:Envelope
+        xmlns:soapenv="http://schemas.xmlsoap.org/soap/envelope/"
+        xmlns:tns="http://tests.python-zeep.org/">
+       <soapenv:Body>
+          <tns:GetReportResponse>
+            <tns:records>%s</tns:records>
+          </tns:GetReportResponse>
+       </soapenv:Body>
+    </soapenv:Envelope>
+    """.strip() % records
+
+    with requests_mock.mock() as m:
+        m.post('http://tests.python-zeep.org/report', text=response)
+        result = client_obj.service.stream('GetReport', 'foo')
+        first = next(result)
+        assert first.id == 0
+        assert first.name == 'item 0'
+
+        items = list(result)
+        assert len(items) == 99
+        assert items[-1].id == 99
+
+
+@pytest.mark.requests
+def test_service_proxy_stream_fault():
+    client_obj = client.Client(StringIO(STREAM_WSDL))
+
+    response = """
+    <?xml version="1.0"?>
+    <soapenv:Envelope
+        xmlns:soapenv="http://schemas.xmlsoap.org/soap/envelope/">
+       <soapenv:Body>
+          <soapenv:Fault>
+            <faultcode>soapenv:Server</faultcode>
+            <faultstring>Big fatal error!!</faultstring>
+          </soapenv:Fault>
+       </soapenv:Body>
+    </soapenv:Envelope>
+    """.strip()
+
+    with requests_mock.mock() as m:
+        m.post('http://tests.python-zeep.org/report', text=response)
+        with pytest.raises(Error):
+            list(client_obj.service.stream('GetReport', 'foo'))
+
+        m.post(
+            'http://tests.python-zeep.org/report', text=response,
+            status_code=500)
+        with pytest.raises(Error):
+            list(client_obj.service.stream('GetReport', 'foo'))
+
+
+def test_service_proxy_stream_no_repeated_element():
+    client_obj = client.Client('tests/wsdl_files/soap.wsdl')
+    with pytest.raises(ValueError):
+        client_obj.service.stream('GetLastTradePrice', 'foobar')
+
+
+@pytest.mark.requests
+def test_call_method_generator_argument():
+    client_obj = client.Client(StringIO(STREAM_WSDL))
+
+    response = """
+    <?xml version="1.0"?>
+    <soapenv:Envelope
+        xmlns:soapenv="http://schemas.xmlsoap.org/soap/envelope/"
+        xmlns:tns="http://tests.python-zeep.org/">
+       <soapenv:Body>
+          <tns:GetReportResponse>
+            <tns:records>
+              <tns:record><tns:id>1</tns:id><tns:name>ok</tns:name></tns:record>
+            </tns:records>
+          </tns:GetReportResponse>
+       </soapenv:Body>
+    </soapenv:Envelope>
+    """.strip()
+
+    consumed = []
+
+    def records():
+        for i in range(1000):
+            consumed.append(i)
+            yield 'record %d' % i
+
+    with requests_mock.mock() as m:
+        m.post('http://tests.python-zeep.org/report', text=response)
+        result = client_obj.service.PutReport(record=records())
+        assert result.record[0].name == 'ok'
+
+        # The records are rendered while the body is sent
+        assert consumed == []
+        request = m.request_history[0]
+        assert request.headers['Transfer-Encoding'] == 'chunked'
+        body = b''.join(request.body)
+
+    assert len(consumed) == 1000
+    doc = etree.fromstring(body)
+    records = doc.findall(
+        '{http://schemas.xmlsoap.org/soap/envelope/}Body/'
+        '{http://tests.python-zeep.org/}PutReport/'
+        '{http://tests.python-zeep.org/}record')
+    assert [node.text for node in records] == [
+        'record %d' % i for i in range(1000)]
+    assert body.count(b'xmlns') == 2
+
+
+@pytest.mark.requests
+def test_call_method_generator_argument_default_namespace_header():
+    client_obj = client.Client(StringIO(STREAM_WSDL))
+    header = etree.fromstring(
+        '<Auth xmlns="urn:h"><!-- note -->tail<user>x</user></Auth>')
+
+    response = """
+    <?xml version="1.0"?>
+    <soapenv:Envelope
+        xmlns:soapenv="http://schemas.xmlsoap.org/soap/envelope/"
+        xmlns:tns="http://tests.python-zeep.org/">
+       <soapenv:Body>
+          <tns:GetReportResponse/>
+       </soapenv:Body>
+    </soapenv:Envelope>
+    """.strip()
+
+    with requests_mock.mock() as m:
+        m.post('http://tests.python-zeep.org/report', text=response)
+        client_obj.service.PutReport(
+            record=('record %d' % i for i in range(3)),
+            _soapheaders=[header])
+        body = b''.join(m.request_history[0].body)
+
+    doc = etree.fromstring(body)
+    auth = doc.find(
+        '{http://schemas.xmlsoap.org/soap/envelope/}Header/{urn:h}Auth')
+    assert auth.find('{urn:h}user').text == 'x'
+    # The comment is not written, its tail is
+    assert auth.text == 'tail'
+    records = doc.findall('.//{http://tests.python-zeep.org/}record')
+    assert len(records) == 3
+
+
+class RecordCountPlugin(Plugin):
+
+    def egress(self, envelope, http_headers, operation, binding_options):
+        records = envelope.findall('.//{http://tests.python-zeep.org/}record')
+        http_headers['X-Records'] = str(len(records))
+        return envelope, http_headers
+
+
+def test_call_method_generator_argument_egress_plugin():
+    client_obj = client.Client(
+        StringIO(STREAM_WSDL), plugins=[RecordCountPlugin()])
+
+    response = """
+    <?xml version="1.0"?>
+    <soapenv:Envelope
+        xmlns:soapenv="http://schemas.xmlsoap.org/soap/envelope/"
+        xmlns:tns="http://tests.python-zeep.org/">
+       <soapenv:Body>
+          <tns:GetReportResponse/>
+       </soapenv:Body>
+    </soapenv:Envelope>
+    """.strip()
+
+    with requests_mock.mock() as m:
+        m.post('http://tests.python-zeep.org/report', text=response)
+        client_obj.service.PutReport(
+            record=('record %d' % i for i in range(3)))
+        request = m.request_history[0]
+
+    # The egress hook gets the rendered items, not the deferred values
+    assert request.headers['X-Records'] == '3'
+    doc = etree.fromstring(request.body)
+    records = doc.findall('.//{http://tests.python-zeep.org/}record')
+    assert [node.text for node in records] == [
+        'record 0', 'record 1', 'record 2']
+
+
+def test_create_message_generator_argument():
+    client_obj = client.Client(StringIO(STREAM_WSDL))
+    envelope = client_obj.service._binding.create_message(
+        'PutReport', record=('record %d' % i for i in range(3)))
+
+    records = envelope.findall('.//{http://tests.python-zeep.org/}record')
+    assert [node.text for node in records] == [
+        'record 0', 'record 1', 'record 2']
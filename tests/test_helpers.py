@@ -1,8 +1,11 @@
+import gc
+import weakref
+
 from lxml import etree
 
 from tests.utils import load_xml
 from zeep import xsd
-from zeep.helpers import serialize_object
+from zeep.helpers import serialize_columns, serialize_object, serialize_rows
 
 
 def test_serialize_simple():
@@ -110,3 +113,87 @@ def test_nested_complex_types():
     assert isinstance(result, dict), type(result)
     assert isinstance(result['item'], dict), type(result['item'])
     assert result['item']['item_1'] == 'foo'
+
+
+def _create_order_type():
+    return xsd.ComplexType(
+        xsd.Sequence([
+            xsd.Element('id', xsd.Integer()),
+            xsd.Element(
+                'customer',
+                xsd.ComplexType(
+                    xsd.Sequence([
+                        xsd.Element('name', xsd.String()),
+                        xsd.Element('city', xsd.String()),
+                    ])
+                )),
+            xsd.Element('tag', xsd.String(), max_occurs='unbounded'),
+        ]))
+
+
+def test_serialize_object_target_cls():
+    order_type = _create_order_type()
+    obj = order_type(id=1, customer={'name': 'foo', 'city': 'bar'})
+
+    result = serialize_object([obj], dict)
+    assert type(result[0]) is dict
+    assert type(result[0]['customer']) is dict
+    assert result == [
+        {'id': 1, 'customer': {'name': 'foo', 'city': 'bar'}, 'tag': []}
+    ]
+
+
+def test_serialize_rows():
+    order_type = _create_order_type()
+    customer_type = order_type.elements[1][1].type
+    objects = [
+        order_type(
+            id=1, customer=customer_type(name='foo', city='bar'), tag=['x']),
+        order_type(id=2, customer=customer_type(name='foo2', city='bar2')),
+    ]
+
+    rows = serialize_rows(objects)
+    assert rows[0].id == 1
+    assert rows[0].customer.name == 'foo'
+    assert rows[0].tag == ['x']
+    assert rows[1] == (2, ('foo2', 'bar2'), [])
+    assert isinstance(rows[1], rows[0].__class__)
+
+
+def test_serialize_columns():
+    order_type = _create_order_type()
+    customer_type = order_type.elements[1][1].type
+    objects = [
+        order_type(
+            id=1, customer=customer_type(name='foo', city='bar'), tag=['x']),
+        order_type(id=2, customer=None),
+    ]
+
+    result = serialize_columns(iter(objects))
+    assert list(result) == ['id', 'customer.name', 'customer.city', 'tag']
+    assert result == {
+        'id': [1, 2],
+        'customer.name': ['foo', None],
+        'customer.city': ['bar', None],
+        'tag': [['x'], []],
+    }
+
+    result = serialize_columns(objects, flatten=False)
+    assert result == {
+        'id': [1, 2],
+        'customer': [{'name': 'foo', 'city': 'bar'}, None],
+        'tag': [['x'], []],
+    }
+
+
+def test_serialize_caches_released():
+    order_type = _create_order_type()
+    obj = order_type(id=1, customer={'name': 'foo', 'city': 'bar'})
+    serialize_rows([obj])
+    serialize_columns([obj])
+
+    # The cached data doesn't keep the value classes (and the schema) alive
+    value_class = weakref.ref(obj.__class__)
+    del order_type, obj
+    gc.collect()
+    assert value_class() is None
@@ -0,0 +1,105 @@
+import logging
+
+import pytest
+from pretend import stub
+
+from zeep.loggers import PayloadLogger
+
+
+class ListHandler(logging.Handler):
+
+    def __init__(self):
+        logging.Handler.__init__(self)
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+@pytest.fixture
+def records(request):
+    """Collect the records of the zeep.transports logger, DEBUG is enabled"""
+    logger = logging.getLogger('zeep.transports')
+    handler = ListHandler()
+    level = logger.level
+    logger.addHandler(handler)
+    logger.setLevel(logging.DEBUG)
+
+    def fin():
+        logger.removeHandler(handler)
+        logger.setLevel(level)
+    request.addfinalizer(fin)
+    return handler.records
+
+
+def test_disabled(records):
+    logging.getLogger('zeep.transports').setLevel(logging.INFO)
+    payload_logger = PayloadLogger()
+    chunks = iter([b'<a/>'])
+
+    assert payload_logger.log_request('http://x', chunks) is chunks
+
+    # The content is not read
+    response = stub(status_code=200)
+    payload_logger.log_response('http://x', response)
+    assert records == []
+
+
+def test_log_request(records):
+    payload_logger = PayloadLogger(max_length=10)
+
+    message = b'<envelope>\xc3\xa9</envelope>'
+    assert payload_logger.log_request('http://x', message) is message
+    assert records[0].getMessage() == (
+        u'HTTP Post to http://x:\n<envelope>\n[truncated, 10 of 23 bytes]')
+
+    assert payload_logger.log_request('http://x', b'<a/>') == b'<a/>'
+    assert records[1].getMessage() == u'HTTP Post to http://x:\n<a/>'
+
+
+def test_log_request_chunks(records):
+    payload_logger = PayloadLogger(max_length=10)
+    chunks = [b'<envelope>', b'<item/>', b'</envelope>']
+
+    result = payload_logger.log_request('http://x', iter(chunks))
+    assert records == []
+    assert list(result) == chunks
+    assert records[0].getMessage() == (
+        u'HTTP Post to http://x (streamed):\n' +
+        u'<envelope>\n[truncated, 10 of 28 bytes]')
+
+
+def test_log_response(records):
+    payload_logger = PayloadLogger(max_length=None)
+
+    response = stub(status_code=200, content=b'<envelope/>')
+    payload_logger.log_response('http://x', response)
+    payload_logger.log_response('http://x', stub(status_code=500), True)
+    assert [record.getMessage() for record in records] == [
+        u'HTTP Response from http://x (status: 200):\n<envelope/>',
+        u'HTTP Response from http://x (status: 500, streaming)',
+    ]
+
+
+def test_log_encoding(records):
+    payload_logger = PayloadLogger(max_length=None)
+    message = u'<a>\xe9</a>'.encode('iso-8859-1')
+
+    payload_logger.log_request('http://x', message, encoding='iso-8859-1')
+    payload_logger.log_request('http://x', message, encoding='unknown')
+    list(payload_logger.log_request(
+        'http://x', iter([message]), encoding='iso-8859-1'))
+    payload_logger.log_response('http://x', stub(
+        status_code=200, content=message,
+        headers={'Content-Type': 'text/xml; charset="ISO-8859-1"'}))
+    payload_logger.log_response('http://x', stub(
+        status_code=200, content=u'<a>\xe9</a>'.encode('utf-8'),
+        headers={'Content-Type': 'text/xml'}))
+
+    assert [record.getMessage() for record in records] == [
+        u'HTTP Post to http://x:\n<a>\xe9</a>',
+        u'HTTP Post to http://x:\n<a>\ufffd</a>',
+        u'HTTP Post to http://x (streamed):\n<a>\xe9</a>',
+        u'HTTP Response from http://x (status: 200):\n<a>\xe9</a>',
+        u'HTTP Response from http://x (status: 200):\n<a>\xe9</a>',
+    ]
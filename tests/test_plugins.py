@@ -0,0 +1,215 @@
+import pytest
+import requests_mock
+from lxml import etree
+from pretend import stub
+
+from zeep import client
+from zeep.exceptions import TransportError
+from zeep.plugins import Histogram, Plugin, TimingPlugin
+from zeep.transports import Transport
+
+RESPONSE = """
+<?xml version="1.0"?>
+<soapenv:Envelope
+    xmlns:soapenv="http://schemas.xmlsoap.org/soap/envelope/"
+    xmlns:stoc="http://example.com/stockquote.xsd">
+   <soapenv:Body>
+      <stoc:TradePrice>
+         <price>120.123</price>
+      </stoc:TradePrice>
+   </soapenv:Body>
+</soapenv:Envelope>
+""".strip()
+
+
+class RecordingPlugin(Plugin):
+
+    def __init__(self):
+        self.calls = []
+
+    def egress(self, envelope, http_headers, operation, binding_options):
+        self.calls.append(('egress', operation.name, binding_options))
+        http_headers['X-Egress'] = 'yes'
+        return envelope, http_headers
+
+    def egress_raw(self, message, http_headers, operation):
+        self.calls.append(('egress_raw', operation.name))
+        return message.replace(b'foobar', b'FOOBAR'), http_headers
+
+    def ingress_raw(self, content, http_headers, operation):
+        self.calls.append(('ingress_raw', operation.name))
+        return content.replace(b'120.123', b'100.5'), http_headers
+
+    def ingress(self, envelope, http_headers, operation):
+        self.calls.append(('ingress', operation.name))
+        price = envelope.find('.//price')
+        price.text = str(float(price.text) * 2)
+        return envelope, http_headers
+
+
+def _create_client(*plugins):
+    return client.Client(
+        'tests/wsdl_files/soap.wsdl', transport=Transport(cache=None),
+        plugins=list(plugins))
+
+
+@pytest.mark.requests
+def test_plugin_hooks():
+    plugin = RecordingPlugin()
+    client_obj = _create_client(plugin, Plugin())
+
+    with requests_mock.mock() as m:
+        m.post('http://example.com/stockquote', text=RESPONSE)
+        result = client_obj.service.GetLastTradePrice(tickerSymbol='foobar')
+        assert result == 201.0
+
+        request = m.request_history[0]
+        assert request.headers['X-Egress'] == 'yes'
+        assert b'FOOBAR' in request.body
+
+    assert plugin.calls == [
+        ('egress', 'GetLastTradePrice',
+         {'address': 'http://example.com/stockquote'}),
+        ('egress_raw', 'GetLastTradePrice'),
+        ('ingress_raw', 'GetLastTradePrice'),
+        ('ingress', 'GetLastTradePrice'),
+    ]
+
+
+@pytest.mark.requests
+def test_plugin_hooks_prepared():
+    plugin = RecordingPlugin()
+    client_obj = _create_client(plugin)
+    operation = client_obj.service.prepare('GetLastTradePrice')
+
+    # The egress hook requires the envelope tree, so the prepared operation
+    # uses the normal call.
+    with requests_mock.mock() as m:
+        m.post('http://example.com/stockquote', text=RESPONSE)
+        assert operation(tickerSymbol='foobar') == 201.0
+        assert m.request_history[0].headers['X-Egress'] == 'yes'
+    assert [call[0] for call in plugin.calls] == [
+        'egress', 'egress_raw', 'ingress_raw', 'ingress']
+
+
+@pytest.mark.requests
+def test_timing_plugin():
+    timing = TimingPlugin()
+    client_obj = _create_client(timing)
+    operation = client_obj.service.prepare('GetLastTradePrice')
+
+    with requests_mock.mock() as m:
+        m.post('http://example.com/stockquote', text=RESPONSE)
+        assert client_obj.service.GetLastTradePrice(
+            tickerSymbol='foobar') == 120.123
+        assert operation(tickerSymbol='foobar') == 120.123
+
+    snapshot = timing.snapshot()
+    assert list(snapshot) == ['GetLastTradePrice']
+    assert set(snapshot['GetLastTradePrice']) == set([
+        'serialization', 'plugins', 'http', 'parsing', 'deserialization'])
+    for histogram in snapshot['GetLastTradePrice'].values():
+        assert histogram.count == 2
+        assert histogram.sum >= 0
+
+    http = timing.get('GetLastTradePrice', 'http')
+    assert http.count == 2
+    assert timing.get('GetLastTradePrice', 'wsse') is None
+
+    timing.reset()
+    assert timing.snapshot() == {}
+
+
+@pytest.mark.requests
+def test_timing_plugin_fault():
+    timing = TimingPlugin()
+    client_obj = _create_client(timing)
+
+    with requests_mock.mock() as m:
+        m.post('http://example.com/stockquote', text='error', status_code=500)
+        with pytest.raises(TransportError):
+            client_obj.service.GetLastTradePrice(tickerSymbol='foobar')
+
+    http = timing.get('GetLastTradePrice', 'http')
+    assert http.count == 1
+    assert timing.get('GetLastTradePrice', 'deserialization') is None
+
+
+@pytest.mark.requests
+def test_timing_plugin_map():
+    timing = TimingPlugin()
+    client_obj = _create_client(timing)
+
+    with requests_mock.mock() as m:
+        m.post('http://example.com/stockquote', text=RESPONSE)
+        results = list(client_obj.service.map(
+            'GetLastTradePrice', [{'tickerSymbol': 'foobar'}] * 3))
+    assert [result.value for result in results] == [120.123] * 3
+    assert timing.get('GetLastTradePrice', 'http').count == 3
+    assert timing.get('GetLastTradePrice', 'serialization').count == 3
+
+
+class XmlTransport(Transport):
+
+    def __init__(self, *args, **kwargs):
+        super(XmlTransport, self).__init__(*args, **kwargs)
+        self.envelopes = []
+
+    def post_xml(self, address, envelope, headers, stream=False):
+        self.envelopes.append(envelope)
+        envelope.find('.//tickerSymbol').text = 'custom'
+        return super(XmlTransport, self).post_xml(
+            address, envelope, headers, stream)
+
+
+@pytest.mark.requests
+def test_transport_post_xml_override():
+    plugin = RecordingPlugin()
+    transport = XmlTransport(cache=None)
+    client_obj = client.Client(
+        'tests/wsdl_files/soap.wsdl', transport=transport, plugins=[plugin])
+    operation = client_obj.service.prepare('GetLastTradePrice')
+
+    with requests_mock.mock() as m:
+        m.post('http://example.com/stockquote', text=RESPONSE)
+        client_obj.service.GetLastTradePrice(tickerSymbol='foobar')
+        operation(tickerSymbol='foobar')
+        for request in m.request_history:
+            assert b'custom' in request.body
+
+    assert len(transport.envelopes) == 2
+    assert all(
+        isinstance(envelope, etree._Element)
+        for envelope in transport.envelopes)
+    assert 'egress_raw' not in [call[0] for call in plugin.calls]
+
+
+def test_histogram():
+    histogram = Histogram([0.1, 1.0])
+    for value in [0.05, 0.1, 0.5, 2.0]:
+        histogram.observe(value)
+
+    assert histogram.counts == [2, 1, 1]
+    assert histogram.count == 4
+    assert abs(histogram.sum - 2.65) < 1e-9
+    assert abs(histogram.mean - 0.6625) < 1e-9
+    assert histogram.percentile(50) == 0.1
+    assert histogram.percentile(75) == 1.0
+    assert histogram.percentile(100) is None
+
+
+def test_prometheus():
+    timing = TimingPlugin(buckets=[0.5, 0.1])
+    operation = stub(name='Get"Price')
+    timing.timings(operation, {'http': 0.2})
+    timing.timings(operation, {'http': 0.05})
+
+    assert timing.prometheus('soap_seconds') == '\n'.join([
+        '# HELP soap_seconds Time spent in the phases of the operation calls',
+        '# TYPE soap_seconds histogram',
+        'soap_seconds_bucket{operation="Get\\"Price",phase="http",le="0.1"} 1',
+        'soap_seconds_bucket{operation="Get\\"Price",phase="http",le="0.5"} 2',
+        'soap_seconds_bucket{operation="Get\\"Price",phase="http",le="+Inf"} 2',
+        'soap_seconds_sum{operation="Get\\"Price",phase="http"} 0.25',
+        'soap_seconds_count{operation="Get\\"Price",phase="http"} 2',
+    ]) + '\n'
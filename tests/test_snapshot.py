@@ -0,0 +1,146 @@
+import pytest
+import requests_mock
+from six import StringIO
+
+from tests.utils import DummyTransport, load_xml
+from zeep import client, snapshot, wsdl
+from zeep.transports import Transport
+from zeep.xsd.registry import SchemaRegistry
+
+
+def test_snapshot_store_load(tmpdir):
+    store = snapshot.SnapshotStore(path=tmpdir.strpath)
+    transport = Transport(cache=None)
+
+    document = store.load('tests/wsdl_files/soap.wsdl', transport)
+    assert len(tmpdir.listdir()) == 1
+
+    content = transport.load('tests/wsdl_files/soap.wsdl')
+    result = store.get('tests/wsdl_files/soap.wsdl', content, transport)
+    assert result is not document
+    assert result.transport is transport
+    assert list(result.services) == list(document.services)
+    assert result.types._prefix_map == document.types._prefix_map
+
+
+def test_snapshot_store_load_once(tmpdir):
+    store = snapshot.SnapshotStore(path=tmpdir.strpath)
+    transport = Transport(cache=None)
+    locations = []
+    load = transport.load
+
+    def counting_load(url):
+        locations.append(url)
+        return load(url)
+
+    transport.load = counting_load
+    store.load('tests/wsdl_files/soap.wsdl', transport)
+    assert locations == ['tests/wsdl_files/soap.wsdl']
+
+    del locations[:]
+    store.load('tests/wsdl_files/soap.wsdl', transport)
+    assert locations == ['tests/wsdl_files/soap.wsdl']
+
+
+def test_snapshot_store_content_changed(tmpdir):
+    store = snapshot.SnapshotStore(path=tmpdir.strpath)
+    transport = Transport(cache=None)
+    store.load('tests/wsdl_files/soap.wsdl', transport)
+
+    result = store.get('tests/wsdl_files/soap.wsdl', b'<changed/>', transport)
+    assert result is None
+
+
+def test_snapshot_dynamic_types():
+    transport = DummyTransport()
+    transport.bind('http://tests.python-zeep.org/schema.xsd', load_xml("""
+        <xsd:schema
+            xmlns:xsd="http://www.w3.org/2001/XMLSchema"
+            xmlns:tns="http://tests.python-zeep.org/"
+            targetNamespace="http://tests.python-zeep.org/"
+            elementFormDefault="qualified">
+          <xsd:simpleType name="code">
+            <xsd:restriction base="xsd:string"/>
+          </xsd:simpleType>
+          <xsd:element name="container">
+            <xsd:complexType>
+              <xsd:sequence>
+                <xsd:element name="code" type="tns:code"/>
+              </xsd:sequence>
+            </xsd:complexType>
+          </xsd:element>
+        </xsd:schema>
+    """))
+    content = StringIO("""
+        <wsdl:definitions
+            xmlns:wsdl="http://schemas.xmlsoap.org/wsdl/"
+            xmlns:xsd="http://www.w3.org/2001/XMLSchema"
+            targetNamespace="http://tests.python-zeep.org/wsdl">
+          <wsdl:types>
+            <xsd:schema targetNamespace="http://tests.python-zeep.org/wsdl">
+              <xsd:import
+                namespace="http://tests.python-zeep.org/"
+                schemaLocation="http://tests.python-zeep.org/schema.xsd"/>
+            </xsd:schema>
+          </wsdl:types>
+        </wsdl:definitions>
+    """.strip())
+    document = wsdl.Document(content, transport)
+    element = document.types.get_element(
+        '{http://tests.python-zeep.org/}container')
+    element(code='foo')
+
+    data = snapshot.dumps(document, transport)
+    result = snapshot.loads(data, transport)
+
+    element = result.types.get_element(
+        '{http://tests.python-zeep.org/}container')
+    assert element.type.__module__ == 'zeep.xsd.dynamic_types'
+    obj = element(code='foo')
+    assert obj.code == 'foo'
+
+    node = load_xml("""
+        <container xmlns="http://tests.python-zeep.org/">
+          <code>bar</code>
+        </container>
+    """)
+    assert element.parse(node, result.types).code == 'bar'
+
+
+def test_client_snapshot_store_unsupported_options(tmpdir):
+    store = snapshot.SnapshotStore(path=tmpdir.strpath)
+    with pytest.raises(ValueError):
+        client.Client(
+            'tests/wsdl_files/soap.wsdl', snapshot_store=store, lazy=True)
+    with pytest.raises(ValueError):
+        client.Client(
+            'tests/wsdl_files/soap.wsdl', snapshot_store=store,
+            schema_registry=SchemaRegistry())
+    assert tmpdir.listdir() == []
+
+
+@pytest.mark.requests
+def test_client_snapshot_store(tmpdir):
+    store = snapshot.SnapshotStore(path=tmpdir.strpath)
+    client.Client('tests/wsdl_files/soap.wsdl', snapshot_store=store)
+    client_obj = client.Client(
+        'tests/wsdl_files/soap.wsdl', snapshot_store=store)
+    assert len(tmpdir.listdir()) == 1
+
+    response = """
+    <?xml version="1.0"?>
+    <soapenv:Envelope
+        xmlns:soapenv="http://schemas.xmlsoap.org/soap/envelope/"
+        xmlns:stoc="http://example.com/stockquote.xsd">
+       <soapenv:Body>
+          <stoc:TradePrice>
+             <price>120.123</price>
+          </stoc:TradePrice>
+       </soapenv:Body>
+    </soapenv:Envelope>
+    """.strip()
+
+    with requests_mock.mock() as m:
+        m.post('http://example.com/stockquote', text=response)
+        result = client_obj.service.GetLastTradePrice('foobar')
+        assert result == 120.123
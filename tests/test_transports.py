@@ -1,8 +1,16 @@
+import datetime
+import threading
+import time
+import zlib
+
+import freezegun
 import pytest
 import requests_mock
+from lxml import etree
 from pretend import stub
 
 from zeep import cache, transports
+from zeep.wsdl.utils import SerializationPolicy
 
 
 @pytest.mark.requests
@@ -27,3 +35,287 @@ def test_load():
         result = transport.load('http://tests.python-zeep.org/test.xml')
 
         assert result == b'x'
+
+
+@pytest.mark.requests
+def test_load_in_memory_cache():
+    # An empty InMemoryCache is falsy (it has a __len__), it must still be
+    # used by the transport.
+    transport = transports.Transport(cache=cache.InMemoryCache())
+    url = 'http://tests.python-zeep.org/test.xml'
+
+    with requests_mock.mock() as m:
+        m.get(url, text='x')
+        assert transport.load(url) == b'x'
+        assert transport.load(url) == b'x'
+        assert m.call_count == 1
+    assert len(transport.cache) == 1
+
+
+@pytest.mark.requests
+def test_prefetch():
+    transport = transports.Transport(cache=None, prefetch_concurrency=4)
+
+    with requests_mock.mock() as m:
+        m.get('http://tests.python-zeep.org/a.xsd', text='a')
+        m.get('http://tests.python-zeep.org/b.xsd', text='b')
+        m.get('http://tests.python-zeep.org/c.xsd', status_code=404)
+        result = transport.prefetch([
+            'http://tests.python-zeep.org/a.xsd',
+            'http://tests.python-zeep.org/b.xsd',
+            'http://tests.python-zeep.org/c.xsd',
+        ])
+        assert result == {
+            'http://tests.python-zeep.org/a.xsd': b'a',
+            'http://tests.python-zeep.org/b.xsd': b'b',
+        }
+        assert m.call_count == 3
+
+        # The contents are not kept by the transport, they are passed on
+        # via the result (see zeep.parser.prefetch_imports)
+        assert transport.load('http://tests.python-zeep.org/a.xsd') == b'a'
+        assert m.call_count == 4
+
+
+def test_prefetch_disabled():
+    transport = transports.Transport(cache=None)
+    assert transport.prefetch(['http://tests.python-zeep.org/a.xsd']) == {}
+
+
+@pytest.mark.requests
+def test_load_conditional_request():
+    transport = transports.Transport(cache=cache.InMemoryCache(timeout=60))
+    url = 'http://tests.python-zeep.org/test.xml'
+
+    with requests_mock.mock() as m:
+        m.get(url, text='x', headers={
+            'ETag': '"v1"',
+            'Last-Modified': 'Sat, 01 Jul 2017 10:00:00 GMT',
+        })
+        assert transport.load(url) == b'x'
+        assert transport.load(url) == b'x'
+        assert m.call_count == 1
+
+    freeze_dt = datetime.datetime.utcnow() + datetime.timedelta(seconds=120)
+    with freezegun.freeze_time(freeze_dt):
+        with requests_mock.mock() as m:
+            m.get(url, status_code=304, headers={
+                'Cache-Control': 'max-age=600',
+            })
+            assert transport.load(url) == b'x'
+            assert m.call_count == 1
+            headers = m.request_history[0].headers
+            assert headers['If-None-Match'] == '"v1"'
+            assert headers['If-Modified-Since'] == (
+                'Sat, 01 Jul 2017 10:00:00 GMT')
+
+            # The cached document is fresh again
+            assert transport.load(url) == b'x'
+            assert m.call_count == 1
+
+    freeze_dt += datetime.timedelta(seconds=1200)
+    with freezegun.freeze_time(freeze_dt):
+        with requests_mock.mock() as m:
+            m.get(url, text='y', headers={'ETag': '"v2"'})
+            assert transport.load(url) == b'y'
+            assert transport.cache.get_stale(url) == (b'y', {'etag': '"v2"'})
+
+
+@pytest.mark.requests
+def test_load_stale_while_revalidate():
+    transport = transports.Transport(
+        cache=cache.InMemoryCache(timeout=60, max_stale=3600))
+    url = 'http://tests.python-zeep.org/test.xml'
+    transport.cache.add(url, b'old')
+
+    release = threading.Event()
+
+    def slow_response(request, context):
+        release.wait(5)
+        return 'new'
+
+    freeze_dt = datetime.datetime.utcnow() + datetime.timedelta(seconds=120)
+    with freezegun.freeze_time(freeze_dt):
+        with requests_mock.mock() as m:
+            m.get(url, text=slow_response)
+
+            results = []
+            threads = [
+                threading.Thread(
+                    target=lambda: results.append(transport.load(url)))
+                for i in range(50)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            # The expired document is served while it is refreshed once
+            assert results == [b'old'] * 50
+            release.set()
+            for i in range(100):
+                if transport.cache.get(url):
+                    break
+                time.sleep(0.01)
+            assert transport.load(url) == b'new'
+            assert m.call_count == 1
+
+
+@pytest.mark.requests
+def test_load_single_flight():
+    transport = transports.Transport(cache=None)
+    url = 'http://tests.python-zeep.org/test.xml'
+    started = threading.Event()
+    release = threading.Event()
+
+    def slow_response(request, context):
+        started.set()
+        release.wait(5)
+        return 'x'
+
+    with requests_mock.mock() as m:
+        m.get(url, text=slow_response)
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(transport.load(url)))
+            for i in range(10)
+        ]
+        threads[0].start()
+        started.wait(5)
+        for thread in threads[1:]:
+            thread.start()
+        time.sleep(0.1)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        assert results == [b'x'] * 10
+        assert m.call_count == 1
+
+
+@pytest.mark.requests
+def test_post_xml():
+    envelope = etree.fromstring(
+        '<envelope><body><item>x</item></body></envelope>')
+    transport = transports.Transport(cache=None)
+
+    with requests_mock.mock() as m:
+        m.post('http://tests.python-zeep.org/test', text='ok')
+        transport.post_xml('http://tests.python-zeep.org/test', envelope, {})
+        assert m.request_history[0].body == (
+            b"<?xml version='1.0' encoding='utf-8'?>\n" +
+            b"<envelope><body><item>x</item></body></envelope>")
+
+
+@pytest.mark.requests
+@pytest.mark.parametrize('policy,expected', [
+    (
+        SerializationPolicy(pretty_print=True, xml_declaration=False),
+        b'<envelope>\n  <body>\n    <item b="2" a="1"/>\n  </body>\n' +
+        b'</envelope>\n'
+    ),
+    (
+        SerializationPolicy(c14n=True),
+        b'<envelope><body><item a="1" b="2"></item></body></envelope>'
+    ),
+])
+def test_post_xml_serialization_policy(policy, expected):
+    envelope = etree.fromstring(
+        '<envelope><body><item b="2" a="1"/></body></envelope>')
+    transport = transports.Transport(cache=None, serialization=policy)
+
+    with requests_mock.mock() as m:
+        m.post('http://tests.python-zeep.org/test', text='ok')
+        transport.post_xml('http://tests.python-zeep.org/test', envelope, {})
+        assert m.request_history[0].body == expected
+
+
+def test_invalid_compression():
+    with pytest.raises(ValueError):
+        transports.Transport(cache=None, compression='br')
+
+
+@pytest.mark.requests
+@pytest.mark.parametrize('compression,wbits', [
+    ('gzip', 16 + zlib.MAX_WBITS),
+    ('deflate', zlib.MAX_WBITS),
+])
+def test_post_compressed(http_server, compression, wbits):
+    transport = transports.Transport(
+        cache=None, compression=compression, compression_min_size=100)
+    message = b'<envelope>' + b'<item>x</item>' * 100 + b'</envelope>'
+
+    transport.post(http_server.url, message, {'Content-Type': 'text/xml'})
+    request = http_server.requests[0]
+    assert request['headers']['content-encoding'] == compression
+    assert request['headers']['content-type'] == 'text/xml'
+    assert len(request['body']) < len(message)
+    assert zlib.decompress(request['body'], wbits) == message
+
+
+@pytest.mark.requests
+def test_post_compressed_chunks(http_server):
+    transport = transports.Transport(
+        cache=None, compression='gzip', compression_min_size=100)
+    chunks = [('<item>%d</item>' % i).encode('utf-8') for i in range(100)]
+
+    transport.post(http_server.url, iter(chunks), {})
+    request = http_server.requests[0]
+    assert request['headers']['content-encoding'] == 'gzip'
+    assert request['headers']['transfer-encoding'] == 'chunked'
+    assert gzip_decompress(request['body']) == b''.join(chunks)
+
+
+@pytest.mark.requests
+def test_post_compression_min_size(http_server):
+    transport = transports.Transport(cache=None, compression='gzip')
+
+    transport.post(http_server.url, b'<envelope/>', {})
+    transport.post(http_server.url, iter([b'<envelope>', b'</envelope>']), {})
+    for request in http_server.requests:
+        assert 'content-encoding' not in request['headers']
+    assert http_server.requests[0]['body'] == b'<envelope/>'
+    assert http_server.requests[1]['body'] == b'<envelope></envelope>'
+
+
+@pytest.mark.requests
+def test_post_compressed_response(http_server):
+    content = b'<envelope>' + b'<item>x</item>' * 100 + b'</envelope>'
+    http_server.set_response(
+        gzip_compress(content), headers={'Content-Encoding': 'gzip'})
+    transport = transports.Transport(cache=None)
+
+    response = transport.post(http_server.url, b'<envelope/>', {})
+    assert response.content == content
+    assert 'gzip' in http_server.requests[0]['headers']['accept-encoding']
+
+    response = transport.post(
+        http_server.url, b'<envelope/>', {}, stream=True)
+    response.raw.decode_content = True
+    assert response.raw.read() == content
+
+
+def gzip_compress(data):
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    return compressor.compress(data) + compressor.flush()
+
+
+def gzip_decompress(data):
+    return zlib.decompress(data, 16 + zlib.MAX_WBITS)
+
+
+@pytest.mark.requests
+def test_post_payload_logger():
+    calls = []
+    payload_logger = stub(
+        log_request=lambda address, message, encoding: (
+            calls.append((message, encoding)) or message),
+        log_response=lambda address, response, stream: calls.append(
+            (response.status_code, stream)))
+    transport = transports.Transport(
+        cache=None, payload_logger=payload_logger)
+
+    with requests_mock.mock() as m:
+        m.post('http://tests.python-zeep.org/test', text='ok')
+        transport.post('http://tests.python-zeep.org/test', b'<a/>', {})
+    assert calls == [(b'<a/>', 'utf-8'), (200, False)]
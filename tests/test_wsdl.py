@@ -7,13 +7,67 @@ from pretend import stub
 from six import StringIO
 
 from tests.utils import DummyTransport, assert_nodes_equal
-from zeep import wsdl
+from zeep import parser, wsdl
 from zeep.transports import Transport
+from zeep.xsd import parser as xsd_parser
+
+
+def test_parse_soap_wsdl_lazy():
+    client = stub(transport=Transport(), wsse=None, plugins=[])
+
+    obj = wsdl.Document(
+        'tests/wsdl_files/soap.wsdl', transport=client.transport, lazy=True)
+    schema = obj.types._get_schema_document('http://example.com/stockquote.xsd')
+
+    # Nothing is resolved until it is used
+    assert (
+        ('_types', '{http://example.com/stockquote.xsd}Address')
+        in schema._unresolved)
+    assert (
+        ('_elements', '{http://example.com/stockquote.xsd}TradePriceRequest')
+        in schema._unresolved)
+
+    address_type = obj.types.get_type(
+        '{http://example.com/stockquote.xsd}Address')
+    assert address_type.signature() == (
+        'NameFirst: xsd:string, NameLast: xsd:string, Email: xsd:string')
+    assert (
+        ('_types', '{http://example.com/stockquote.xsd}Address')
+        not in schema._unresolved)
+
+    response = """
+        <?xml version="1.0"?>
+        <soapenv:Envelope
+            xmlns:soapenv="http://schemas.xmlsoap.org/soap/envelope/"
+            xmlns:stoc="http://example.com/stockquote.xsd">
+           <soapenv:Body>
+              <stoc:TradePrice>
+                 <price>120.123</price>
+              </stoc:TradePrice>
+           </soapenv:Body>
+        </soapenv:Envelope>
+    """.strip()
+
+    port = obj.services['StockQuoteService'].ports['StockQuotePort']
+    with requests_mock.mock() as m:
+        m.post('http://example.com/stockquote', text=response)
+        result = port.binding.send(
+            client=client,
+            options={'address': 'http://example.com/stockquote'},
+            operation='GetLastTradePrice',
+            args=[],
+            kwargs={'tickerSymbol': 'foobar', 'country': {}})
+        assert result == 120.123
+
+    assert (
+        ('_elements', '{http://example.com/stockquote.xsd}TradePriceRequest')
+        not in schema._unresolved)
+    assert port.binding._unresolved_operations == set()
 
 
 @pytest.mark.requests
 def test_parse_soap_wsdl():
-    client = stub(transport=Transport(), wsse=None)
+    client = stub(transport=Transport(), wsse=None, plugins=[])
 
     obj = wsdl.Document('tests/wsdl_files/soap.wsdl', transport=client.transport)
     assert len(obj.services) == 1
@@ -83,7 +137,7 @@ def test_parse_soap_wsdl():
 
 @pytest.mark.requests
 def test_parse_soap_header_wsdl():
-    client = stub(transport=Transport(), wsse=None)
+    client = stub(transport=Transport(), wsse=None, plugins=[])
 
     obj = wsdl.Document(
         'tests/wsdl_files/soap_header.wsdl', transport=client.transport)
@@ -225,7 +279,7 @@ def test_parse_types_nsmap_issues():
 
 @pytest.mark.requests
 def test_parse_soap_import_wsdl():
-    client = stub(transport=Transport(), wsse=None)
+    client = stub(transport=Transport(), wsse=None, plugins=[])
     content = io.open(
         'tests/wsdl_files/soap-enc.xsd', 'r', encoding='utf-8').read()
 
@@ -239,6 +293,122 @@ def test_parse_soap_import_wsdl():
         obj.dump()
 
 
+def count_parsed(monkeypatch):
+    """Record the content of all xml documents which are parsed"""
+    parsed = []
+
+    def fromstring(content, *args, **kwargs):
+        parsed.append(content)
+        return original(content, *args, **kwargs)
+
+    original = parser.fromstring
+    monkeypatch.setattr(parser, 'fromstring', fromstring)
+    monkeypatch.setattr(xsd_parser, 'fromstring', fromstring)
+    return parsed
+
+
+@pytest.mark.requests
+def test_parse_wsdl_prefetch_imports(monkeypatch):
+    wsdl_content = """
+    <?xml version="1.0"?>
+    <wsdl:definitions
+      xmlns:wsdl="http://schemas.xmlsoap.org/wsdl/"
+      xmlns:xsd="http://www.w3.org/2001/XMLSchema"
+      targetNamespace="http://tests.python-zeep.org/xsd-main">
+      <wsdl:types>
+        <xsd:schema targetNamespace="http://tests.python-zeep.org/xsd-main">
+          <xsd:import
+            namespace="http://tests.python-zeep.org/a"
+            schemaLocation="a.xsd"/>
+        </xsd:schema>
+      </wsdl:types>
+    </wsdl:definitions>
+    """.strip()
+
+    schema_a = """
+    <?xml version="1.0"?>
+    <xsd:schema
+        xmlns:xsd="http://www.w3.org/2001/XMLSchema"
+        xmlns:b="http://tests.python-zeep.org/b"
+        targetNamespace="http://tests.python-zeep.org/a">
+      <xsd:import
+        namespace="http://tests.python-zeep.org/b"
+        schemaLocation="http://tests.python-zeep.org/b.xsd"/>
+      <xsd:element name="foo" type="b:bar"/>
+    </xsd:schema>
+    """.strip()
+
+    schema_b = """
+    <?xml version="1.0"?>
+    <xsd:schema
+        xmlns:xsd="http://www.w3.org/2001/XMLSchema"
+        targetNamespace="http://tests.python-zeep.org/b">
+      <xsd:simpleType name="bar">
+        <xsd:restriction base="xsd:string"/>
+      </xsd:simpleType>
+    </xsd:schema>
+    """.strip()
+
+    transport = Transport(cache=None, prefetch_concurrency=2)
+    parsed = count_parsed(monkeypatch)
+    with requests_mock.mock() as m:
+        m.get('http://tests.python-zeep.org/main.wsdl', text=wsdl_content)
+        m.get('http://tests.python-zeep.org/a.xsd', text=schema_a)
+        m.get('http://tests.python-zeep.org/b.xsd', text=schema_b)
+
+        obj = wsdl.Document(
+            'http://tests.python-zeep.org/main.wsdl', transport=transport)
+        assert m.call_count == 3
+
+    assert obj.types.get_element('{http://tests.python-zeep.org/a}foo')
+
+    # The prefetched documents are not parsed again
+    assert parsed.count(schema_a.encode('utf-8')) == 1
+    assert parsed.count(schema_b.encode('utf-8')) == 1
+    assert obj._parser_context.prefetched == {}
+
+
+@pytest.mark.requests
+def test_parse_wsdl_prefetch_unused_imports(monkeypatch):
+    wsdl_content = """
+    <?xml version="1.0"?>
+    <wsdl:definitions
+      xmlns:wsdl="http://schemas.xmlsoap.org/wsdl/"
+      targetNamespace="http://tests.python-zeep.org/main">
+      <wsdl:import
+        namespace="http://tests.python-zeep.org/other"
+        location="a.wsdl"/>
+      <wsdl:import
+        namespace="http://tests.python-zeep.org/other"
+        location="b.wsdl"/>
+    </wsdl:definitions>
+    """.strip()
+
+    other_content = """
+    <?xml version="1.0"?>
+    <wsdl:definitions
+      xmlns:wsdl="http://schemas.xmlsoap.org/wsdl/"
+      targetNamespace="http://tests.python-zeep.org/other">
+    </wsdl:definitions>
+    """.strip()
+
+    transport = Transport(cache=None, prefetch_concurrency=2)
+    parsed = count_parsed(monkeypatch)
+    with requests_mock.mock() as m:
+        m.get('http://tests.python-zeep.org/main.wsdl', text=wsdl_content)
+        m.get('http://tests.python-zeep.org/a.wsdl', text=other_content)
+        m.get('http://tests.python-zeep.org/b.wsdl', text=other_content)
+
+        obj = wsdl.Document(
+            'http://tests.python-zeep.org/main.wsdl', transport=transport)
+        assert m.call_count == 3
+
+    # The second import of the namespace is prefetched but never loaded, it
+    # is dropped once the document is loaded
+    assert parsed.count(other_content.encode('utf-8')) == 2
+    assert obj._parser_context.prefetched == {}
+
+
 def test_multiple_extension():
     content = StringIO("""
     <?xml version="1.0"?>
@@ -0,0 +1,216 @@
+import pytest
+from six import StringIO
+
+from zeep.wsdl import wsdl
+from zeep.wsdl.templates import _Complex, _Fallback, _Leaf
+from zeep.wsdl.utils import SerializationPolicy
+
+WSDL = """
+<definitions xmlns="http://schemas.xmlsoap.org/wsdl/"
+             xmlns:tns="http://tests.python-zeep.org/tns"
+             xmlns:soap="http://schemas.xmlsoap.org/wsdl/soap/"
+             xmlns:xsd="http://www.w3.org/2001/XMLSchema"
+             targetNamespace="http://tests.python-zeep.org/tns">
+  <types>
+    <xsd:schema targetNamespace="http://tests.python-zeep.org/tns"
+                elementFormDefault="qualified">
+      <xsd:complexType name="item">
+        <xsd:sequence>
+          <xsd:element name="id" type="xsd:int"/>
+          <xsd:element name="tags" type="xsd:string"
+                       minOccurs="0" maxOccurs="unbounded"/>
+          <xsd:element name="child" type="tns:item" minOccurs="0"/>
+        </xsd:sequence>
+      </xsd:complexType>
+      <xsd:complexType name="subItem">
+        <xsd:complexContent>
+          <xsd:extension base="tns:item">
+            <xsd:sequence>
+              <xsd:element name="extra" type="xsd:string"/>
+            </xsd:sequence>
+          </xsd:extension>
+        </xsd:complexContent>
+      </xsd:complexType>
+      <xsd:element name="Request">
+        <xsd:complexType>
+          <xsd:sequence>
+            <xsd:element name="items" type="tns:item" maxOccurs="unbounded"/>
+            <xsd:element name="pick">
+              <xsd:complexType>
+                <xsd:choice>
+                  <xsd:element name="a" type="xsd:string"/>
+                  <xsd:element name="b" type="xsd:int"/>
+                </xsd:choice>
+              </xsd:complexType>
+            </xsd:element>
+            <xsd:element name="flag" type="xsd:boolean" nillable="true"/>
+            <xsd:element name="note" type="xsd:string" minOccurs="0"/>
+          </xsd:sequence>
+        </xsd:complexType>
+      </xsd:element>
+      <xsd:element name="Authentication">
+        <xsd:complexType>
+          <xsd:sequence>
+            <xsd:element name="username" type="xsd:string"/>
+          </xsd:sequence>
+        </xsd:complexType>
+      </xsd:element>
+    </xsd:schema>
+  </types>
+
+  <message name="Input">
+    <part name="header" element="tns:Authentication"/>
+    <part name="body" element="tns:Request"/>
+  </message>
+  <message name="RpcInput">
+    <part name="arg1" type="xsd:string"/>
+    <part name="arg2" type="xsd:int"/>
+  </message>
+
+  <portType name="TestPortType">
+    <operation name="TestOperation">
+      <input message="tns:Input"/>
+    </operation>
+    <operation name="RpcOperation">
+      <input message="tns:RpcInput"/>
+    </operation>
+  </portType>
+
+  <binding name="TestBinding" type="tns:TestPortType">
+    <soap:binding style="document"
+                  transport="http://schemas.xmlsoap.org/soap/http"/>
+    <operation name="TestOperation">
+      <soap:operation soapAction="urn:test"/>
+      <input>
+        <soap:header message="tns:Input" part="header" use="literal"/>
+        <soap:body use="literal"/>
+      </input>
+    </operation>
+    <operation name="RpcOperation">
+      <soap:operation soapAction="urn:rpc" style="rpc"/>
+      <input>
+        <soap:body use="encoded"
+                   namespace="http://tests.python-zeep.org/rpc"/>
+      </input>
+    </operation>
+  </binding>
+</definitions>
+""".strip()
+
+
+def _get_operation(name):
+    root = wsdl.Document(StringIO(WSDL), None)
+    binding = root.bindings['{http://tests.python-zeep.org/tns}TestBinding']
+    return binding.get(name)
+
+
+POLICIES = [
+    SerializationPolicy(),
+    SerializationPolicy(pretty_print=True),
+    SerializationPolicy(xml_declaration=False),
+    SerializationPolicy(pretty_print=True, encoding='iso-8859-1'),
+]
+
+
+def _serialize(operation, *args, **kwargs):
+    policy = kwargs.pop('_policy', POLICIES[0])
+    return policy.serialize(
+        operation.input.serialize(*args, **kwargs).content)
+
+
+def test_compile():
+    operation = _get_operation('TestOperation')
+    template = operation.input.prepare()
+
+    assert isinstance(template._body, _Complex)
+    nodes = dict((name, node) for name, node, _ in template._body.children)
+    assert isinstance(nodes['items'], _Complex)
+    assert isinstance(nodes['pick'], _Fallback)
+    assert isinstance(nodes['flag'], _Leaf)
+
+    # The node of a recursive element is reused
+    children = dict((name, node) for name, node, _ in nodes['items'].children)
+    child = children['child']
+    assert dict((name, node) for name, node, _ in child.children)['child'] \
+        is child
+
+
+@pytest.mark.parametrize('policy', POLICIES)
+@pytest.mark.parametrize('kwargs', [
+    {
+        'items': [
+            {'id': 1, 'tags': ['a', 'b'], 'child': {'id': 2}},
+            {'id': 3},
+        ],
+        'pick': {'a': 'x'},
+        'flag': True,
+        'note': u'<special> & \xe9\r',
+    },
+    {'items': [], 'pick': {'b': 1}, 'flag': None},
+    {'items': [{'id': 1, 'tags': []}], 'pick': None, 'flag': False},
+    {},
+])
+def test_render_same_as_serialize(kwargs, policy):
+    operation = _get_operation('TestOperation')
+    template = operation.input.prepare(policy=policy)
+    assert template(**kwargs) == _serialize(
+        operation, _policy=policy, **kwargs)
+
+
+def test_render_value_objects():
+    operation = _get_operation('TestOperation')
+    template = operation.input.prepare()
+    types = operation.binding.wsdl.types
+    item_type = types.get_type('{http://tests.python-zeep.org/tns}item')
+    sub_type = types.get_type('{http://tests.python-zeep.org/tns}subItem')
+
+    kwargs = {
+        'items': [item_type(id=1), sub_type(id=2, extra='x')],
+        'flag': True,
+    }
+    result = template(**kwargs)
+    assert result == _serialize(operation, **kwargs)
+    assert b'xsi:type="ns0:subItem"' in result
+
+    args = ([item_type(id=1)], None, True)
+    assert template(*args) == _serialize(operation, *args)
+
+
+def test_render_generator():
+    operation = _get_operation('TestOperation')
+    template = operation.input.prepare()
+
+    result = template(items=({'id': i} for i in range(3)), flag=True)
+    assert result == _serialize(
+        operation, items=[{'id': i} for i in range(3)], flag=True)
+
+
+@pytest.mark.parametrize('policy', POLICIES)
+def test_render_soapheaders(policy):
+    operation = _get_operation('TestOperation')
+    headers = {'Authentication': {'username': 'mvantellingen'}}
+    template = operation.input.prepare(headers, policy)
+
+    assert template(flag=True) == _serialize(
+        operation, flag=True, _soapheaders=headers, _policy=policy)
+
+
+def test_render_rpc():
+    operation = _get_operation('RpcOperation')
+    template = operation.input.prepare()
+
+    assert template(arg1='foo', arg2=1) == _serialize(
+        operation, arg1='foo', arg2=1)
+    assert template('foo', 1) == _serialize(operation, 'foo', 1)
+
+
+def test_render_invalid():
+    operation = _get_operation('TestOperation')
+    template = operation.input.prepare()
+
+    with pytest.raises(TypeError):
+        template(unknown=1)
+    with pytest.raises(ValueError):
+        template(note=u'\x00')
+    with pytest.raises(ValueError):
+        operation.input.prepare(policy=SerializationPolicy(c14n=True))
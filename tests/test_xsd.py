@@ -565,3 +565,65 @@ def test_element_attribute_name_conflict():
     assert obj.item == 'foo'
     assert obj.foo == 'x'
     assert obj.attr__item == 'bar'
+
+
+def _create_order_element():
+    return xsd.Element(
+        etree.QName('http://tests.python-zeep.org/', 'order'),
+        xsd.ComplexType(
+            xsd.Sequence([
+                xsd.Element(
+                    etree.QName('http://tests.python-zeep.org/', 'customer'),
+                    xsd.String()),
+                xsd.Element(
+                    etree.QName('http://tests.python-zeep.org/', 'quantity'),
+                    xsd.Integer(), min_occurs=0),
+                xsd.Element(
+                    etree.QName('http://tests.python-zeep.org/', 'item'),
+                    xsd.String(), max_occurs='unbounded'),
+            ]),
+            [
+                xsd.Attribute('version', xsd.String()),
+            ]
+        ))
+
+
+def test_render_plan():
+    custom_type = _create_order_element()
+    plan = custom_type.type.render_plan
+    assert [name for name, element, qname, xmlvalue in plan] == [
+        'customer', 'quantity', 'item']
+    assert plan[0][3] is not None
+    assert plan[2][3] is None
+
+    choice_type = xsd.ComplexType(
+        xsd.Choice([
+            xsd.Element('{http://tests.python-zeep.org/}a', xsd.String()),
+            xsd.Element('{http://tests.python-zeep.org/}b', xsd.String()),
+        ]))
+    assert choice_type.render_plan is None
+
+
+def test_render_plan_same_result():
+    custom_type = _create_order_element()
+    obj = custom_type(customer='foo', item=['a', 'b'], version='1')
+
+    expected = """
+      <document>
+        <ns0:order xmlns:ns0="http://tests.python-zeep.org/" version="1">
+          <ns0:customer>foo</ns0:customer>
+          <ns0:item>a</ns0:item>
+          <ns0:item>b</ns0:item>
+        </ns0:order>
+      </document>
+    """
+    node = render_node(custom_type, obj)
+    assert_nodes_equal(expected, node)
+
+    # Rendering doesn't modify the value object
+    assert_nodes_equal(expected, render_node(custom_type, obj))
+    assert obj.item == ['a', 'b']
+
+    generic_type = _create_order_element()
+    generic_type.type.__dict__['render_plan'] = None
+    assert_nodes_equal(expected, render_node(generic_type, obj))
@@ -1,7 +1,9 @@
+import pytest
 from lxml import etree
 
 from tests.utils import load_xml
 from zeep import xsd
+from zeep.exceptions import XMLParseError
 from zeep.xsd.context import ParserContext
 from zeep.xsd.schema import SchemaDocument
 
@@ -734,3 +736,82 @@ def test_nested_choice_optional():
     assert obj.item_1 == 'foo'
     assert obj.item_2 is None
     assert obj.item_3 is None
+
+
+def _create_report_type():
+    return xsd.ComplexType(
+        xsd.Sequence([
+            xsd.Element(
+                etree.QName('http://tests.python-zeep.org/', 'name'),
+                xsd.String()),
+            xsd.Element(
+                etree.QName('http://tests.python-zeep.org/', 'item'),
+                xsd.ComplexType(
+                    xsd.Sequence([
+                        xsd.Element(
+                            etree.QName('http://tests.python-zeep.org/', 'id'),
+                            xsd.Integer()),
+                        xsd.Element(
+                            etree.QName(
+                                'http://tests.python-zeep.org/', 'comment'),
+                            xsd.String(), min_occurs=0),
+                    ])),
+                min_occurs=0, max_occurs='unbounded'),
+            xsd.Element(
+                etree.QName('http://tests.python-zeep.org/', 'total'),
+                xsd.Integer(), min_occurs=0),
+        ]),
+        [xsd.Attribute('version', xsd.String())])
+
+
+def test_parse_plan():
+    report_type = _create_report_type()
+    assert [name for name, tag, element in report_type.parse_plan[0]] == [
+        'name', 'item', 'total']
+
+    choice_type = xsd.ComplexType(
+        xsd.Choice([
+            xsd.Element('item_1', xsd.String()),
+            xsd.Element('item_2', xsd.String()),
+        ]))
+    assert choice_type.parse_plan is None
+
+
+def test_parse_plan_same_result():
+    node = etree.fromstring("""
+        <ns0:report xmlns:ns0="http://tests.python-zeep.org/" version="2">
+          <ns0:name>foo</ns0:name>
+          <ns0:item><ns0:id>1</ns0:id></ns0:item>
+          <ns0:item><ns0:id>2</ns0:id><ns0:comment>x</ns0:comment></ns0:item>
+        </ns0:report>
+    """)
+
+    report_type = _create_report_type()
+    obj = report_type.parse_xmlelement(node, None)
+
+    # Disable the plan to parse via the indicators
+    generic_type = _create_report_type()
+    generic_type.__dict__['parse_plan'] = None
+    expected = generic_type.parse_xmlelement(node, None)
+
+    assert list(obj) == list(expected)
+    assert [item.__values__ for item in obj.item] == [
+        item.__values__ for item in expected.item]
+    for key in ('name', 'total', 'version'):
+        assert obj[key] == expected[key]
+    assert obj.name == 'foo'
+    assert [item.id for item in obj.item] == [1, 2]
+    assert obj.item[1].comment == 'x'
+    assert obj.total is None
+    assert obj.version == '2'
+
+
+def test_parse_plan_unexpected_element():
+    node = etree.fromstring("""
+        <ns0:report xmlns:ns0="http://tests.python-zeep.org/">
+          <ns0:name>foo</ns0:name>
+          <ns0:unknown>bar</ns0:unknown>
+        </ns0:report>
+    """)
+    with pytest.raises(XMLParseError):
+        _create_report_type().parse_xmlelement(node, None)
@@ -0,0 +1,111 @@
+from lxml import etree
+
+from tests.utils import DummyTransport
+from zeep import xsd
+from zeep.xsd.context import ParserContext
+from zeep.xsd.registry import SchemaRegistry
+
+SCHEMA_A = """
+    <?xml version="1.0"?>
+    <xs:schema
+        xmlns:xs="http://www.w3.org/2001/XMLSchema"
+        xmlns:b="http://tests.python-zeep.org/b"
+        targetNamespace="http://tests.python-zeep.org/a"
+        elementFormDefault="qualified">
+      <xs:import
+          namespace="http://tests.python-zeep.org/b"
+          %s/>
+      <xs:element name="foo" type="b:item"/>
+    </xs:schema>
+"""
+
+SCHEMA_B = """
+    <?xml version="1.0"?>
+    <xs:schema
+        xmlns:xs="http://www.w3.org/2001/XMLSchema"
+        targetNamespace="http://tests.python-zeep.org/b"
+        elementFormDefault="qualified">
+      <xs:complexType name="item">
+        <xs:sequence>
+          <xs:element name="%s" type="xs:string"/>
+        </xs:sequence>
+      </xs:complexType>
+    </xs:schema>
+"""
+
+
+def _load_schema(registry, schema_b='name'):
+    node_a = etree.fromstring((SCHEMA_A % (
+        'schemaLocation="http://tests.python-zeep.org/b.xsd"')).strip())
+    transport = DummyTransport()
+    transport.bind(
+        'http://tests.python-zeep.org/b.xsd', (SCHEMA_B % schema_b).strip())
+    return xsd.Schema(
+        node_a, transport, parser_context=ParserContext(registry=registry))
+
+
+def test_shared_import():
+    registry = SchemaRegistry()
+    schema_1 = _load_schema(registry)
+    schema_2 = _load_schema(registry)
+    assert len(registry) == 1
+
+    assert schema_1._root is not schema_2._root
+    assert (
+        schema_1._get_schema_document('http://tests.python-zeep.org/b') is
+        schema_2._get_schema_document('http://tests.python-zeep.org/b'))
+
+    item_type = schema_2.get_type('{http://tests.python-zeep.org/b}item')
+    assert schema_1.get_element('{http://tests.python-zeep.org/a}foo').type \
+        is item_type
+    assert schema_2.get_element('{http://tests.python-zeep.org/a}foo').type \
+        is item_type
+
+
+def test_shared_import_changed_content():
+    registry = SchemaRegistry()
+    schema_1 = _load_schema(registry)
+    schema_2 = _load_schema(registry, schema_b='other')
+    assert len(registry) == 2
+
+    assert (
+        schema_1._get_schema_document('http://tests.python-zeep.org/b') is not
+        schema_2._get_schema_document('http://tests.python-zeep.org/b'))
+    item_type = schema_2.get_type('{http://tests.python-zeep.org/b}item')
+    assert item_type.signature() == 'other: xsd:string'
+
+
+def test_shared_import_namespace_conflict():
+    registry = SchemaRegistry()
+    schema_1 = _load_schema(registry)
+
+    # The schema of namespace a is already in the parser context, so the
+    # shared schema b (which imports nothing) can be used but a can't.
+    parser_context = ParserContext(registry=registry)
+    parser_context.schema_objects.add(schema_1._root)
+    document = schema_1._get_schema_document('http://tests.python-zeep.org/b')
+    assert registry.get(document._registry_key, parser_context) is document
+
+    other = ParserContext(registry=registry)
+    other.schema_objects.add(
+        _load_schema(None)._get_schema_document(
+            'http://tests.python-zeep.org/b'))
+    assert registry.get(document._registry_key, other) is None
+
+
+def test_local_copy(tmpdir):
+    path = tmpdir.join('b.xsd')
+    path.write((SCHEMA_B % 'name').strip())
+
+    registry = SchemaRegistry()
+    registry.add_local('http://tests.python-zeep.org/b', str(path))
+
+    # No schemaLocation and nothing available via the transport
+    node_a = etree.fromstring((SCHEMA_A % '').strip())
+    schema = xsd.Schema(
+        node_a, DummyTransport(),
+        parser_context=ParserContext(registry=registry))
+
+    item_type = schema.get_type('{http://tests.python-zeep.org/b}item')
+    assert item_type.signature() == 'name: xsd:string'
+    assert len(registry) == 1
@@ -4,6 +4,7 @@ from lxml import etree
 from tests.utils import DummyTransport
 from zeep import xsd
 from zeep.exceptions import ZeepWarning
+from zeep.xsd.context import ParserContext
 
 
 def test_default_types():
@@ -537,3 +538,73 @@ def test_merge():
 
     schema_a.get_element('{http://tests.python-zeep.org/a}foo')
     schema_a.get_element('{http://tests.python-zeep.org/b}foo')
+
+
+def test_qnames_interned():
+    node = etree.fromstring("""
+        <?xml version="1.0"?>
+        <xs:schema
+            xmlns:xs="http://www.w3.org/2001/XMLSchema"
+            xmlns:tns="http://tests.python-zeep.org/"
+            targetNamespace="http://tests.python-zeep.org/"
+            elementFormDefault="qualified">
+
+            <xs:complexType name="item">
+              <xs:sequence>
+                <xs:element name="item" type="xs:string"/>
+              </xs:sequence>
+            </xs:complexType>
+            <xs:element name="item" type="tns:item"/>
+            <xs:element name="other" type="tns:item"/>
+        </xs:schema>
+    """.strip())
+
+    parser_context = ParserContext()
+    schema = xsd.Schema(node, parser_context=parser_context)
+    qname = parser_context.qnames.get('http://tests.python-zeep.org/', 'item')
+    assert parser_context.qnames.get(
+        '{http://tests.python-zeep.org/}item') is qname
+
+    item_type = schema.get_type(qname)
+    assert item_type.qname is qname
+    assert schema.get_element('ns0:item').qname is qname
+    assert schema.get_element('ns0:item').type is item_type
+    assert schema.get_element('ns0:other').type is item_type
+    assert item_type.elements[0][1].qname is qname
+
+
+def test_lazy_resolve_recursive():
+    node = etree.fromstring("""
+        <?xml version="1.0"?>
+        <xs:schema
+            xmlns:xs="http://www.w3.org/2001/XMLSchema"
+            xmlns:tns="http://tests.python-zeep.org/"
+            targetNamespace="http://tests.python-zeep.org/"
+            elementFormDefault="qualified">
+
+            <xs:complexType name="node">
+              <xs:sequence>
+                <xs:element name="name" type="xs:string"/>
+                <xs:element name="child" type="tns:node" minOccurs="0"/>
+              </xs:sequence>
+            </xs:complexType>
+            <xs:element name="tree" type="tns:node"/>
+            <xs:element name="unused" type="xs:string"/>
+        </xs:schema>
+    """.strip())
+
+    schema = xsd.Schema(node, parser_context=ParserContext(lazy=True))
+    document = schema._get_schema_document('http://tests.python-zeep.org/')
+    assert len(document._unresolved) == 3
+
+    tree = schema.get_element('ns0:tree')
+    assert document._unresolved == set([
+        ('_elements', '{http://tests.python-zeep.org/}unused'),
+    ])
+
+    value = tree(name='root', child={'name': 'leaf'})
+    result = etree.Element('root')
+    tree.render(result, value)
+    parsed = tree.parse(result[0], schema)
+    assert parsed.child.name == 'leaf'
+    assert parsed.child.child is None
@@ -1,3 +1,7 @@
+import copy
+from collections import OrderedDict
+
+import pytest
 import six
 
 from zeep import xsd
@@ -374,3 +378,126 @@ def test_choice_sequences_init_dict():
             {'item_1': 'value-1', 'item_2': 'value-2'}
         ]
     }
+
+
+def test_value_class_slots():
+    xsd_type = xsd.ComplexType(
+        xsd.Sequence([
+            xsd.Element('item_1', xsd.String()),
+            xsd.Element('item-2', xsd.String()),
+        ]),
+        [
+            xsd.Attribute('attr_1', xsd.String())
+        ]
+    )
+    value_class = xsd_type.value_class
+    assert value_class._xsd_fields == ('item_1', 'item-2', 'attr_1')
+    assert value_class.__slots__ == ('item_1', 'attr_1')
+
+    obj = xsd_type(item_1='foo', attr_1='bar')
+    obj['item-2'] = 'dash'
+    assert not hasattr(obj, '__dict__')
+    assert list(obj) == ['item_1', 'item-2', 'attr_1']
+    assert len(obj) == 3
+    assert obj.item_1 == 'foo'
+    assert obj['item_1'] == 'foo'
+    assert getattr(obj, 'item-2') == 'dash'
+    assert obj.__values__ == {
+        'item_1': 'foo',
+        'item-2': 'dash',
+        'attr_1': 'bar',
+    }
+
+
+def test_value_class_mapping_api():
+    xsd_type = xsd.ComplexType(
+        xsd.Sequence([
+            xsd.Element('item_1', xsd.String()),
+            xsd.Element('item_2', xsd.String())
+        ]))
+    obj = xsd_type(item_1='foo')
+
+    obj.extra = 'x'
+    assert obj['extra'] == 'x'
+    assert 'extra' in obj
+
+    del obj['item_1']
+    assert 'item_1' not in obj
+    assert list(obj) == ['item_2', 'extra']
+    with pytest.raises(AttributeError):
+        obj.item_1
+    with pytest.raises(KeyError):
+        obj['item_1']
+    with pytest.raises(KeyError):
+        del obj['item_1']
+
+    obj.item_1 = 'bar'
+    assert obj.item_1 == 'bar'
+
+    new = copy.copy(obj)
+    del new['item_2']
+    del new['extra']
+    assert list(obj) == ['item_1', 'item_2', 'extra']
+    assert list(new) == ['item_1']
+
+    obj.__values__ = {'item_2': 'baz'}
+    assert list(obj) == ['item_2']
+
+
+def test_value_class_values_write_through():
+    xsd_type = xsd.ComplexType(
+        xsd.Sequence([
+            xsd.Element('item_1', xsd.String()),
+            xsd.Element('item_2', xsd.String())
+        ]))
+    obj = xsd_type(item_1='foo', item_2='bar')
+
+    values = obj.__values__
+    values['item_1'] = 'changed'
+    obj.__values__['extra'] = 'x'
+    del obj.__values__['item_2']
+    assert obj.item_1 == 'changed'
+    assert obj.extra == 'x'
+    assert 'item_2' not in obj
+    assert list(values) == ['item_1', 'extra']
+    assert len(values) == 2
+    assert values == {'item_1': 'changed', 'extra': 'x'}
+
+    copied = values.copy()
+    copied['item_1'] = 'copy'
+    assert obj.item_1 == 'changed'
+    assert repr(values) == repr(
+        OrderedDict([('item_1', 'changed'), ('extra', 'x')]))
+
+
+def test_create_trusted(monkeypatch):
+    xsd_type = xsd.ComplexType(
+        xsd.All([
+            xsd.Element('item_1', xsd.String()),
+            xsd.Element('item_2', xsd.String(), max_occurs=2)
+        ]))
+    value_class = xsd_type.value_class
+    assert value_class._xsd_trusted
+
+    def process_signature(*args):
+        raise AssertionError("Signature processed")
+    monkeypatch.setattr(
+        valueobjects, '_process_signature', process_signature)
+
+    obj = value_class._xsd_create({'item_1': 'foo'})
+    assert obj.item_1 == 'foo'
+    assert obj.item_2 == []
+
+
+def test_create_trusted_choice():
+    xsd_type = xsd.ComplexType(
+        xsd.Choice([
+            xsd.Element('item_1', xsd.String()),
+            xsd.Element('item_2', xsd.String())
+        ]))
+    value_class = xsd_type.value_class
+    assert not value_class._xsd_trusted
+
+    obj = value_class._xsd_create({'item_1': 'foo'})
+    assert obj.item_1 == 'foo'
+    assert obj.item_2 is None